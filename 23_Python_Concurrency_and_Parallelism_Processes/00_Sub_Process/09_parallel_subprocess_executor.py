@@ -0,0 +1,291 @@
+"""
+================================================================================
+PARALLEL SUBPROCESS FAN-OUT — asyncio subprocesses with bounded concurrency
+================================================================================
+
+The examples so far (`02_basic_execution.py`, `03_capturing_output.py`,
+`05_error_handling.py`) run ONE external command at a time:
+
+    for cmd in commands:
+        subprocess.run(cmd, capture_output=True)   # blocks until it exits
+
+Many commands spend most of their life WAITING (disk, network, a remote
+API, a lock) with the CPU idle. In a loop, the total time is the SUM of
+every command's latency.
+
+This file runs many commands AT ONCE from a single thread:
+✔ asyncio.create_subprocess_exec() starts a process without blocking
+✔ asyncio.Semaphore(N) keeps at most N processes alive
+✔ stdout / stderr are read INCREMENTALLY, with a per-command byte cap
+  (a chatty command cannot exhaust memory — excess output is drained
+   and discarded so the child never blocks on a full pipe)
+✔ check=True semantics from `06_check_true_behavior.py`, PER TASK:
+  one failing command does not abort the other 4,999
+✔ Every result records its own latency
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. When a sequential loop wastes time (and when it does not)
+2. How asyncio manages child processes without threads
+3. Why pipes must ALWAYS be drained (deadlock otherwise)
+4. Per-task error handling instead of all-or-nothing
+5. Reporting throughput and latency percentiles
+
+================================================================================
+"""
+
+import os
+import time
+import asyncio
+import subprocess
+from dataclasses import dataclass
+
+
+# ------------------------------------------------------------------------------
+# SETTINGS
+# ------------------------------------------------------------------------------
+MAX_CONCURRENCY = (os.cpu_count() or 1) * 8
+MAX_OUTPUT_BYTES = 64 * 1024     # kept per stream, per command
+READ_CHUNK = 64 * 1024
+
+
+# ------------------------------------------------------------------------------
+# RESULT OF ONE COMMAND
+# ------------------------------------------------------------------------------
+@dataclass
+class CommandResult:
+    """
+    Like subprocess.CompletedProcess, plus:
+
+    truncated : bool      : output exceeded MAX_OUTPUT_BYTES
+    latency   : float     : seconds from spawn to exit
+    error     : Exception : CalledProcessError (check=True) or OSError
+                            (e.g. command not found), else None
+    """
+    args: list
+    returncode: int | None
+    stdout: bytes
+    stderr: bytes
+    truncated: bool
+    latency: float
+    error: Exception | None = None
+
+
+# ------------------------------------------------------------------------------
+# READ A STREAM WITH A CAP
+# ------------------------------------------------------------------------------
+async def read_capped(stream: asyncio.StreamReader, cap: int) -> tuple:
+    """
+    Reads a pipe until EOF, keeping at most `cap` bytes.
+
+    IMPORTANT:
+    ----------
+    We keep READING after the cap is reached. If we stopped, the pipe
+    buffer (~64 KB) would fill, the child would block in write() and
+    never exit — a classic subprocess deadlock.
+
+    Returns:
+    --------
+    (kept bytes, truncated flag)
+    """
+    kept = bytearray()
+    truncated = False
+
+    while chunk := await stream.read(READ_CHUNK):
+        room = cap - len(kept)
+        if room > 0:
+            kept += chunk[:room]
+        if len(chunk) > room:
+            truncated = True
+
+    return bytes(kept), truncated
+
+
+# ------------------------------------------------------------------------------
+# RUN ONE COMMAND
+# ------------------------------------------------------------------------------
+async def run_command(args: list, sem: asyncio.Semaphore, check: bool,
+                      max_output: int) -> CommandResult:
+    """
+    Runs one command once a concurrency slot is free.
+
+    Errors never escape: they are stored in result.error, so a single
+    bad command cannot cancel the rest of the batch.
+    """
+    async with sem:
+        start = time.perf_counter()
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as exc:
+            return CommandResult(args, None, b'', b'', False,
+                                 time.perf_counter() - start, exc)
+
+        # Drain BOTH pipes concurrently (draining one at a time can deadlock
+        # when the child fills the other one)
+        (stdout, out_cut), (stderr, err_cut) = await asyncio.gather(
+            read_capped(process.stdout, max_output),
+            read_capped(process.stderr, max_output),
+        )
+        returncode = await process.wait()
+
+        result = CommandResult(args, returncode, stdout, stderr,
+                               out_cut or err_cut, time.perf_counter() - start)
+
+        if check and returncode != 0:
+            result.error = subprocess.CalledProcessError(returncode, args, stdout, stderr)
+
+        return result
+
+
+# ------------------------------------------------------------------------------
+# RUN MANY COMMANDS
+# ------------------------------------------------------------------------------
+async def run_many(commands: list, max_concurrency: int = MAX_CONCURRENCY,
+                   check: bool = False, max_output: int = MAX_OUTPUT_BYTES) -> list:
+    """
+    Runs every command with at most `max_concurrency` alive at once.
+
+    Returns:
+    --------
+    list[CommandResult] in the SAME order as `commands`
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(run_command(args, sem, check, max_output))
+            for args in commands
+        ]
+
+    return [task.result() for task in tasks]
+
+
+# ------------------------------------------------------------------------------
+# REPORTING
+# ------------------------------------------------------------------------------
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(name: str, latencies: list, elapsed: float) -> None:
+    print(f"{name:<32} {elapsed:>7.2f}s {len(latencies) / elapsed:>9.0f} cmd/s   "
+          f"p50 {percentile(latencies, 50) * 1000:>6.1f}ms   "
+          f"p99 {percentile(latencies, 99) * 1000:>6.1f}ms")
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK: SEQUENTIAL LOOP VS FAN-OUT
+# ------------------------------------------------------------------------------
+def benchmark(label: str, commands: list) -> None:
+    latencies = []
+    start = time.perf_counter()
+    for args in commands:
+        began = time.perf_counter()
+        subprocess.run(args, capture_output=True, check=True)
+        latencies.append(time.perf_counter() - began)
+    report(f"{label} × {len(commands)}, sequential", latencies, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    results = asyncio.run(run_many(commands, check=True))
+    elapsed = time.perf_counter() - start
+
+    assert all(result.error is None for result in results)
+    report(f"{label} × {len(commands)}, fan-out", [r.latency for r in results], elapsed)
+    print()
+
+
+# ------------------------------------------------------------------------------
+# DEMO + BENCHMARK
+# ------------------------------------------------------------------------------
+def main():
+    # --------------------------------------------------------------------------
+    # 1. PER-TASK check=True: the failure is reported, the batch continues
+    # --------------------------------------------------------------------------
+    results = asyncio.run(run_many(
+        [
+            ['echo', 'hello'],
+            ['ls', '-la', 'dne'],                       # exits with 2
+            ['does-not-exist'],                         # cannot even start
+            ['head', '-c', '1000000', '/dev/zero'],     # 1 MB, cap is 1 KB
+        ],
+        check=True,
+        max_output=1024,
+    ))
+
+    for result in results:
+        status = 'OK' if result.error is None else type(result.error).__name__
+        print(f"{' '.join(result.args):<32} -> {status:<20} "
+              f"{len(result.stdout):>5} bytes kept, truncated={result.truncated}")
+
+    # --------------------------------------------------------------------------
+    # 2. THROUGHPUT: 5,000 tiny commands, then 500 commands that mostly wait
+    # --------------------------------------------------------------------------
+    print(f"\nmax {MAX_CONCURRENCY} commands at a time\n")
+
+    benchmark('true/echo',
+              [['true'] if i % 2 else ['echo', str(i)] for i in range(5_000)])
+    benchmark('sleep 0.02',
+              [['sleep', '0.02'] for _ in range(500)])
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (1 CPU CORE, LINUX)
+# ==============================================================================
+
+"""
+echo hello                       -> OK                       6 bytes kept, truncated=False
+ls -la dne                       -> CalledProcessError       0 bytes kept, truncated=False
+does-not-exist                   -> FileNotFoundError        0 bytes kept, truncated=False
+head -c 1000000 /dev/zero        -> OK                    1024 bytes kept, truncated=True
+
+max 8 commands at a time
+
+true/echo × 5000, sequential        4.61s      1086 cmd/s   p50    0.9ms   p99    1.1ms
+true/echo × 5000, fan-out           6.04s       828 cmd/s   p50    7.6ms   p99   11.7ms
+
+sleep 0.02 × 500, sequential       10.80s        46 cmd/s   p50   21.6ms   p99   23.3ms
+sleep 0.02 × 500, fan-out           1.40s       357 cmd/s   p50   21.7ms   p99   25.9ms
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WHEN DOES FAN-OUT HELP?
+   - Commands that WAIT: 7.7× faster — 8 sleeps overlap on one core
+   - `true` / `echo` do no waiting: all the time is fork/exec/exit, which
+     is pure CPU. On ONE core nothing can overlap, and asyncio's per-process
+     bookkeeping (pipes, transports, child watcher) makes it ~30% slower
+   - With several cores the spawn work itself runs in parallel;
+     see 10_... for making each spawn cheaper
+
+2. THROUGHPUT VS LATENCY
+   - Per-command latency goes UP with concurrency (processes share cores)
+   - For waiting commands, throughput goes up much more
+
+3. WHY A SEMAPHORE?
+   - Each child costs a PID, file descriptors and memory
+   - Unbounded fan-out hits `ulimit -n` / `ulimit -u` quickly
+
+4. WHY CAP AND KEEP DRAINING?
+   - Capping protects the parent's memory
+   - Draining protects the child from blocking forever on a full pipe
+
+5. PER-TASK ERRORS
+   - check=True raises for the whole program in 06_check_true_behavior.py
+   - Here each CommandResult carries its own CalledProcessError / OSError
+"""
@@ -0,0 +1,355 @@
+"""
+================================================================================
+LOW-OVERHEAD PROCESS SPAWNING — fork vs vfork vs posix_spawn vs a zygote
+================================================================================
+
+Every example in this folder calls subprocess.run(), and every call pays
+the price of creating a process BEFORE the command does any work:
+
+    subprocess.run(['true'])   # does nothing... in ~1 ms
+
+When a job fires tens of thousands of tiny tools, that fixed cost IS the
+job. How big it is depends on HOW the process is created:
+
+✘ fork() + exec()   : copies the parent's page tables first
+                      → the bigger the Python process, the slower
+✔ vfork() + exec()  : the child borrows the parent's memory until exec
+                      (subprocess's default on Linux since Python 3.10)
+✔ posix_spawn()     : libc's "create + exec" in one call (vfork/clone inside)
+                      (subprocess uses it only when close_fds=False and the
+                       program is given as an absolute path)
+✔ a ZYGOTE          : a tiny helper process, started once, that launches
+                      commands on request — the big parent never forks again
+
+This file puts all of them behind ONE option:
+
+    spawn(['true'], strategy='posix_spawn')
+
+and measures the per-spawn latency of each, from a SMALL parent and
+from a BIG one (1 GB of memory + 4,000 open file descriptors).
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. What subprocess does under the hood (fork / vfork / posix_spawn)
+2. Which arguments silently force the slow path (preexec_fn, close_fds...)
+3. Why process size matters for fork() and not for vfork()/posix_spawn()
+4. How a pre-started "zygote" process works
+5. Microbenchmarking: per-call latency, p50 / p99
+
+================================================================================
+USAGE
+================================================================================
+
+python 10_low_overhead_process_spawning.py               # small + big parent
+python 10_low_overhead_process_spawning.py --count 500
+
+================================================================================
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import functools
+import threading
+import subprocess
+
+
+# ------------------------------------------------------------------------------
+# THE ZYGOTE
+# ------------------------------------------------------------------------------
+class Zygote:
+    """
+    A small helper process that spawns commands on behalf of the parent.
+
+    It is THIS file, re-run with --zygote: a fresh interpreter that has
+    imported nothing heavy and allocated nothing, so creating a process
+    from it is cheap no matter how large the parent has grown.
+
+    Protocol (one JSON line each way, over the zygote's stdin / stdout):
+    ------------------------------------------------------------------
+    parent → zygote : ["true"]
+    zygote → parent : 0          (the command's exit code)
+
+    Start it EARLY, while the parent is still small.
+    """
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--zygote'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,  # line buffered: each request is sent immediately
+        )
+        self._lock = threading.Lock()
+
+    def run(self, args: list) -> int:
+        """
+        Runs one command in the zygote and returns its exit code.
+        """
+        with self._lock:
+            self.process.stdin.write(json.dumps(args) + '\n')
+            reply = self.process.stdout.readline()
+
+        if not reply:
+            raise RuntimeError("zygote process died")
+        return int(reply)
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self) -> 'Zygote':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def zygote_main() -> None:
+    """
+    The zygote's loop (runs in the helper process).
+
+    Children get /dev/null as stdin/stdout/stderr: the zygote's own
+    stdout is the reply channel and must never receive their output.
+    """
+    devnull = [
+        (os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_RDWR, 0)
+        for fd in (0, 1, 2)
+    ]
+
+    for line in sys.stdin:
+        args = json.loads(line)
+        try:
+            pid = os.posix_spawnp(args[0], args, os.environ, file_actions=devnull)
+            returncode = os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+        except OSError:
+            returncode = 127  # like a shell: command not found
+
+        sys.stdout.write(f"{returncode}\n")
+        sys.stdout.flush()
+
+
+# ------------------------------------------------------------------------------
+# SPAWN STRATEGIES
+# ------------------------------------------------------------------------------
+def _noop() -> None:
+    pass
+
+
+def spawn_fork(args: list) -> int:
+    """
+    Classic fork() + exec().
+
+    ANY preexec_fn makes subprocess give up vfork: Python code must run
+    in the child between fork and exec, so the child needs its own copy
+    of the address space. (Python < 3.10 always worked this way.)
+    """
+    return subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                          preexec_fn=_noop).returncode
+
+
+def spawn_default(args: list) -> int:
+    """
+    subprocess.run() as used everywhere else in this folder.
+
+    On Linux this is vfork() + exec(), plus closing every inherited
+    file descriptor (close_fds=True is the default).
+    """
+    return subprocess.run(args, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL).returncode
+
+
+@functools.lru_cache(maxsize=None)
+def find_program(name: str) -> str:
+    """
+    PATH lookup, done ONCE per program name (shutil.which() stats every
+    PATH entry — on each call it would cost more than it saves).
+    """
+    return shutil.which(name) or name
+
+
+def spawn_posix(args: list) -> int:
+    """
+    subprocess.run() on its posix_spawn() fast path.
+
+    subprocess only takes it when ALL of these hold:
+    - close_fds=False (and no pass_fds)
+    - the program is an ABSOLUTE path (no PATH search in Python)
+    - no preexec_fn, cwd, start_new_session, user/group changes...
+
+    close_fds=False is safe here: Python creates descriptors
+    non-inheritable by default (PEP 446), so the child still only
+    receives stdin/stdout/stderr.
+    """
+    program = find_program(args[0])
+    return subprocess.run([program, *args[1:]], stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL, close_fds=False).returncode
+
+
+_DEVNULL_ACTIONS = [
+    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+]
+
+
+def spawn_os_posix(args: list) -> int:
+    """
+    os.posix_spawnp() directly: no Popen object, no pipes for error
+    reporting, no communicate() — just spawn and waitpid().
+    """
+    pid = os.posix_spawnp(args[0], args, os.environ, file_actions=_DEVNULL_ACTIONS)
+    return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+
+SPAWN_STRATEGIES = {
+    'fork':           spawn_fork,
+    'default':        spawn_default,
+    'posix_spawn':    spawn_posix,
+    'os.posix_spawn': spawn_os_posix,
+    # 'zygote' is added by spawn() / benchmark() once one is running
+}
+
+
+def spawn(args: list, strategy: str = 'default', zygote: Zygote | None = None) -> int:
+    """
+    Runs `args` to completion with the chosen strategy; returns the exit code.
+
+    Output is discarded. Use this for the "fire a tiny tool, check it
+    succeeded" pattern; use subprocess.run() when you need the output.
+    """
+    if strategy == 'zygote':
+        if zygote is None:
+            raise ValueError("strategy='zygote' needs a running Zygote")
+        return zygote.run(args)
+
+    return SPAWN_STRATEGIES[strategy](args)
+
+
+# ------------------------------------------------------------------------------
+# MICROBENCHMARK
+# ------------------------------------------------------------------------------
+def measure(func, args: list, count: int) -> list:
+    """
+    Calls func(args) `count` times; returns each call's latency in µs.
+    """
+    func(args)  # warm-up: page cache, PATH lookup, lazy imports
+
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        if func(args) != 0:
+            raise subprocess.CalledProcessError(1, args)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+
+    return latencies
+
+
+def print_table(title: str, strategies: dict, count: int) -> None:
+    print(f"\n{title}")
+    print(f"{'strategy':<16} {'mean':>9} {'p50':>9} {'p99':>9}")
+
+    for name, func in strategies.items():
+        latencies = sorted(measure(func, ['true'], count))
+        mean = sum(latencies) / len(latencies)
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+        print(f"{name:<16} {mean:>7.0f}µs {p50:>7.0f}µs {p99:>7.0f}µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('--count', type=int, default=2000, help='spawns per strategy')
+    parser.add_argument('--zygote', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.zygote:
+        zygote_main()
+        return
+
+    # The zygote is started FIRST, while this process is still small
+    with Zygote() as zygote:
+        strategies = {**SPAWN_STRATEGIES, 'zygote': zygote.run}
+
+        print_table(f"SMALL PARENT — {args.count} × `true`", strategies, args.count)
+
+        # ----------------------------------------------------------------------
+        # GROW THE PARENT: 1 GB of touched memory + 4,000 open descriptors
+        # ----------------------------------------------------------------------
+        ballast = bytearray(b'x') * (1024 * 1024 * 1024)
+        descriptors = [os.open(os.devnull, os.O_RDONLY) for _ in range(4000)]
+
+        print_table(f"BIG PARENT (1 GB RSS, 4,000 open fds) — {args.count} × `true`",
+                    strategies, args.count)
+
+        for fd in descriptors:
+            os.close(fd)
+        del ballast
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (1 CPU CORE, LINUX, PYTHON 3.11)
+# ==============================================================================
+
+"""
+SMALL PARENT — 2000 × `true`
+strategy              mean       p50       p99
+fork                1812µs    1650µs    3947µs
+default              536µs     475µs     942µs
+posix_spawn          662µs     604µs    1071µs
+os.posix_spawn       923µs     705µs    4130µs
+zygote               765µs     789µs    1126µs
+
+BIG PARENT (1 GB RSS, 4,000 open fds) — 2000 × `true`
+strategy              mean       p50       p99
+fork               19394µs   19948µs   26699µs
+default              696µs     616µs    1026µs
+posix_spawn          723µs     641µs    1080µs
+os.posix_spawn       585µs     536µs    1718µs
+zygote               755µs     797µs    1016µs
+
+Differences of ±150µs between the last four rows change from run to run
+on a single shared core; the fork row does not.
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. fork() IS THE ONE TO AVOID
+   - 3× slower than the rest in a small parent, ~30× in a 1 GB parent:
+     its cost grows with the page tables it has to copy
+   - A single preexec_fn (or Python < 3.10) puts you on this path
+
+2. vfork / posix_spawn DO NOT CARE ABOUT PARENT SIZE
+   - default, posix_spawn and os.posix_spawn stay at ~0.5–0.7 ms
+   - What is left is the kernel's exec() + the program's own start-up
+
+3. CLOSING FILE DESCRIPTORS IS CHEAP NOW
+   - close_fds=True with 4,000 open fds adds ~0.1 ms: modern Python
+     closes them with one close_range() syscall instead of 4,000 close()
+   - The posix_spawn path (close_fds=False) relies on PEP 446 instead
+
+4. THE ZYGOTE
+   - Costs one IPC round trip per command, so it is not the fastest here
+   - It wins when the parent CANNOT use vfork (needs preexec_fn, a large
+     parent on a platform with fork only...) or when the helper should
+     run with a different environment, cwd or user — set up ONCE
+   - Start it before the parent grows; it never inherits the ballast
+
+5. TAKEAWAY FOR TENS OF THOUSANDS OF TINY TOOLS
+   - Keep subprocess on its fast path (no preexec_fn), or call
+     os.posix_spawnp() directly when you only need the exit code
+   - Combine with 09_parallel_subprocess_executor.py on multi-core machines
+"""
@@ -0,0 +1,326 @@
+"""
+================================================================================
+BOUNDED STREAMING MAP — gather() for millions of items in constant memory
+================================================================================
+
+`06_gather.py` and `07_taskgroup_structured_concurrency.py` create EVERY
+task up front and keep EVERY result:
+
+    async with asyncio.TaskGroup() as tg:
+        for i, d in work:
+            tasks.append(tg.create_task(fetch(i, d)))
+
+For 3 items that is ideal. For 1,000,000 items it means:
+✘ 1,000,000 Task objects + coroutine frames alive at the same time
+✘ 1,000,000 results held in a list until the very last one finishes
+✘ 1,000,000 requests fired at the downstream at once
+
+bounded_map() streams instead:
+
+    async for result in bounded_map(fetch, ids, limit=1000):
+        ...
+
+✔ Items are pulled from the (sync OR async) iterable LAZILY
+✔ At most `limit` tasks are alive at any moment
+✔ Results are yielded as soon as they are ready
+  (completion order, or input order with ordered=True)
+✔ Structured cancellation: if one item fails, or the consumer stops
+  early, every in-flight task is cancelled before control returns
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Why "create all tasks, then wait" does not scale
+2. Async generators as a streaming API
+3. Waking up on each completion in O(1) (done callbacks + a Queue)
+4. Keeping input order with a bounded reorder buffer
+5. Measuring peak memory (RSS) per approach in a separate process
+
+================================================================================
+USAGE
+================================================================================
+
+python 13_bounded_streaming_map.py                  # demo + 10^6-item benchmark
+python 13_bounded_streaming_map.py --items 100000
+
+================================================================================
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import resource
+import subprocess
+import contextlib
+
+
+# ------------------------------------------------------------------------------
+# BOUNDED MAP
+# ------------------------------------------------------------------------------
+async def _as_async_iterator(items):
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def bounded_map(coro_fn, items, limit: int = 100, ordered: bool = False):
+    """
+    Async generator: runs coro_fn(item) for every item, `limit` at a time.
+
+    Arguments:
+    ----------
+    coro_fn : async function of one argument
+    items   : iterable OR async iterable (consumed lazily)
+    limit   : maximum number of tasks alive at once
+    ordered : False → yield in completion order (fastest)
+              True  → yield in input order; finished-but-not-yet-yielded
+                      results count against `limit`, so memory stays bounded
+
+    Errors:
+    -------
+    The first failing item's exception is raised to the consumer, after
+    every other in-flight task has been cancelled.
+
+    Stopping early:
+    ---------------
+    Use contextlib.aclosing() so the generator (and its tasks) are
+    cleaned up the moment you break out of the loop.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    iterator = _as_async_iterator(items)
+    finished = asyncio.Queue()      # tasks land here as they complete
+    running = {}                    # task → input index
+    buffered = {}                   # input index → result (ordered mode)
+    next_index = 0                  # next index to yield (ordered mode)
+    submitted = 0
+    exhausted = False
+
+    try:
+        while True:
+            # ------------------------------------------------------------------
+            # FILL: start tasks until the limit is reached
+            # ------------------------------------------------------------------
+            while not exhausted and len(running) + len(buffered) < limit:
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+
+                task = asyncio.create_task(coro_fn(item))
+                task.add_done_callback(finished.put_nowait)
+                running[task] = submitted
+                submitted += 1
+
+            if not running:
+                return
+
+            # ------------------------------------------------------------------
+            # DRAIN: one completed task (raises → finally cancels the rest)
+            # ------------------------------------------------------------------
+            task = await finished.get()
+            index = running.pop(task)
+            result = task.result()
+
+            if not ordered:
+                yield result
+                continue
+
+            buffered[index] = result
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        await iterator.aclose()
+
+
+# ------------------------------------------------------------------------------
+# DEMO
+# ------------------------------------------------------------------------------
+async def fetch(id: int, delay: float) -> str:
+    await asyncio.sleep(delay)
+    return f"Data-{id}"
+
+
+async def demo() -> None:
+    work = [(1, 0.2), (2, 0.1), (3, 0.3), (4, 0.1), (5, 0.2)]
+
+    async def fetch_pair(pair):
+        return await fetch(*pair)
+
+    print("completion order:",
+          [r async for r in bounded_map(fetch_pair, work, limit=2)])
+    print("input order     :",
+          [r async for r in bounded_map(fetch_pair, work, limit=2, ordered=True)])
+
+    # --------------------------------------------------------------------------
+    # A FAILURE CANCELS EVERYTHING STILL RUNNING
+    # --------------------------------------------------------------------------
+    started, cancelled = [], []
+
+    async def fragile(i: int) -> int:
+        started.append(i)
+        try:
+            await asyncio.sleep(0.01 if i == 7 else 0.1 * (i % 10 + 1))
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        if i == 7:
+            raise ValueError(f"item {i} is bad")
+        return i
+
+    try:
+        async for _ in bounded_map(fragile, range(1_000_000), limit=10):
+            pass
+    except ValueError as e:
+        print(f"\nfailure         : {e}")
+        print(f"started {len(started)} of 1,000,000 items, "
+              f"{len(cancelled)} in-flight tasks cancelled")
+
+    # --------------------------------------------------------------------------
+    # STOPPING EARLY (aclosing → tasks cancelled at the break)
+    # --------------------------------------------------------------------------
+    started.clear()
+    cancelled.clear()
+
+    async with contextlib.aclosing(bounded_map(fragile, range(8, 1_000_000), limit=10)) as results:
+        async for result in results:
+            break
+
+    print(f"early break     : started {len(started)}, cancelled {len(cancelled)}")
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK (each mode runs in its own process → clean peak RSS)
+# ------------------------------------------------------------------------------
+async def work(i: int) -> int:
+    await asyncio.sleep(0.001)
+    return i * 2
+
+
+async def run_mode(mode: str, count: int) -> int:
+    if mode == 'gather':
+        return sum(await asyncio.gather(*(work(i) for i in range(count))))
+
+    if mode == 'taskgroup':
+        tasks = []
+        async with asyncio.TaskGroup() as tg:
+            for i in range(count):
+                tasks.append(tg.create_task(work(i)))
+        return sum(task.result() for task in tasks)
+
+    total = 0
+    async for result in bounded_map(work, range(count), limit=1000,
+                                    ordered=mode == 'bounded_ordered'):
+        total += result
+    return total
+
+
+def measure(mode: str, count: int) -> None:
+    """
+    Prints: <seconds> <peak RSS in KB> <checksum>
+    """
+    start = time.perf_counter()
+    total = asyncio.run(run_mode(mode, count))
+    elapsed = time.perf_counter() - start
+
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, total)
+
+
+def benchmark(count: int) -> None:
+    print(f"\n{count:,} items, each `await asyncio.sleep(0.001)`\n")
+    print(f"{'approach':<28} {'wall time':>10} {'peak RSS':>12}")
+
+    for mode, label in (('gather', 'gather(*all)'),
+                        ('taskgroup', 'TaskGroup + list'),
+                        ('bounded', 'bounded_map(limit=1000)'),
+                        ('bounded_ordered', 'bounded_map(ordered=True)')):
+        result = subprocess.run(
+            [sys.executable, __file__, '--measure', mode, str(count)],
+            capture_output=True, text=True, check=True,
+        )
+        elapsed, peak_rss, total = result.stdout.split()
+        assert int(total) == count * (count - 1)
+
+        # ru_maxrss: kilobytes on Linux
+        print(f"{label:<28} {float(elapsed):>9.2f}s {int(peak_rss) / 1024:>9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('--items', type=int, default=1_000_000)
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'COUNT'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure[0], int(args.measure[1]))
+        return
+
+    asyncio.run(demo())
+    benchmark(args.items)
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (10^6 ITEMS, 1 CPU CORE)
+# ==============================================================================
+
+"""
+completion order: ['Data-2', 'Data-1', 'Data-4', 'Data-3', 'Data-5']
+input order     : ['Data-1', 'Data-2', 'Data-3', 'Data-4', 'Data-5']
+
+failure         : item 7 is bad
+started 10 of 1,000,000 items, 9 in-flight tasks cancelled
+early break     : started 10, cancelled 9
+
+1,000,000 items, each `await asyncio.sleep(0.001)`
+
+approach                      wall time     peak RSS
+gather(*all)                     34.80s    1661.5 MB
+TaskGroup + list                 29.63s    1757.1 MB
+bounded_map(limit=1000)          19.36s      24.0 MB
+bounded_map(ordered=True)        21.02s      24.0 MB
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. MEMORY
+   - gather / TaskGroup: ~1.7 KB per item (Task + coroutine frame +
+     timer + result), ALL alive at once → 1.7 GB for a million items
+   - bounded_map: only `limit` items alive → flat ~24 MB, for 10^6 or 10^9
+
+2. IT IS ALSO FASTER
+   - A million pending timers and tasks make every event-loop step
+     more expensive (bigger heaps, more garbage collection)
+   - Small working sets stay in CPU caches
+
+3. ORDERED MODE
+   - A slow item at the head of the line holds back later results;
+     they wait in the reorder buffer, which shares the `limit` budget
+   - Costs a little throughput, never unbounded memory
+
+4. STRUCTURED CANCELLATION
+   - One failure: the 9 other in-flight tasks are cancelled, and the
+     remaining 999,990 items are never even started
+   - break inside aclosing(): same clean-up, no orphaned tasks
+"""
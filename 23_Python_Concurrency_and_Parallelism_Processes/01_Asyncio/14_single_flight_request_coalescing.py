@@ -0,0 +1,290 @@
+"""
+================================================================================
+SINGLE-FLIGHT — many concurrent callers, ONE backend call per key
+================================================================================
+
+The fetch() coroutine used throughout this folder:
+
+    async def fetch(id: int, delay: int) -> str:
+        await asyncio.sleep(delay)
+        return f"Data-{id}"
+
+is called independently by EVERY caller. With "hot keys" (a popular
+product, a celebrity profile, the home page config) hundreds of
+concurrent callers ask for the SAME id at the SAME time:
+
+    caller A ── fetch(42) ──────────▶ backend
+    caller B ── fetch(42) ──────────▶ backend      (same work, again)
+    caller C ── fetch(42) ──────────▶ backend      (and again...)
+
+Single-flight COALESCES them: the first caller starts the work, everyone
+else awaits the SAME Future (the pattern from `08_futures_basics.py`):
+
+    caller A ── fetch(42) ──┐
+    caller B ───────────────┼── one Future ──▶ backend (once)
+    caller C ───────────────┘
+
+Optionally, the result is kept for a short TTL, so callers arriving just
+AFTER the call finished are served from memory too.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Using a Future as a "result that many can wait for"
+2. Why asyncio.shield() is needed when many callers share one Future
+3. Not caching failures (every caller sees the error, nobody keeps it)
+4. Zipf-distributed (hot-key) traffic
+5. Measuring backend calls and p99 latency
+
+================================================================================
+"""
+
+import time
+import random
+import asyncio
+import functools
+
+
+# ------------------------------------------------------------------------------
+# SINGLE-FLIGHT GROUP
+# ------------------------------------------------------------------------------
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    Arguments:
+    ----------
+    ttl : seconds a successful result stays cached after the call
+          (0 = no cache, only in-flight calls are shared)
+
+    Example:
+    --------
+    group = SingleFlight(ttl=0.5)
+    data = await group.do(42, fetch, 42, 1)
+
+    fetch = group.wrap(fetch)      # key = the call's arguments
+    """
+
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._in_flight = {}        # key → Future
+        self._cache = {}            # key → (expires_at, result)
+        self._tasks = set()         # strong references to running calls
+
+    async def do(self, key, coro_fn, *args):
+        # ----------------------------------------------------------------------
+        # 1. FRESH CACHED RESULT?
+        # ----------------------------------------------------------------------
+        if self.ttl:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    return cached[1]
+                del self._cache[key]
+
+        # ----------------------------------------------------------------------
+        # 2. JOIN THE CALL IN FLIGHT, OR BECOME THE LEADER
+        # ----------------------------------------------------------------------
+        future = self._in_flight.get(key)
+
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[key] = future
+            task = asyncio.create_task(self._call(key, future, coro_fn, args))
+
+            # The event loop only keeps WEAK references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+            # Cleanup lives on the TASK, not inside _call(): a task cancelled
+            # before its first step never runs the coroutine body at all
+            task.add_done_callback(functools.partial(self._finish, key, future))
+
+        # shield(): if ONE caller is cancelled (e.g. a timeout), the shared
+        # Future must keep running for everybody else
+        return await asyncio.shield(future)
+
+    async def _call(self, key, future: asyncio.Future, coro_fn, args) -> None:
+        """
+        Runs the real call in its own task, so it does not belong to
+        (and cannot be cancelled with) whichever caller came first.
+        """
+        try:
+            result = await coro_fn(*args)
+        except Exception as exc:
+            future.set_exception(exc)   # every waiter gets the error...
+        else:
+            future.set_result(result)
+            if self.ttl:
+                expires_at = time.monotonic() + self.ttl
+                self._cache[key] = (expires_at, result)
+                # Keys that are never asked for again must not stay forever
+                asyncio.get_running_loop().call_later(self.ttl, self._evict, key, expires_at)
+
+    def _finish(self, key, future: asyncio.Future, task: asyncio.Task) -> None:
+        """
+        Done-callback of the leader task: runs however the task ended.
+        """
+        if not future.done():
+            future.cancel()             # cancelled: waiters must not hang
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]    # ...and the next call retries
+
+    def _evict(self, key, expires_at: float) -> None:
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == expires_at:     # not a newer entry
+            del self._cache[key]
+
+    def wrap(self, coro_fn):
+        """
+        Decorator form: calls with the same arguments are coalesced.
+        """
+        @functools.wraps(coro_fn)
+        async def wrapper(*args):
+            return await self.do(args, coro_fn, *args)
+
+        return wrapper
+
+
+# ------------------------------------------------------------------------------
+# SIMULATED BACKEND
+# ------------------------------------------------------------------------------
+class Backend:
+    """
+    fetch(id, delay) with a real capacity: at most 50 calls are served
+    at once, the rest queue — like a database connection pool.
+    """
+
+    def __init__(self, capacity: int = 50):
+        self.calls = 0
+        self._slots = asyncio.Semaphore(capacity)
+
+    async def fetch(self, id: int, delay: float) -> str:
+        self.calls += 1
+        async with self._slots:
+            await asyncio.sleep(delay)
+        return f"Data-{id}"
+
+
+# ------------------------------------------------------------------------------
+# ZIPF TRAFFIC
+# ------------------------------------------------------------------------------
+def zipf_keys(count: int, n_keys: int = 1000, s: float = 1.1, seed: int = 1) -> list:
+    """
+    Key k is requested with probability ∝ 1 / k^s:
+    a handful of keys get most of the traffic, a long tail gets the rest.
+    """
+    weights = [1 / k ** s for k in range(1, n_keys + 1)]
+    return random.Random(seed).choices(range(n_keys), weights=weights, k=count)
+
+
+async def run_traffic(fetch, keys: list, per_tick: int, tick: float = 0.01) -> list:
+    """
+    Fires `per_tick` requests every `tick` seconds; returns each latency.
+    """
+    latencies = []
+
+    async def request(key: int) -> None:
+        start = time.perf_counter()
+        await fetch(key, 0.02)
+        latencies.append(time.perf_counter() - start)
+
+    async with asyncio.TaskGroup() as tg:
+        for i in range(0, len(keys), per_tick):
+            for key in keys[i:i + per_tick]:
+                tg.create_task(request(key))
+            await asyncio.sleep(tick)
+
+    return latencies
+
+
+# ------------------------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------------------------
+async def main() -> None:
+    # --------------------------------------------------------------------------
+    # 1. THE BASIC IDEA: fetch(1, 2) three times at once → one backend call
+    # --------------------------------------------------------------------------
+    backend = Backend()
+    fetch = SingleFlight().wrap(backend.fetch)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(fetch(1, 2), fetch(1, 2), fetch(1, 2))
+    print(f"{results} in {time.perf_counter() - start:.1f}s, "
+          f"backend calls: {backend.calls}\n")
+
+    # --------------------------------------------------------------------------
+    # 2. HOT-KEY TRAFFIC: 20,000 requests over 5 s, 1,000 keys, Zipf(1.1)
+    # --------------------------------------------------------------------------
+    keys = zipf_keys(20_000)
+
+    print("20,000 requests (4,000/s), Zipf over 1,000 keys, "
+          "backend: 20 ms per call, 50 at a time\n")
+    print(f"{'mode':<24} {'backend calls':>14} {'p50':>9} {'p99':>9}")
+
+    for name, group in (('direct', None),
+                        ('single-flight', SingleFlight()),
+                        ('single-flight + 1s TTL', SingleFlight(ttl=1.0))):
+        backend = Backend()
+        fetch = group.wrap(backend.fetch) if group else backend.fetch
+
+        latencies = sorted(await run_traffic(fetch, keys, per_tick=40))
+
+        print(f"{name:<24} {backend.calls:>14,} "
+              f"{latencies[len(latencies) // 2] * 1000:>7.0f}ms "
+              f"{latencies[int(len(latencies) * 0.99)] * 1000:>7.0f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+# ==============================================================================
+# OBSERVED OUTPUT
+# ==============================================================================
+
+"""
+['Data-1', 'Data-1', 'Data-1'] in 2.0s, backend calls: 1
+
+20,000 requests (4,000/s), Zipf over 1,000 keys, backend: 20 ms per call, 50 at a time
+
+mode                      backend calls       p50       p99
+direct                           20,000    1594ms    3098ms
+single-flight                    10,936      22ms      28ms
+single-flight + 1s TTL            2,678       0ms      22ms
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. DUPLICATES ARE THE PROBLEM, NOT THE TRAFFIC
+   - 4,000 req/s is MORE than the backend can serve (50 / 20 ms = 2,500/s)
+   - Called directly, its queue grows for the whole run → p99 of 3 s
+   - Coalesced, the same traffic needs ~2,200 calls/s → no queue at all
+
+2. THE HOTTER THE KEYS, THE BIGGER THE WIN
+   - With Zipf traffic the top few keys are always in flight;
+     every extra request for them is free
+   - Uniform keys would coalesce much less
+
+3. TTL = "ALSO SHARE WITH CALLERS WHO JUST MISSED IT"
+   - Single-flight only helps callers that OVERLAP the call
+   - A short TTL serves the next second of requests from memory
+   - Trade-off: results may be up to `ttl` seconds stale
+   - Each entry schedules its own eviction (loop.call_later), so keys
+     that are never requested again do not pile up in the cache
+
+4. FAILURES ARE SHARED, NOT CACHED
+   - Every waiter receives the same exception
+   - The key is removed from the in-flight table, so the next call retries
+
+5. CANCELLATION
+   - The real call runs in its own task, and callers await a shield()
+     of the Future: one impatient caller cannot cancel it for the others
+   - If the call task ITSELF is cancelled (e.g. at shutdown), the shared
+     Future is cancelled too, so no waiter is left hanging
+"""
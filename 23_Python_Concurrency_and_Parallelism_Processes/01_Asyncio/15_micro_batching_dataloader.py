@@ -0,0 +1,262 @@
+"""
+================================================================================
+MICRO-BATCHING — many load(key) calls, ONE batched backend call
+================================================================================
+
+`06_gather.py` fetches three items concurrently:
+
+    await asyncio.gather(fetch(1, 2), fetch(2, 1), fetch(3, 3))
+
+Concurrent, yes — but still THREE round trips. Most backends (SQL
+`WHERE id IN (...)`, Redis MGET, HTTP batch endpoints) can answer
+many keys in ONE round trip, and a round trip is usually the expensive
+part: network latency, connection slot, query parsing...
+
+A DataLoader (the pattern popularised by GraphQL) keeps the simple
+one-key API for callers and batches behind their backs:
+
+    user = await loader.load(42)
+
+    caller A ── load(1) ──┐
+    caller B ── load(2) ──┼── wait ≤ max_wait, ≤ max_batch_size keys
+    caller C ── load(3) ──┘        │
+                                   ▼
+                         fetch_many([1, 2, 3])   ← one round trip
+                                   │
+             each caller's Future ◀┘ resolved with its own result
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Collecting work from independent callers into a batch
+2. Flushing on SIZE (max_batch_size) or TIME (max_wait)
+3. max_wait=0: "everything requested in this event-loop tick"
+4. Resolving one Future per caller from a single batched result
+5. Round trips vs latency trade-off
+
+================================================================================
+"""
+
+import time
+import asyncio
+
+
+# ------------------------------------------------------------------------------
+# THE DATALOADER
+# ------------------------------------------------------------------------------
+class DataLoader:
+    """
+    Batches load(key) calls into batch_fn(keys).
+
+    Arguments:
+    ----------
+    batch_fn       : async function: list of keys → list of results,
+                     SAME length and order as the keys
+    max_batch_size : flush as soon as this many keys are waiting
+    max_wait       : flush at most this many seconds after the first key
+                     (0 → at the end of the current event-loop iteration)
+
+    Duplicate keys in one batch are sent to the backend only once.
+    """
+
+    def __init__(self, batch_fn, max_batch_size: int = 100, max_wait: float = 0.0):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._pending = {}          # key → list of Futures waiting for it
+        self._timer = None
+        self._tasks = set()
+
+    async def load(self, key):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._pending.setdefault(key, []).append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            # First key of a new batch starts the clock
+            if self.max_wait:
+                self._timer = loop.call_later(self.max_wait, self._dispatch)
+            else:
+                self._timer = loop.call_soon(self._dispatch)
+
+        return await future
+
+    async def load_many(self, keys: list) -> list:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    # --------------------------------------------------------------------------
+    # FLUSH
+    # --------------------------------------------------------------------------
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: dict) -> None:
+        keys = list(batch)
+
+        try:
+            results = await self.batch_fn(keys)
+            if len(results) != len(keys):
+                raise ValueError(f"batch_fn returned {len(results)} results "
+                                 f"for {len(keys)} keys")
+        except Exception as exc:
+            # The whole batch failed: every caller in it gets the error
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+        except BaseException:
+            # The batch task itself was cancelled (e.g. at shutdown):
+            # its callers must not wait forever
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+
+        for key, result in zip(keys, results):
+            for future in batch[key]:
+                if not future.done():       # the caller may have been cancelled
+                    future.set_result(result)
+
+
+# ------------------------------------------------------------------------------
+# SIMULATED BACKEND
+# ------------------------------------------------------------------------------
+class Backend:
+    """
+    Every ROUND TRIP costs 10 ms, plus 0.05 ms per key in it.
+    At most 10 round trips run at once (its connection pool).
+    """
+
+    def __init__(self, round_trip: float = 0.01, per_key: float = 0.00005,
+                 connections: int = 10):
+        self.round_trip = round_trip
+        self.per_key = per_key
+        self.round_trips = 0
+        self._connections = asyncio.Semaphore(connections)
+
+    async def fetch(self, id: int) -> str:
+        return (await self.fetch_many([id]))[0]
+
+    async def fetch_many(self, ids: list) -> list:
+        self.round_trips += 1
+        async with self._connections:
+            await asyncio.sleep(self.round_trip + self.per_key * len(ids))
+        return [f"Data-{id}" for id in ids]
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK
+# ------------------------------------------------------------------------------
+async def run_callers(load, count: int, spread: float) -> list:
+    """
+    `count` independent callers, arriving evenly over `spread` seconds
+    (spread=0: all at once). Returns each caller's latency.
+    """
+    latencies = []
+
+    async def caller(i: int) -> None:
+        await asyncio.sleep(spread * i / count)
+        start = time.perf_counter()
+        assert await load(i) == f"Data-{i}"
+        latencies.append(time.perf_counter() - start)
+
+    async with asyncio.TaskGroup() as tg:
+        for i in range(count):
+            tg.create_task(caller(i))
+
+    return latencies
+
+
+async def main() -> None:
+    # --------------------------------------------------------------------------
+    # 1. THE gather() FROM 06_gather.py, BATCHED
+    # --------------------------------------------------------------------------
+    backend = Backend()
+    loader = DataLoader(backend.fetch_many)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3))
+    print(f"{results} → {backend.round_trips} round trip\n")
+
+    # --------------------------------------------------------------------------
+    # 2. 5,000 CALLERS: ALL AT ONCE, THEN SPREAD OVER 1 SECOND
+    # --------------------------------------------------------------------------
+    print(f"{'mode':<34} {'arrival':>8} {'round trips':>12} {'total':>8} {'mean lat':>9}")
+
+    for spread in (0, 1.0):
+        for name, make in (
+            ('unbatched gather', lambda b: b.fetch),
+            ('DataLoader(max_wait=0)', lambda b: DataLoader(b.fetch_many).load),
+            ('DataLoader(max_wait=2ms)',
+             lambda b: DataLoader(b.fetch_many, max_wait=0.002).load),
+        ):
+            backend = Backend()
+            start = time.perf_counter()
+            latencies = await run_callers(make(backend), 5000, spread)
+            total = time.perf_counter() - start
+
+            print(f"{name:<34} {'burst' if not spread else f'{spread:.0f}s':>8} "
+                  f"{backend.round_trips:>12,} {total:>7.2f}s "
+                  f"{sum(latencies) / len(latencies) * 1000:>7.1f}ms")
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+# ==============================================================================
+# OBSERVED OUTPUT
+# ==============================================================================
+
+"""
+['Data-1', 'Data-2', 'Data-3'] → 1 round trip
+
+mode                                arrival  round trips    total  mean lat
+unbatched gather                      burst        5,000    5.25s  2617.2ms
+DataLoader(max_wait=0)                burst           50    0.13s    59.5ms
+DataLoader(max_wait=2ms)              burst           50    0.13s    57.1ms
+
+unbatched gather                         1s        5,000    5.25s  2135.0ms
+DataLoader(max_wait=0)                   1s        1,392    1.56s   256.9ms
+DataLoader(max_wait=2ms)                 1s          396    1.07s    13.4ms
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. ROUND TRIPS ARE THE BOTTLENECK
+   - Unbatched: 5,000 round trips through 10 connections → 5 s,
+     whatever the arrival pattern
+   - Batched burst: 50 round trips of 100 keys → 0.13 s (40× faster)
+
+2. max_wait=0 IS PERFECT FOR BURSTS...
+   - Everything requested in the same event-loop tick (a gather(),
+     a GraphQL resolver tree) lands in one batch, with zero added delay
+
+3. ...BUT NOT FOR A STEADY STREAM
+   - Callers arriving one by one produce tiny batches (~4 keys);
+     the connection pool saturates and a queue builds up (257 ms)
+   - Waiting just 2 ms collects ~13 keys per batch: 3.5× fewer round
+     trips and a 13 ms mean latency — the wait pays for itself
+
+4. CHOOSING THE KNOBS
+   - max_wait     : a small fraction of one round trip
+   - max_batch_size: what the backend accepts (IN-list size, MGET limit)
+"""
@@ -0,0 +1,381 @@
+"""
+================================================================================
+READER-WRITER LOCK & KEYED LOCKS — stop serializing what does not conflict
+================================================================================
+
+`09_locks.py` guards ONE global counter with ONE asyncio.Lock:
+
+    async with lock:
+        temp = counter
+        await asyncio.sleep(1)
+        counter = temp + 1
+
+Every coroutine waits for every other one — even when:
+✘ it only READS (readers never conflict with each other)
+✘ it touches a DIFFERENT key (user 1's balance vs user 2's balance)
+
+Two finer-grained tools:
+
+✔ RWLock       : many readers at once, OR one writer
+                 (writer preference: once a writer waits, new readers
+                  queue behind it, so a steady stream of readers can
+                  never starve writers)
+
+✔ KeyedLocks   : one lock PER KEY, created on first use and removed
+                 when nobody holds or waits for it (no memory leak
+                 with millions of keys)
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Shared (read) vs exclusive (write) access
+2. Building a lock from Futures (and why not asyncio.Condition)
+3. Writer preference and starvation
+4. Per-key locking with reference counting
+5. Measuring throughput on a 95% read / 5% write workload
+
+================================================================================
+"""
+
+import time
+import random
+import asyncio
+import contextlib
+import collections
+
+
+# ------------------------------------------------------------------------------
+# READER-WRITER LOCK
+# ------------------------------------------------------------------------------
+class RWLock:
+    """
+    async with rwlock.read():   ...   # shared
+    async with rwlock.write():  ...   # exclusive
+
+    Waiters park on their own Future, in two FIFO queues. A release
+    wakes exactly the coroutines that can now run — NOT everybody
+    (asyncio.Condition.notify_all() would wake thousands of waiting
+    readers on every write, just to put them back to sleep).
+    """
+
+    def __init__(self):
+        self._readers = 0
+        self._writer = False
+        self._read_waiters = collections.deque()
+        self._write_waiters = collections.deque()
+
+    @contextlib.asynccontextmanager
+    async def read(self):
+        # Writer preference: a WAITING writer also makes new readers queue
+        if self._writer or self._write_waiters:
+            await self._wait(self._read_waiters)
+        else:
+            self._readers += 1
+        try:
+            yield
+        finally:
+            self._readers -= 1
+            self._wake()
+
+    @contextlib.asynccontextmanager
+    async def write(self):
+        if self._writer or self._readers or self._write_waiters:
+            await self._wait(self._write_waiters)
+        else:
+            self._writer = True
+        try:
+            yield
+        finally:
+            self._writer = False
+            self._wake()
+
+    # --------------------------------------------------------------------------
+    # WAITING & WAKING
+    # --------------------------------------------------------------------------
+    async def _wait(self, queue: collections.deque) -> None:
+        """
+        Parks on a Future until _wake() hands us the lock
+        (_wake() updates _readers / _writer BEFORE waking us).
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted, then cancelled before running: give it back
+                if queue is self._write_waiters:
+                    self._writer = False
+                else:
+                    self._readers -= 1
+            elif waiter in queue:
+                # (_wake() may already have dropped it as cancelled)
+                queue.remove(waiter)
+            self._wake()
+            raise
+
+    def _wake(self) -> None:
+        """
+        A waiter cancelled in the same loop iteration as the release is
+        still queued, with a done Future: it is dropped, never granted.
+        """
+        if self._writer:
+            return
+
+        # 1. Writers first — but only once the last reader has left
+        while self._write_waiters and self._write_waiters[0].done():
+            self._write_waiters.popleft()
+
+        if self._write_waiters:
+            if not self._readers:
+                self._writer = True
+                self._write_waiters.popleft().set_result(None)
+            return
+
+        # 2. No writer waiting: ALL waiting readers may enter together
+        while self._read_waiters:
+            waiter = self._read_waiters.popleft()
+            if not waiter.done():
+                self._readers += 1
+                waiter.set_result(None)
+
+
+# ------------------------------------------------------------------------------
+# KEYED LOCKS
+# ------------------------------------------------------------------------------
+class KeyedLocks:
+    """
+    async with locks('user:42'):
+        ...
+
+    Coroutines using DIFFERENT keys never wait for each other.
+
+    Each entry is [lock, users]; `users` counts holders + waiters, and the
+    entry is deleted when it drops to 0, so the dict only ever contains
+    keys that are in use right now.
+
+    factory : asyncio.Lock (default) or RWLock
+
+    With RWLock, go through hold() and pick the mode yourself:
+
+    async with locks.hold('user:42') as rwlock:
+        async with rwlock.read():
+            ...
+    """
+
+    def __init__(self, factory=asyncio.Lock):
+        self.factory = factory
+        self._entries = {}
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key):
+        """
+        Yields the per-key lock object WITHOUT acquiring it
+        (needed for RWLock: the caller picks read() or write()).
+        """
+        entry = self._entries.setdefault(key, [None, 0])
+        if entry[0] is None:
+            entry[0] = self.factory()
+        entry[1] += 1
+        try:
+            yield entry[0]
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._entries[key]
+
+    @contextlib.asynccontextmanager
+    async def __call__(self, key):
+        async with self.hold(key) as lock:
+            if not hasattr(lock, '__aenter__'):
+                raise TypeError(f"{type(lock).__name__} cannot be held with "
+                                f"`async with locks(key)`; use locks.hold(key) "
+                                f"and its read() / write()")
+            async with lock:
+                yield
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK: 95% READS, 5% WRITES, 100 KEYS
+# ------------------------------------------------------------------------------
+HOLD_TIME = 0.001       # every operation awaits I/O while holding its lock
+
+
+def make_ops(count: int, n_keys: int, write_ratio: float, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [(rng.random() < write_ratio, rng.randrange(n_keys)) for _ in range(count)]
+
+
+async def run(strategy: str, ops: list, n_keys: int) -> tuple:
+    """
+    Runs every op concurrently. A write is the read-modify-write from
+    09_locks.py, so lost updates would show up in the final totals.
+
+    Returns: (elapsed seconds, correct totals?, worst write wait)
+    """
+    data = {key: 0 for key in range(n_keys)}
+    write_waits = []
+
+    single = asyncio.Lock()
+    rwlock = RWLock()
+    keyed = KeyedLocks()
+    keyed_rw = KeyedLocks(RWLock)
+
+    async def read(key: int) -> int:
+        await asyncio.sleep(HOLD_TIME)
+        return data[key]
+
+    async def write(key: int) -> None:
+        temp = data[key]
+        await asyncio.sleep(HOLD_TIME)
+        data[key] = temp + 1
+
+    async def op(is_write: bool, key: int) -> None:
+        queued = time.perf_counter()
+        action = write(key) if is_write else read(key)
+
+        if strategy == 'single Lock':
+            async with single:
+                wait = time.perf_counter() - queued
+                await action
+        elif strategy == 'RWLock':
+            async with (rwlock.write() if is_write else rwlock.read()):
+                wait = time.perf_counter() - queued
+                await action
+        elif strategy == 'KeyedLocks':
+            async with keyed(key):
+                wait = time.perf_counter() - queued
+                await action
+        else:  # 'KeyedLocks(RWLock)'
+            async with keyed_rw.hold(key) as lock:
+                async with (lock.write() if is_write else lock.read()):
+                    wait = time.perf_counter() - queued
+                    await action
+
+        if is_write:
+            write_waits.append(wait)
+
+    start = time.perf_counter()
+    async with asyncio.TaskGroup() as tg:
+        for is_write, key in ops:
+            tg.create_task(op(is_write, key))
+    elapsed = time.perf_counter() - start
+
+    expected = {key: 0 for key in range(n_keys)}
+    for is_write, key in ops:
+        expected[key] += is_write
+
+    assert len(keyed) == len(keyed_rw) == 0, "keyed locks were not cleaned up"
+    return elapsed, data == expected, max(write_waits)
+
+
+# ------------------------------------------------------------------------------
+# REGRESSION CHECK: RELEASE + CANCEL IN THE SAME LOOP ITERATION
+# ------------------------------------------------------------------------------
+async def check_release_and_cancel() -> None:
+    """
+    The holder releases and the next waiter is cancelled before either
+    runs again: _wake() then finds a CANCELLED Future at the head of the
+    queue. Granting it would leave the lock taken by nobody, forever.
+    """
+    for holder_mode, waiter_mode in (('read', 'write'), ('write', 'read')):
+        lock = RWLock()
+        held, release = asyncio.Event(), asyncio.Event()
+
+        async def holder():
+            async with getattr(lock, holder_mode)():
+                held.set()
+                await release.wait()
+
+        async def waiter():
+            async with getattr(lock, waiter_mode)():
+                pass
+
+        holding = asyncio.create_task(holder())
+        await held.wait()
+        waiting = asyncio.create_task(waiter())
+        await asyncio.sleep(0)                  # the waiter is now queued
+
+        release.set()                           # both happen before the
+        waiting.cancel()                        # next loop iteration
+        await asyncio.gather(holding, waiting, return_exceptions=True)
+
+        async with asyncio.timeout(1):          # still usable?
+            async with lock.write():
+                pass
+
+    print("release + cancel in the same iteration: lock still usable\n")
+
+
+async def main() -> None:
+    await check_release_and_cancel()
+
+    n_keys = 100
+    ops = make_ops(5_000, n_keys, write_ratio=0.05)
+
+    print(f"{len(ops):,} operations (95% read / 5% write), {n_keys} keys, "
+          f"{HOLD_TIME * 1000:.0f} ms I/O while holding the lock\n")
+    print(f"{'strategy':<20} {'time':>8} {'ops/s':>9} {'worst write wait':>17} {'totals':>8}")
+
+    for strategy in ('single Lock', 'RWLock', 'KeyedLocks', 'KeyedLocks(RWLock)'):
+        elapsed, correct, worst_wait = await run(strategy, ops, n_keys)
+        print(f"{strategy:<20} {elapsed:>7.2f}s {len(ops) / elapsed:>9,.0f} "
+              f"{worst_wait * 1000:>15.0f}ms {'OK' if correct else 'WRONG':>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+
+# ==============================================================================
+# OBSERVED OUTPUT
+# ==============================================================================
+
+"""
+release + cancel in the same iteration: lock still usable
+
+5,000 operations (95% read / 5% write), 100 keys, 1 ms I/O while holding the lock
+
+strategy                 time     ops/s  worst write wait   totals
+single Lock             6.11s       818            6042ms       OK
+RWLock                  0.45s    11,103             306ms       OK
+KeyedLocks              0.24s    20,524             153ms       OK
+KeyedLocks(RWLock)      0.22s    23,144             116ms       OK
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. THE SINGLE LOCK SERIALIZES EVERYTHING
+   - 5,000 ops × 1 ms, one after another ≈ 5+ s
+   - A write can wait behind thousands of unrelated reads (6 s!)
+
+2. RWLock: READS OVERLAP
+   - 4,750 reads run in a few large batches; only the ~250 writes
+     are exclusive → 13× the throughput
+
+3. KeyedLocks: UNRELATED KEYS NEVER MEET
+   - Each key sees ~50 ops; 100 keys progress in parallel
+   - KeyedLocks(RWLock) combines both ideas and wins
+   - No entries are left behind once all ops finished (len() == 0)
+
+4. WRITER PREFERENCE — AND ITS PRICE
+   - Readers arriving while a writer waits must queue, so writers
+     never starve
+   - Under a CONSTANT stream of writes, readers could starve instead;
+     strict FIFO ("phase-fair") locks trade some read throughput for
+     bounded waits on both sides
+
+5. WHY NOT asyncio.Condition?
+   - Condition.notify_all() wakes EVERY waiter on each release; with
+     ~5,000 waiters, almost all of them just re-check and go back to
+     sleep (a "thundering herd"), so each release costs O(waiters)
+   - One Future per waiter lets _wake() resume only those that can run
+"""
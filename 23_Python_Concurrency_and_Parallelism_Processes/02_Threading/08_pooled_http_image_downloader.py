@@ -0,0 +1,273 @@
+"""
+================================================================================
+POOLED & BOUNDED HTTP IMAGE DOWNLOADER — requests.Session + ThreadPoolExecutor
+================================================================================
+
+This example is a follow-up to `06_threadpool_http_image_downloader.py`.
+
+06_... overlaps I/O with threads, but every download still:
+✘ Calls the module-level requests.get() → a NEW connection per image
+  (TCP handshake + TLS handshake, every single time)
+✘ Uses .content → the WHOLE image is held in memory before writing
+✘ Runs with the default worker count → no explicit limit on in-flight requests
+
+This file fixes all three:
+✔ A shared, thread-safe CONNECTION POOL (HTTPAdapter) reused by every thread
+✔ One requests.Session PER THREAD on top of that pool (sessions are not
+  guaranteed to be thread-safe, the underlying urllib3 pool is)
+✔ pool_size caps open connections, max_in_flight caps concurrent requests
+✔ Bodies are STREAMED to disk in fixed-size chunks (constant memory)
+
+A local stand-in server (local_image_server.py) makes the benchmark
+reproducible and offline.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Why connection reuse (keep-alive) matters more than thread count
+2. How requests.Session + HTTPAdapter implement connection pooling
+3. How threading.local() gives each thread its own object
+4. Why streaming bodies keeps memory flat regardless of file size
+5. How to benchmark network code without the network
+
+================================================================================
+"""
+
+import time
+import os
+import threading
+import tempfile
+import tracemalloc
+import concurrent.futures
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from local_image_server import LocalImageServer
+
+
+# ------------------------------------------------------------------------------
+# SETTINGS
+# ------------------------------------------------------------------------------
+POOL_SIZE = 8          # max open connections per host
+MAX_IN_FLIGHT = 8      # max concurrent requests (= worker threads)
+CHUNK_SIZE = 64 * 1024 # bytes read from the socket / written to disk at a time
+
+
+# ------------------------------------------------------------------------------
+# FILE NAME FROM URL
+# ------------------------------------------------------------------------------
+# 05_... and 06_... use img_url.split('/')[3], which breaks as soon as the
+# URL has a port, a deeper path or a query string. urlparse() does not.
+# ------------------------------------------------------------------------------
+def image_name(img_url: str) -> str:
+    return f"{os.path.basename(urlparse(img_url).path)}.jpg"
+
+
+# ------------------------------------------------------------------------------
+# POOLED DOWNLOADER
+# ------------------------------------------------------------------------------
+class PooledDownloader:
+    """
+    Downloads URLs concurrently over a shared connection pool.
+
+    Arguments:
+    ----------
+    pool_size     : int : connections kept open per host
+    max_in_flight : int : requests running at the same time
+    chunk_size    : int : streaming chunk size in bytes
+
+    HOW THE PIECES FIT:
+    -------------------
+    ThreadPoolExecutor(max_in_flight)
+        └── thread 1 ── Session ─┐
+        └── thread 2 ── Session ─┼── ONE HTTPAdapter (urllib3 pool, pool_size)
+        └── thread N ── Session ─┘
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE, max_in_flight: int = MAX_IN_FLIGHT,
+                 chunk_size: int = CHUNK_SIZE):
+        self.max_in_flight = max_in_flight
+        self.chunk_size = chunk_size
+
+        # pool_block=True: never open more than pool_size connections,
+        # threads WAIT for a free connection instead
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                                   pool_block=True)
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The calling thread's Session, created on first use.
+        """
+        if not hasattr(self._local, 'session'):
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+        return self._local.session
+
+    def download_image(self, img_url: str, out_dir: str) -> int:
+        """
+        Streams one image to disk.
+
+        stream=True:
+        ------------
+        Only the headers are read up front. iter_content() then pulls
+        the body chunk by chunk, so memory stays at ~chunk_size no matter
+        how large the image is.
+
+        Returns:
+        --------
+        int : number of bytes written
+        """
+        img_name = os.path.join(out_dir, image_name(img_url))
+        written = 0
+
+        with self.session.get(img_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+
+            with open(img_name, 'wb') as img_file:
+                for chunk in response.iter_content(self.chunk_size):
+                    img_file.write(chunk)
+                    written += len(chunk)
+
+        return written
+
+    def download_all(self, img_urls: list, out_dir: str) -> int:
+        """
+        Downloads every URL with at most max_in_flight requests at a time.
+
+        Returns:
+        --------
+        int : total bytes written
+        """
+        os.makedirs(out_dir, exist_ok=True)
+
+        with concurrent.futures.ThreadPoolExecutor(self.max_in_flight) as executor:
+            futures = [executor.submit(self.download_image, url, out_dir)
+                       for url in img_urls]
+
+            total = 0
+            for future in concurrent.futures.as_completed(futures):
+                total += future.result()
+
+        return total
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+# ------------------------------------------------------------------------------
+# BASELINES (SAME LOGIC AS 05_... AND 06_...)
+# ------------------------------------------------------------------------------
+def download_sequential(img_urls: list, out_dir: str) -> None:
+    for img_url in img_urls:
+        img_bytes = requests.get(img_url).content
+        with open(os.path.join(out_dir, image_name(img_url)), 'wb') as img_file:
+            img_file.write(img_bytes)
+
+
+def download_threaded(img_urls: list, out_dir: str) -> None:
+    def download_image(img_url: str) -> None:
+        img_bytes = requests.get(img_url).content
+        with open(os.path.join(out_dir, image_name(img_url)), 'wb') as img_file:
+            img_file.write(img_bytes)
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        list(executor.map(download_image, img_urls))
+
+
+def download_pooled(img_urls: list, out_dir: str) -> None:
+    downloader = PooledDownloader()
+    try:
+        downloader.download_all(img_urls, out_dir)
+    finally:
+        downloader.close()
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK
+# ------------------------------------------------------------------------------
+def main():
+    """
+    Runs the three strategies against the local server.
+
+    Server settings:
+    - 30 ms per new connection (handshake)
+    - 20 ms per request
+    """
+    n_urls = 64
+
+    with LocalImageServer(latency=0.02, handshake_delay=0.03) as server:
+        img_urls = server.urls(n_urls)
+
+        print(f"Downloading {n_urls} images from {server.base_url}\n")
+        print(f"{'strategy':<12} {'time':>8} {'connections':>12} {'peak memory':>12}")
+
+        for name, strategy in (('sequential', download_sequential),
+                               ('threaded', download_threaded),
+                               ('pooled', download_pooled)):
+            server.reset_stats()
+
+            with tempfile.TemporaryDirectory() as out_dir:
+                tracemalloc.start()
+                start = time.perf_counter()
+
+                strategy(img_urls, out_dir)
+
+                finished = time.perf_counter()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            print(f"{name:<12} {finished - start:>7.2f}s {server.connections:>12} "
+                  f"{peak / 1024 / 1024:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (1 CPU CORE, LOOPBACK)
+# ==============================================================================
+
+"""
+Downloading 64 images from http://127.0.0.1:43149
+
+strategy         time  connections  peak memory
+sequential      4.77s           64      10.6 MB
+threaded        1.78s           64      24.8 MB
+pooled          0.56s            8       1.0 MB
+
+"peak memory" is traced Python allocations (tracemalloc) of the whole
+process, which also runs the local server.
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. CONNECTIONS
+   - requests.get() opens (and closes) one connection per call
+   - The pooled downloader opens at most POOL_SIZE, then reuses them
+   - Against a real HTTPS CDN every saved connection saves a TLS handshake
+
+2. BOUNDED CONCURRENCY
+   - MAX_IN_FLIGHT is an explicit promise to the server
+   - More threads than pooled connections just means threads WAIT
+     (pool_block=True) instead of opening extra connections
+
+3. STREAMING
+   - .content holds every in-flight image fully in memory
+   - iter_content() keeps ~CHUNK_SIZE per in-flight download
+
+4. SESSION PER THREAD, POOL SHARED
+   - requests.Session carries cookies & settings (not documented thread-safe)
+   - The urllib3 connection pool inside HTTPAdapter IS thread-safe
+"""
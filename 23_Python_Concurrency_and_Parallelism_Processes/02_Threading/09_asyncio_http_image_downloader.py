@@ -0,0 +1,233 @@
+"""
+================================================================================
+ASYNCIO HTTP IMAGE DOWNLOADER — aiohttp + Semaphore + TaskGroup
+================================================================================
+
+This example puts the pieces from 01_Asyncio to work on the downloader from
+`05_sync_http_image_downloader.py` and `08_pooled_http_image_downloader.py`.
+
+Threads overlap I/O by giving every in-flight request its own OS thread:
+✘ Each thread costs a stack (MBs of virtual memory) and a kernel object
+✘ The OS, not your program, decides when to switch
+✘ Thousands of URLs → thousands of threads, or a long queue behind a few
+
+AsyncIO overlaps I/O inside ONE thread:
+✔ Every download is a coroutine (a few KB of memory)
+✔ asyncio.Semaphore bounds how many are in flight   (10_semaphores.py)
+✔ asyncio.TaskGroup owns all tasks, cancels on error (07_taskgroup_...py)
+✔ aiohttp's TCPConnector reuses connections and caps them PER HOST
+✔ File writes are pushed to a worker thread so they never block the loop
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. How to combine Semaphore + TaskGroup for bounded structured concurrency
+2. Global vs per-host connection limits
+3. Why disk writes must not run on the event loop thread
+4. How asyncio and a thread pool compare at 100 / 1,000 / 10,000 URLs
+
+================================================================================
+REQUIREMENTS
+================================================================================
+
+pip install aiohttp requests
+
+Python 3.11+ (asyncio.TaskGroup)
+
+================================================================================
+"""
+
+import time
+import os
+import asyncio
+import tempfile
+import importlib
+import tracemalloc
+
+import aiohttp
+
+from local_image_server import LocalImageServer
+
+# The threaded baseline and image_name() from 08_... (import_module
+# accepts names starting with a digit, the `import` statement does not)
+pooled = importlib.import_module('08_pooled_http_image_downloader')
+
+
+# ------------------------------------------------------------------------------
+# SETTINGS
+# ------------------------------------------------------------------------------
+MAX_IN_FLIGHT = 64       # concurrent downloads (Semaphore)
+PER_HOST_LIMIT = 16      # open connections per host (TCPConnector)
+CHUNK_SIZE = 64 * 1024   # bytes per read / write
+
+
+# ------------------------------------------------------------------------------
+# ONE DOWNLOAD (COROUTINE)
+# ------------------------------------------------------------------------------
+async def download_image(session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                         img_url: str, out_dir: str) -> int:
+    """
+    Streams one image to disk.
+
+    - `async with sem` waits until an in-flight slot is free
+    - The response body is read chunk by chunk (constant memory)
+    - Each write runs in a worker thread via asyncio.to_thread(),
+      so a slow disk never freezes the other downloads
+
+    Returns:
+    --------
+    int : number of bytes written
+    """
+    img_name = os.path.join(out_dir, pooled.image_name(img_url))
+    written = 0
+
+    async with sem:
+        async with session.get(img_url) as response:
+            response.raise_for_status()
+
+            img_file = await asyncio.to_thread(open, img_name, 'wb')
+            try:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    await asyncio.to_thread(img_file.write, chunk)
+                    written += len(chunk)
+            finally:
+                await asyncio.to_thread(img_file.close)
+
+    return written
+
+
+# ------------------------------------------------------------------------------
+# MANY DOWNLOADS (ONE THREAD, ONE EVENT LOOP)
+# ------------------------------------------------------------------------------
+async def download_all(img_urls: list, out_dir: str,
+                       max_in_flight: int = MAX_IN_FLIGHT,
+                       per_host_limit: int = PER_HOST_LIMIT) -> int:
+    """
+    Downloads every URL concurrently.
+
+    Two independent limits:
+    -----------------------
+    - Semaphore(max_in_flight) : how many downloads run at once overall
+    - limit_per_host           : how many connections ONE server sees
+
+    If any download fails, the TaskGroup cancels all the others and
+    re-raises the error (as an ExceptionGroup).
+
+    Returns:
+    --------
+    int : total bytes written
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    sem = asyncio.Semaphore(max_in_flight)
+    connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=per_host_limit)
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=30)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(download_image(session, sem, url, out_dir))
+                for url in img_urls
+            ]
+
+    return sum(task.result() for task in tasks)
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK: ASYNCIO VS THREAD POOL
+# ------------------------------------------------------------------------------
+def run_asyncio(img_urls: list, out_dir: str) -> None:
+    asyncio.run(download_all(img_urls, out_dir))
+
+
+def run_threads(img_urls: list, out_dir: str) -> None:
+    downloader = pooled.PooledDownloader(pool_size=PER_HOST_LIMIT,
+                                         max_in_flight=MAX_IN_FLIGHT)
+    try:
+        downloader.download_all(img_urls, out_dir)
+    finally:
+        downloader.close()
+
+
+def main():
+    """
+    Both engines get the same limits:
+    - 64 downloads in flight
+    - 16 connections to the (single) host
+
+    The server returns 32 KB bodies with 10 ms latency so that
+    10,000 URLs stay practical on a laptop.
+    """
+    with LocalImageServer(latency=0.01, handshake_delay=0.03,
+                          max_bytes=32 * 1024) as server:
+
+        print(f"{'urls':>6} {'engine':<8} {'time':>8} {'urls/s':>8} "
+              f"{'peak memory':>12} {'connections':>12}")
+
+        for n_urls in (100, 1_000, 10_000):
+            img_urls = server.urls(n_urls)
+
+            for name, engine in (('threads', run_threads), ('asyncio', run_asyncio)):
+                server.reset_stats()
+
+                with tempfile.TemporaryDirectory() as out_dir:
+                    tracemalloc.start()
+                    start = time.perf_counter()
+
+                    engine(img_urls, out_dir)
+
+                    finished = time.perf_counter()
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                elapsed = finished - start
+                print(f"{n_urls:>6} {name:<8} {elapsed:>7.2f}s {n_urls / elapsed:>8.0f} "
+                      f"{peak / 1024 / 1024:>9.1f} MB {server.connections:>12}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (1 CPU CORE, LOOPBACK, SERVER IN THE SAME PROCESS)
+# ==============================================================================
+
+"""
+  urls engine       time   urls/s  peak memory  connections
+   100 threads     0.54s      186       1.7 MB           16
+   100 asyncio     0.39s      255       1.7 MB           16
+  1000 threads     5.67s      177       3.6 MB           16
+  1000 asyncio     3.54s      282       3.1 MB           16
+ 10000 threads    59.78s      167      21.0 MB           16
+ 10000 asyncio    35.91s      278      19.1 MB           16
+
+tracemalloc only sees Python objects: the 64 thread stacks of the
+threaded engine are NOT included in its "peak memory".
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. SAME LIMITS, DIFFERENT COST
+   - Both engines keep 64 downloads in flight over 16 connections
+   - Threads: 64 OS threads, each with its own stack
+   - AsyncIO: 1 thread, 64 coroutines + 10,000 tiny pending Task objects
+
+2. WHERE MEMORY GOES IN ASYNCIO
+   - Every URL becomes a Task up front (TaskGroup keeps them all)
+   - Waiting tasks are cheap, but not free: ~1–2 KB each
+   - For millions of URLs, pull from the iterator lazily instead
+
+3. WHY asyncio.to_thread() FOR FILE WRITES?
+   - Regular file I/O is ALWAYS blocking, even inside a coroutine
+   - A blocked event loop stalls every other download
+
+4. WHY limit_per_host?
+   - A global limit protects YOU
+   - A per-host limit protects THEM (servers throttle or ban greedy clients)
+"""
@@ -0,0 +1,416 @@
+"""
+================================================================================
+RESUMABLE, DEDUPLICATING IMAGE DOWNLOADER — ETag, Range & a manifest
+================================================================================
+
+This example is a follow-up to `08_pooled_http_image_downloader.py`.
+
+Every downloader so far re-downloads EVERYTHING on every run and overwrites
+whatever was there. When a crawl is re-run constantly, that wastes:
+✘ Bandwidth    : unchanged images are transferred again
+✘ Time         : a crash at 95% of a large file restarts from 0%
+✘ Disk         : identical images under different URLs are stored twice
+
+HTTP already has the tools to avoid all of this:
+✔ ETag / Last-Modified      → "send it only if it changed"  (304 Not Modified)
+✔ Range + If-Range          → "send only the bytes I miss"  (206 Partial Content)
+✔ A content hash (sha256)   → "I already have these bytes"  (hard link)
+
+This file keeps a persistent MANIFEST in the output folder:
+
+    .manifest.json
+    {
+      "http://host/photo-1516117172878-fd2c41f4a759": {
+        "path": "photo-1516117172878-fd2c41f4a759.jpg",
+        "etag": "\\"3be5a2c1-630244\\"",
+        "last_modified": "Sat, 17 Oct 2026 10:00:00 GMT",
+        "size": 630244,
+        "sha256": "9f2c...",
+        "complete": true
+      },
+      ...
+    }
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Conditional requests: If-None-Match / If-Modified-Since → 304
+2. Resuming with Range + If-Range → 206 (and falling back to 200)
+3. Downloading to a .part file (validators in .part.json) and renaming
+   only when complete
+4. Content-addressed de-duplication with hard links
+5. Measuring bytes actually transferred on a second run
+
+================================================================================
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import importlib
+from collections import Counter
+
+from local_image_server import LocalImageServer
+
+# PooledDownloader, image_name() from 08_... (import_module accepts names
+# starting with a digit, the `import` statement does not)
+pooled = importlib.import_module('08_pooled_http_image_downloader')
+
+
+MANIFEST_NAME = '.manifest.json'
+VALIDATORS_SUFFIX = '.json'      # photo.jpg.part → photo.jpg.part.json
+
+
+# ------------------------------------------------------------------------------
+# RESUMABLE DOWNLOADER
+# ------------------------------------------------------------------------------
+class ResumableDownloader(pooled.PooledDownloader):
+    """
+    PooledDownloader (shared connection pool, bounded threads, streaming)
+    plus a manifest that makes re-runs cheap.
+
+    Per URL, one of three things happens:
+    -------------------------------------
+    1. Complete copy on disk  → conditional GET       → 304, nothing sent
+    2. .part file on disk     → Range GET + If-Range  → 206, only the rest
+    3. Nothing (or stale)     → plain GET             → 200, full body
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.manifest = {}
+        self.by_hash = {}
+        self.statuses = Counter()
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------------------------
+    # MANIFEST
+    # --------------------------------------------------------------------------
+    def load_manifest(self, out_dir: str) -> None:
+        try:
+            with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.manifest = {}
+
+        # sha256 → path of a file that already holds those bytes
+        self.by_hash = {
+            entry['sha256']: os.path.join(out_dir, entry['path'])
+            for entry in self.manifest.values()
+            if entry.get('complete')
+        }
+
+    def save_manifest(self, out_dir: str) -> None:
+        """
+        Atomic write: temp file + os.replace().
+        """
+        path = os.path.join(out_dir, MANIFEST_NAME)
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+
+    def update_entry(self, img_url: str, **fields) -> None:
+        with self._lock:
+            self.manifest.setdefault(img_url, {}).update(fields)
+
+    # --------------------------------------------------------------------------
+    # VALIDATORS OF A .part FILE
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def save_validators(part_path: str, etag, last_modified) -> None:
+        """
+        Written to disk BEFORE the body streams: unlike the manifest (saved
+        at the end of the run), this survives a hard kill mid-body.
+        """
+        with open(f"{part_path}{VALIDATORS_SUFFIX}.tmp", 'w') as f:
+            json.dump({'etag': etag, 'last_modified': last_modified}, f)
+        os.replace(f"{part_path}{VALIDATORS_SUFFIX}.tmp", f"{part_path}{VALIDATORS_SUFFIX}")
+
+    @staticmethod
+    def load_validators(part_path: str) -> dict:
+        try:
+            with open(f"{part_path}{VALIDATORS_SUFFIX}") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def remove_part(part_path: str) -> None:
+        for leftover in (part_path, f"{part_path}{VALIDATORS_SUFFIX}"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    # --------------------------------------------------------------------------
+    # ONE DOWNLOAD
+    # --------------------------------------------------------------------------
+    def download_image(self, img_url: str, out_dir: str) -> int:
+        """
+        Downloads (or skips, or resumes) one image.
+
+        Returns:
+        --------
+        int : body bytes received over the network
+        """
+        name = pooled.image_name(img_url)
+        path = os.path.join(out_dir, name)
+        part_path = f"{path}.part"
+
+        with self._lock:
+            entry = dict(self.manifest.get(img_url, {}))
+
+        # ----------------------------------------------------------------------
+        # BUILD THE REQUEST
+        # ----------------------------------------------------------------------
+        headers = {}
+        offset = 0
+
+        if entry.get('complete') and os.path.exists(path) \
+                and os.path.getsize(path) == entry['size']:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        elif os.path.exists(part_path):
+            # The sidecar is the source of truth; the manifest entry only
+            # covers .part files from runs that exited cleanly
+            etag = self.load_validators(part_path).get('etag') or entry.get('etag')
+            if etag:
+                offset = os.path.getsize(part_path)
+                headers['Range'] = f'bytes={offset}-'
+                headers['If-Range'] = etag
+
+        # ----------------------------------------------------------------------
+        # SEND IT
+        # ----------------------------------------------------------------------
+        with self.session.get(img_url, headers=headers, stream=True, timeout=30) as response:
+            with self._lock:
+                self.statuses[response.status_code] += 1
+
+            if response.status_code == 304:
+                return 0
+
+            if response.status_code == 416:
+                # Our .part is not a prefix the server recognises: start over
+                self.remove_part(part_path)
+                return self.download_image(img_url, out_dir)
+
+            response.raise_for_status()
+
+            digest = hashlib.sha256()
+
+            if response.status_code == 206:
+                # Resuming: the hash must cover the bytes we already have
+                with open(part_path, 'rb') as part_file:
+                    for block in iter(lambda: part_file.read(self.chunk_size), b''):
+                        digest.update(block)
+                mode = 'ab'
+            else:
+                # 200: a full body, even if we asked for a range
+                # (If-Range did not match → our partial copy is stale)
+                mode = 'wb'
+
+            # Validators go to disk next to the .part BEFORE the body
+            # arrives: the in-memory manifest alone would be lost if the
+            # process were killed mid-body
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            self.save_validators(part_path, etag, last_modified)
+
+            self.update_entry(img_url, path=name, etag=etag,
+                              last_modified=last_modified, complete=False)
+
+            received = 0
+            with open(part_path, mode) as part_file:
+                for chunk in response.iter_content(self.chunk_size):
+                    part_file.write(chunk)
+                    digest.update(chunk)
+                    received += len(chunk)
+
+        # ----------------------------------------------------------------------
+        # COMPLETE: RENAME, DE-DUPLICATE, RECORD
+        # ----------------------------------------------------------------------
+        self.forget_path(path)
+        if os.path.exists(path):
+            os.remove(path)
+        os.replace(part_path, path)
+        self.remove_part(part_path)
+
+        sha256 = digest.hexdigest()
+        self.deduplicate(sha256, path)
+
+        self.update_entry(img_url, size=os.path.getsize(path),
+                          sha256=sha256, complete=True)
+        return received
+
+    def forget_path(self, path: str) -> None:
+        """
+        `path` is about to be overwritten: whatever hash pointed at it no
+        longer describes its bytes, so later duplicates must not link to it.
+        """
+        with self._lock:
+            for sha256 in [s for s, p in self.by_hash.items() if p == path]:
+                del self.by_hash[sha256]
+
+    def deduplicate(self, sha256: str, path: str) -> None:
+        """
+        If another file already holds the same bytes, replace this copy
+        with a HARD LINK to it: two names, one copy on disk.
+        """
+        with self._lock:
+            existing = self.by_hash.get(sha256)
+
+            if existing is None or existing == path or not os.path.exists(existing):
+                self.by_hash[sha256] = path
+                return
+
+        try:
+            os.remove(path)
+            os.link(existing, path)
+        except OSError:
+            # Filesystem without hard links: keep a normal copy
+            shutil.copyfile(existing, path)
+
+    # --------------------------------------------------------------------------
+    # MANY DOWNLOADS
+    # --------------------------------------------------------------------------
+    def download_all(self, img_urls: list, out_dir: str) -> int:
+        """
+        Loads the manifest, downloads, and ALWAYS saves the manifest —
+        even if a download fails — so partial progress is kept.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        self.load_manifest(out_dir)
+        self.statuses.clear()
+
+        try:
+            return super().download_all(img_urls, out_dir)
+        finally:
+            self.save_manifest(out_dir)
+
+
+# ------------------------------------------------------------------------------
+# HELPERS FOR THE DEMO
+# ------------------------------------------------------------------------------
+def disk_usage(out_dir: str) -> int:
+    """
+    Bytes used by images, counting each hard-linked inode ONCE.
+    """
+    seen = {}
+    for filename in os.listdir(out_dir):
+        if filename.endswith('.jpg'):
+            st = os.stat(os.path.join(out_dir, filename))
+            seen[(st.st_dev, st.st_ino)] = st.st_size
+    return sum(seen.values())
+
+
+def simulate_crash(out_dir: str, img_urls: list) -> None:
+    """
+    Turns complete downloads back into half-finished .part files,
+    as if the previous run had been killed mid-transfer: only the
+    .part.json sidecars know the ETags, the manifest was never saved.
+    """
+    with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+
+    for img_url in img_urls:
+        path = os.path.join(out_dir, manifest[img_url]['path'])
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        # Unlink first: the file may be a hard link shared with other names
+        os.remove(path)
+        with open(f"{path}.part", 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+        entry = manifest.pop(img_url)
+        ResumableDownloader.save_validators(f"{path}.part", entry['etag'],
+                                            entry['last_modified'])
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f)
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK: FIRST RUN → SECOND RUN → RESUME AFTER CRASH
+# ------------------------------------------------------------------------------
+def main():
+    """
+    24 URLs, but the server only has 8 distinct images, so most URLs
+    return content that was already downloaded under another name.
+    """
+    with LocalImageServer(latency=0.01, handshake_delay=0.03) as server, \
+            tempfile.TemporaryDirectory() as out_dir:
+
+        img_urls = server.urls(24)
+        downloader = ResumableDownloader()
+
+        def run(label: str) -> None:
+            server.reset_stats()
+            downloader.download_all(img_urls, out_dir)
+
+            statuses = ', '.join(f"{code}×{n}" for code, n in sorted(downloader.statuses.items()))
+            print(f"{label:<16} {server.bytes_sent / 1024 / 1024:>8.2f} MB sent  "
+                  f"{disk_usage(out_dir) / 1024 / 1024:>7.2f} MB on disk   [{statuses}]")
+
+        run('first run')
+        run('second run')
+
+        simulate_crash(out_dir, img_urls[:6])
+        run('resume 6 halves')
+
+        downloader.close()
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (24 URLS, 8 DISTINCT IMAGES, LOOPBACK)
+# ==============================================================================
+
+"""
+first run           63.64 MB sent    20.71 MB on disk   [200×24]
+second run           0.00 MB sent    20.71 MB on disk   [304×24]
+resume 6 halves      5.66 MB sent    20.71 MB on disk   [206×6, 304×18]
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. SECOND RUN ≈ 0 BYTES
+   - Every URL is re-checked (one small request each)
+   - The server answers 304 with headers only — no body
+
+2. RESUMING
+   - Only the missing half of each interrupted file is transferred
+   - If-Range protects against stitching together two different versions:
+     if the ETag changed, the server sends the full new body (200)
+
+3. .part FILES
+   - The final name only ever holds COMPLETE files
+   - A crash can never leave a truncated image under its real name
+   - The ETag that makes a .part resumable lives next to it (.part.json),
+     written before the body starts, so even a SIGKILL keeps it
+
+4. DE-DUPLICATION
+   - 24 URLs, 8 distinct images → only 8 copies on disk
+   - Duplicates are still downloaded once per URL: the client cannot know
+     the content before receiving it (unless the server publishes a digest)
+
+5. LIMITATIONS
+   - The manifest is saved at the end of a run (and on errors);
+     a hard kill (SIGKILL, power loss) loses the in-run updates of
+     COMPLETED files (they are downloaded again), never a .part's validators
+   - Servers without ETag/Last-Modified/Range fall back to full downloads
+"""
@@ -0,0 +1,303 @@
+"""
+================================================================================
+SHARDED COUNTERS & STRIPED LOCKS — less contention than ONE global Lock
+================================================================================
+
+This example is a follow-up to `07_thread_safety_with_lock.py`.
+
+There, every single increment takes the same lock:
+
+    for _ in range(100_000):
+        with lock:
+            counter += 1
+
+Correct — but ALL threads queue on ONE lock, 100,000 times each.
+The more threads, the more time is spent waiting for (and handing over)
+that lock instead of counting.
+
+Two classic ways to contend less:
+
+✔ SHARDED COUNTER
+  Each thread counts in its OWN cell (no lock at all);
+  reading the value sums the cells.
+      writes: O(1), contention-free      reads: O(threads)
+
+✔ STRIPED LOCKS (for keyed counters: page views per URL, hits per user...)
+  N independent (lock, dict) pairs; a key always maps to the same stripe.
+  Threads only contend when their keys land in the same stripe.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Why one hot lock limits scalability
+2. Thread-local state: threading.local()
+3. Trading read cost for write speed (aggregate on read)
+4. Lock striping: hash(key) % N
+5. GIL vs free-threaded (no-GIL) CPython: what changes, what does not
+
+================================================================================
+USAGE
+================================================================================
+
+python 11_sharded_counters_and_striped_locks.py
+python3.13t 11_sharded_counters_and_striped_locks.py     # free-threaded build
+
+================================================================================
+"""
+
+import sys
+import time
+import threading
+
+
+INCREMENTS_PER_THREAD = 100_000
+THREAD_COUNTS = (2, 4, 8, 16, 32)
+
+
+# ------------------------------------------------------------------------------
+# SHARDED COUNTER
+# ------------------------------------------------------------------------------
+class ShardedCounter:
+    """
+    One cell per thread; value() adds them up.
+
+    WHY NO LOCK IN increment()?
+    ---------------------------
+    A cell is only ever WRITTEN by the thread that owns it, so there is
+    no read-modify-write race between threads. value() may run while
+    other threads are counting — it returns a consistent-enough snapshot
+    (every completed increment is included), like any metrics counter.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells = []
+        self._register_lock = threading.Lock()   # taken ONCE per thread
+
+    def _cell(self) -> list:
+        cell = [0]
+        with self._register_lock:
+            self._cells.append(cell)
+        self._local.cell = cell
+        return cell
+
+    def increment(self, n: int = 1) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cell()
+        cell[0] += n
+
+    def value(self) -> int:
+        with self._register_lock:
+            return sum(cell[0] for cell in self._cells)
+
+
+# ------------------------------------------------------------------------------
+# STRIPED-LOCK DICT (KEYED COUNTERS)
+# ------------------------------------------------------------------------------
+class StripedCounterDict:
+    """
+    A dict of counters split into `stripes` independently locked parts.
+
+    Two threads contend ONLY if their keys hash to the same stripe
+    (probability ≈ 1 / stripes for random keys).
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._dicts = [{} for _ in range(stripes)]
+
+    def increment(self, key, n: int = 1) -> None:
+        i = hash(key) % len(self._locks)
+        with self._locks[i]:
+            shard = self._dicts[i]
+            shard[key] = shard.get(key, 0) + n
+
+    def get(self, key) -> int:
+        i = hash(key) % len(self._locks)
+        with self._locks[i]:
+            return self._dicts[i].get(key, 0)
+
+    def snapshot(self) -> dict:
+        """
+        Copies the stripes ONE AT A TIME — writers to other stripes keep
+        going. (Not an atomic snapshot across stripes.)
+        """
+        result = {}
+        for lock, shard in zip(self._locks, self._dicts):
+            with lock:
+                result.update(shard)
+        return result
+
+
+class LockedCounterDict:
+    """
+    The baseline: one dict, one lock (07_thread_safety_with_lock.py style).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dict = {}
+
+    def increment(self, key, n: int = 1) -> None:
+        with self._lock:
+            self._dict[key] = self._dict.get(key, 0) + n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._dict)
+
+
+# ------------------------------------------------------------------------------
+# WORKLOADS
+# ------------------------------------------------------------------------------
+def run_threads(n_threads: int, target) -> float:
+    threads = [threading.Thread(target=target, args=(t,)) for t in range(n_threads)]
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def bench_single_counter(n_threads: int) -> dict:
+    results = {}
+
+    # 1. 07_thread_safety_with_lock.py
+    counter = 0
+    lock = threading.Lock()
+
+    def with_global_lock(_: int) -> None:
+        nonlocal counter
+        for _ in range(INCREMENTS_PER_THREAD):
+            with lock:
+                counter += 1
+
+    elapsed = run_threads(n_threads, with_global_lock)
+    results['global Lock'] = (elapsed, counter)
+
+    # 2. Sharded
+    sharded = ShardedCounter()
+
+    def with_shards(_: int) -> None:
+        increment = sharded.increment
+        for _ in range(INCREMENTS_PER_THREAD):
+            increment()
+
+    elapsed = run_threads(n_threads, with_shards)
+    results['ShardedCounter'] = (elapsed, sharded.value())
+
+    return results
+
+
+def bench_keyed_counters(n_threads: int, n_keys: int = 1000) -> dict:
+    results = {}
+    keys = [f"/page/{i}" for i in range(n_keys)]
+
+    for name, counters in (('one Lock + dict', LockedCounterDict()),
+                           ('StripedCounterDict(64)', StripedCounterDict(64))):
+
+        def worker(t: int) -> None:
+            increment = counters.increment
+            for i in range(INCREMENTS_PER_THREAD):
+                increment(keys[(i * 7 + t * 13) % n_keys])
+
+        elapsed = run_threads(n_threads, worker)
+        results[name] = (elapsed, sum(counters.snapshot().values()))
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------------------------
+def gil_enabled() -> bool:
+    # sys._is_gil_enabled() exists from Python 3.13; older versions always have a GIL
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+def main():
+    print(f"Python {sys.version.split()[0]}, GIL "
+          f"{'ENABLED' if gil_enabled() else 'DISABLED (free-threaded)'}")
+    print(f"{INCREMENTS_PER_THREAD:,} increments per thread\n")
+
+    for title, bench in (('SINGLE COUNTER', bench_single_counter),
+                         ('KEYED COUNTERS (1,000 keys)', bench_keyed_counters)):
+        print(title)
+
+        for n_threads in THREAD_COUNTS:
+            results = bench(n_threads)
+            if n_threads == THREAD_COUNTS[0]:
+                print(f"{'threads':>7}  " + '  '.join(f"{name:>24}" for name in results))
+
+            for elapsed, total in results.values():
+                assert total == n_threads * INCREMENTS_PER_THREAD
+            print(f"{n_threads:>7}  " + '  '.join(
+                f"{elapsed:>14.2f}s {n_threads * INCREMENTS_PER_THREAD / elapsed / 1e6:>5.1f}M/s"
+                for elapsed, _ in results.values()))
+        print()
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (PYTHON 3.11, GIL, 1 CPU CORE)
+# ==============================================================================
+
+"""
+Python 3.11.7, GIL ENABLED
+100,000 increments per thread
+
+SINGLE COUNTER
+threads               global Lock            ShardedCounter
+      2            0.05s   3.7M/s            0.02s   8.3M/s
+      4            0.13s   3.1M/s            0.05s   8.1M/s
+      8            0.22s   3.7M/s            0.10s   8.2M/s
+     16            0.45s   3.6M/s            0.21s   7.7M/s
+     32            1.01s   3.2M/s            0.67s   4.8M/s
+
+KEYED COUNTERS (1,000 keys)
+threads           one Lock + dict    StripedCounterDict(64)
+      2            0.16s   1.2M/s            0.16s   1.2M/s
+      4            0.23s   1.8M/s            0.24s   1.6M/s
+      8            0.60s   1.3M/s            0.71s   1.1M/s
+     16            1.70s   0.9M/s            1.48s   1.1M/s
+     32            4.06s   0.8M/s            3.71s   0.9M/s
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WITH THE GIL, ONLY ONE THREAD RUNS ANYWAY
+   - Threads rarely find the lock taken: the GIL switches threads
+     every 5 ms, and a lock is held for ~100 ns
+   - So the global Lock costs its acquire/release, not real waiting;
+     ShardedCounter is ~2× faster simply because it skips them
+   - Striping cannot win here: there is no parallelism to unlock
+
+2. FREE-THREADED CPYTHON (3.13t+, NO GIL) ON SEVERAL CORES
+   - Threads REALLY run at the same time: a single hot lock (and even
+     a single hot int object) bounces between cores on every update
+   - That is where per-thread shards and striped locks scale with
+     cores and the single lock collapses — run this file with
+     python3.13t on a multi-core machine to see it
+
+3. THE TRADE-OFFS
+   - ShardedCounter  : fastest writes; value() costs O(threads);
+                       memory per thread that ever touched it
+   - Striped dict    : snapshot() is per-stripe, not one atomic view
+   - Neither helps if the real work per update is large — then the
+     lock was never the bottleneck
+
+4. CORRECTNESS IS UNCHANGED
+   - Every run asserts the exact total: no lost updates
+"""
@@ -0,0 +1,269 @@
+"""
+================================================================================
+LOCAL IMAGE SERVER — AN OFFLINE STAND-IN FOR images.unsplash.com
+================================================================================
+
+The downloader examples talk to a real CDN. That makes benchmarks:
+✘ Slow and noisy (internet latency varies run to run)
+✘ Impossible offline
+✘ Unfair to the CDN when you fire 10,000 requests at it
+
+This module serves the bundled images/ folder over plain HTTP/1.1 on
+127.0.0.1, with knobs that mimic the costs that matter:
+
+✔ handshake_delay : paid ONCE per new TCP connection (think TCP + TLS)
+✔ latency         : paid on EVERY request (think server / network time)
+✔ max_bytes       : truncate bodies to keep huge URL counts cheap
+✔ ETag / Last-Modified with 304 Not Modified for conditional requests
+✔ Range requests (206 Partial Content) for resuming downloads
+
+It also COUNTS connections, requests and bytes, so a benchmark can show
+how many connections a client really opened.
+
+This file is a helper, not a lesson — it is imported by the numbered
+downloader examples in this folder.
+
+================================================================================
+USAGE
+================================================================================
+
+from local_image_server import LocalImageServer
+
+with LocalImageServer(latency=0.05, handshake_delay=0.03) as server:
+    urls = server.urls(100)
+    ...
+    print(server.connections, server.requests)
+
+python local_image_server.py        # serve until Ctrl+C
+
+================================================================================
+"""
+
+import os
+import time
+import zlib
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# ------------------------------------------------------------------------------
+# DEFAULT CONTENT: THE IMAGES BUNDLED WITH THIS FOLDER
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+img_dir = os.path.join(script_dir, 'images')
+
+
+# ------------------------------------------------------------------------------
+# REQUEST HANDLER (ONE INSTANCE PER CONNECTION, ONE THREAD PER CONNECTION)
+# ------------------------------------------------------------------------------
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET /<image name> from memory.
+
+    protocol_version = 'HTTP/1.1' enables KEEP-ALIVE: one connection can
+    carry many requests, which is exactly what connection pooling exploits.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.record(connections=1)
+
+        # Simulated TCP + TLS handshake cost, paid once per connection
+        time.sleep(self.server.handshake_delay)
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.latency)
+
+        body, etag = self.server.resolve(self.path)
+
+        # ----------------------------------------------------------------------
+        # CONDITIONAL REQUEST: client already has this version → 304
+        # ----------------------------------------------------------------------
+        if_none_match = self.headers.get('If-None-Match')
+        if_modified_since = self.headers.get('If-Modified-Since')
+
+        if if_none_match is not None:
+            not_modified = etag in (tag.strip() for tag in if_none_match.split(','))
+        elif if_modified_since is not None:
+            not_modified = if_modified_since == self.server.last_modified
+        else:
+            not_modified = False
+
+        if not_modified:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', self.server.last_modified)
+            self.end_headers()
+            self.server.record(requests=1)
+            return
+
+        # ----------------------------------------------------------------------
+        # RANGE REQUEST: client resumes a partial download → 206
+        # ----------------------------------------------------------------------
+        # Only honoured if If-Range (when sent) still matches the current ETag,
+        # otherwise the client's partial copy is stale and gets the full body.
+        # ----------------------------------------------------------------------
+        status, start = 200, 0
+        range_header = self.headers.get('Range', '')
+        if_range = self.headers.get('If-Range')
+
+        if range_header.startswith('bytes=') and if_range in (None, etag):
+            first = range_header[len('bytes='):].split('-')[0]
+            start = int(first) if first.isdigit() else 0
+
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(body)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                self.server.record(requests=1)
+                return
+
+            status = 206
+
+        payload = memoryview(body)[start:]
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.server.last_modified)
+        self.send_header('Accept-Ranges', 'bytes')
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+        self.end_headers()
+        self.wfile.write(payload)
+
+        self.server.record(requests=1, bytes_sent=len(payload))
+
+    def log_message(self, format: str, *args) -> None:
+        # Silence the default one-line-per-request logging
+        pass
+
+
+# ------------------------------------------------------------------------------
+# SERVER
+# ------------------------------------------------------------------------------
+class LocalImageServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP server that runs in a background thread.
+
+    Arguments:
+    ----------
+    image_dir       : str   : folder with .jpg files to serve
+    latency         : float : seconds of delay per request
+    handshake_delay : float : seconds of delay per new connection
+    max_bytes       : int   : truncate every body to this size (None = full)
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, image_dir: str = img_dir, latency: float = 0.0,
+                 handshake_delay: float = 0.0, max_bytes: int | None = None):
+        super().__init__(('127.0.0.1', 0), ImageRequestHandler)
+
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+        self.images = {}
+        for filename in sorted(os.listdir(image_dir)):
+            if filename.endswith('.jpg'):
+                with open(os.path.join(image_dir, filename), 'rb') as f:
+                    self.images[os.path.splitext(filename)[0]] = f.read()[:max_bytes]
+        self.names = list(self.images)
+
+        # ETag = checksum + length of the body, computed once up front
+        self.etags = {
+            name: f'"{zlib.crc32(body):08x}-{len(body)}"'
+            for name, body in self.images.items()
+        }
+
+        self.connections = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self._stats_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    # --------------------------------------------------------------------------
+    # CONTENT
+    # --------------------------------------------------------------------------
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self, n: int) -> list:
+        """
+        Returns n distinct URLs.
+
+        The first URLs map 1:1 to real image names. Beyond that, a numeric
+        suffix keeps every URL (and every downloaded filename) unique.
+        """
+        if n <= len(self.names):
+            return [f"{self.base_url}/{name}" for name in self.names[:n]]
+
+        return [
+            f"{self.base_url}/{self.names[i % len(self.names)]}-{i}"
+            for i in range(n)
+        ]
+
+    def resolve(self, path: str) -> tuple:
+        """
+        Exact names are served as-is; unknown names get a stable
+        pseudo-random image so any URL works.
+
+        Returns:
+        --------
+        (body, etag)
+        """
+        name = path.split('?')[0].strip('/')
+        if name not in self.images:
+            name = self.names[zlib.crc32(name.encode()) % len(self.names)]
+        return self.images[name], self.etags[name]
+
+    # --------------------------------------------------------------------------
+    # STATISTICS
+    # --------------------------------------------------------------------------
+    def record(self, connections: int = 0, requests: int = 0, bytes_sent: int = 0) -> None:
+        with self._stats_lock:
+            self.connections += connections
+            self.requests += requests
+            self.bytes_sent += bytes_sent
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.connections = self.requests = self.bytes_sent = 0
+
+    # --------------------------------------------------------------------------
+    # LIFECYCLE (CONTEXT MANAGER)
+    # --------------------------------------------------------------------------
+    def __enter__(self) -> 'LocalImageServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+# ------------------------------------------------------------------------------
+# STANDALONE MODE
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    with LocalImageServer() as server:
+        print(f"Serving {len(server.images)} images on {server.base_url}")
+        for url in server.urls(len(server.images)):
+            print(url)
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\n{server.connections} connections, {server.requests} requests")
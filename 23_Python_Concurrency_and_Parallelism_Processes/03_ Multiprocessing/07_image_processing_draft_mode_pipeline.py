@@ -0,0 +1,285 @@
+"""
+================================================================================
+FASTER IMAGE PIPELINE — DRAFT-MODE DECODING + RESIZE BEFORE BLUR
+================================================================================
+
+This example is a follow-up to `05_processpoolexecutor_image_processing.py`.
+
+The original pipeline does this for every image:
+✔ Decode the JPEG at FULL resolution   (e.g. 6000 × 4000 = 24 MP)
+✔ Apply GaussianBlur(15) on ALL pixels (the expensive part)
+✔ Shrink to a 1200 × 1200 thumbnail    (throws most of that work away)
+
+The output is at most 1200 × 1200 (≈ 1.4 MP), so the blur touches up to
+10–20x more pixels than ever reach the saved file.
+
+The reordered pipeline:
+✔ Asks the JPEG decoder for a REDUCED-SIZE draft (1/2, 1/4 or 1/8 scale)
+✔ Resizes to the thumbnail size FIRST
+✔ Blurs the SMALL image with a radius scaled to match
+
+Same parallelism, same pool, same output size — far less work per image.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Why the ORDER of operations matters as much as the number of cores
+2. How JPEG draft mode (Image.draft) skips decoding detail you will discard
+3. Why a blur radius must be scaled when the image is scaled
+4. How to measure wall time AND peak memory (RSS) of a worker process
+
+================================================================================
+DIRECTORY STRUCTURE EXPECTED
+================================================================================
+
+project/
+│
+├── images/          # Input images (.jpg)
+├── processed/       # Output images (auto-created)
+└── this_script.py
+
+================================================================================
+"""
+
+import time
+import os
+import resource
+import tempfile
+import multiprocessing
+import concurrent.futures
+from PIL import Image, ImageFilter
+
+
+# ------------------------------------------------------------------------------
+# RESOLVE SCRIPT & IMAGE DIRECTORIES
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+img_dir = os.path.join(script_dir, 'images')
+processed_dir = os.path.join(script_dir, 'processed')
+
+
+# ------------------------------------------------------------------------------
+# PIPELINE SETTINGS (SAME AS 05_processpoolexecutor_image_processing.py)
+# ------------------------------------------------------------------------------
+BLUR_RADIUS = 15
+THUMBNAIL_SIZE = (1200, 1200)
+
+
+# ------------------------------------------------------------------------------
+# COLLECT IMAGE FILES
+# ------------------------------------------------------------------------------
+try:
+    img_files = [f for f in os.listdir(img_dir) if f.endswith('.jpg')]
+    img_paths = [os.path.join(img_dir, f) for f in img_files]
+except FileNotFoundError:
+    print(f"ERROR: Could not find folder: {img_dir}")
+    print("Make sure your 'images' folder is in the same directory as this script.")
+    exit()
+
+
+# ------------------------------------------------------------------------------
+# ORIGINAL ORDER: DECODE FULL → BLUR FULL → THUMBNAIL
+# ------------------------------------------------------------------------------
+def process_image(img_path: str, out_dir: str = processed_dir) -> str:
+    """
+    The pipeline from 05_processpoolexecutor_image_processing.py,
+    kept here as the baseline for the benchmark.
+
+    Arguments:
+    ----------
+    img_path : str : absolute path to the image file
+    out_dir  : str : directory the result is written to
+
+    Returns:
+    --------
+    str : status message
+    """
+    filename = os.path.basename(img_path)
+
+    if not os.path.exists(img_path):
+        return f"{filename} -> Skipped (Not Found)"
+
+    try:
+        img = Image.open(img_path)
+        img = img.filter(ImageFilter.GaussianBlur(BLUR_RADIUS))
+        img.thumbnail(THUMBNAIL_SIZE)
+
+        os.makedirs(out_dir, exist_ok=True)
+        img.save(os.path.join(out_dir, filename))
+
+        return f"{filename} processed..."
+
+    except Exception as e:
+        return f"Failed {filename}: {e}"
+
+
+# ------------------------------------------------------------------------------
+# REORDERED: DRAFT DECODE → THUMBNAIL → BLUR (SCALED RADIUS)
+# ------------------------------------------------------------------------------
+def process_image_draft(img_path: str, out_dir: str = processed_dir) -> str:
+    """
+    Produces (visually) the same output as process_image(),
+    but does most of the work on the SMALL image.
+
+    Steps:
+    ------
+    1. Image.draft() tells the JPEG decoder to decode at 1/2, 1/4 or 1/8
+       scale — the smallest scale that is still >= THUMBNAIL_SIZE.
+       Pixels we would throw away are never decoded.
+    2. thumbnail() brings the image down to its final size.
+    3. GaussianBlur runs on the final-size image.
+
+    WHY SCALE THE RADIUS?
+    ---------------------
+    A 15 px blur on a 6000 px wide image, shrunk 5x, looks like a 3 px
+    blur in the output. Blurring AFTER the resize must therefore use
+    BLUR_RADIUS × (final width / original width) to look the same.
+
+    Arguments:
+    ----------
+    img_path : str : absolute path to the image file
+    out_dir  : str : directory the result is written to
+
+    Returns:
+    --------
+    str : status message
+    """
+    filename = os.path.basename(img_path)
+
+    if not os.path.exists(img_path):
+        return f"{filename} -> Skipped (Not Found)"
+
+    try:
+        img = Image.open(img_path)
+        original_width = img.width
+
+        # Reduced-size decode (no-op for non-JPEG formats)
+        img.draft('RGB', THUMBNAIL_SIZE)
+        img.thumbnail(THUMBNAIL_SIZE)
+
+        # Radius is relative to the ORIGINAL image, so scale it down
+        scale = img.width / original_width
+        img = img.filter(ImageFilter.GaussianBlur(BLUR_RADIUS * scale))
+
+        os.makedirs(out_dir, exist_ok=True)
+        img.save(os.path.join(out_dir, filename))
+
+        return f"{filename} processed..."
+
+    except Exception as e:
+        return f"Failed {filename}: {e}"
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK WORKER (RUNS IN ITS OWN FRESH PROCESS)
+# ------------------------------------------------------------------------------
+def run_benchmark(mode: str, queue: multiprocessing.Queue) -> None:
+    """
+    Processes every image with ONE pipeline and reports:
+    - wall time
+    - peak resident memory (RSS) of this process
+
+    Each mode runs in a brand-new process so the peak RSS of one
+    pipeline cannot leak into the measurement of the other.
+
+    NOTE:
+    -----
+    ru_maxrss is reported in KILOBYTES on Linux and BYTES on macOS.
+    """
+    pipeline = process_image if mode == 'original' else process_image_draft
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        begin = time.perf_counter()
+        for img_path in img_paths:
+            pipeline(img_path, out_dir)
+        elapsed = time.perf_counter() - begin
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((mode, elapsed, peak_rss))
+
+
+def benchmark() -> None:
+    """
+    Compares the original and the reordered pipeline on the
+    bundled images/ set, one image at a time, in isolated processes.
+    """
+    queue = multiprocessing.Queue()
+
+    print(f"\n{'mode':<10} {'wall time':>10} {'peak RSS':>12}")
+
+    for mode in ('original', 'draft'):
+        p = multiprocessing.Process(target=run_benchmark, args=(mode, queue))
+        p.start()
+        mode, elapsed, peak_rss = queue.get()
+        p.join()
+
+        print(f"{mode:<10} {elapsed:>9.2f}s {peak_rss / 1024:>9.1f} MB")
+
+
+# ------------------------------------------------------------------------------
+# MAIN FUNCTION (PARENT PROCESS)
+# ------------------------------------------------------------------------------
+def main():
+    """
+    1. Processes all images with the reordered pipeline in a process pool
+    2. Benchmarks both pipelines against each other
+    """
+    start = time.perf_counter()
+
+    print(f"Found {len(img_paths)} images to process...")
+
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        results = executor.map(process_image_draft, img_paths)
+
+        for result in results:
+            print(result)
+
+    finished = time.perf_counter()
+    print(f"Finished in: {round(finished - start, 2)} seconds")
+
+    benchmark()
+
+
+# ------------------------------------------------------------------------------
+# REQUIRED ENTRY POINT FOR MULTIPROCESSING
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (BENCHMARK, 8 BUNDLED IMAGES, LINUX)
+# ==============================================================================
+
+"""
+mode        wall time     peak RSS
+original        6.43s     290.6 MB
+draft           1.81s     107.6 MB
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WHY IS THE DRAFT PIPELINE FASTER?
+   - JPEG stores 8×8 blocks; decoding at 1/8 scale skips most of the IDCT work
+   - The blur touches ~1.4 MP instead of up to ~24 MP
+   - The cost of a Gaussian blur grows with pixel count
+
+2. WHY DOES PEAK MEMORY DROP?
+   - A 6000 × 4000 RGB image needs ~72 MB just for pixels
+   - The blur allocates another full-size buffer for its result
+   - Draft decoding never materialises the full-size image
+
+3. IS THE OUTPUT IDENTICAL?
+   - Not bit-for-bit: resampling and blurring do not commute exactly
+   - Visually equivalent because the radius is scaled to the output size
+
+4. WHEN DOES THIS NOT HELP?
+   - Images already smaller than THUMBNAIL_SIZE (nothing to skip)
+   - Non-JPEG inputs (draft() is a no-op, but the reorder still helps)
+"""
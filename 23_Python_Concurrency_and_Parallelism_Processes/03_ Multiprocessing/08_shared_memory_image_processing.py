@@ -0,0 +1,337 @@
+"""
+================================================================================
+SHARED-MEMORY IMAGE TRANSPORT — multiprocessing.shared_memory
+================================================================================
+
+This example is a follow-up to `05_processpoolexecutor_image_processing.py`.
+
+There, `executor.map(process_image, img_paths)` sends only FILE PATHS:
+✔ Cheap to send
+✘ Every worker re-reads and re-decodes the JPEG from disk
+
+The obvious "fix" — decode once in the parent and send the Image — is worse:
+✘ The whole pixel buffer is PICKLED
+✘ Pushed through a pipe
+✘ Unpickled (copied again) in the worker
+
+Shared memory removes both costs:
+✔ The parent decodes each image ONCE
+✔ Pixels are copied into a named shared-memory segment
+✔ Workers receive a tiny handle: (name, size, mode)
+✔ Workers attach to the segment and read the pixels IN PLACE
+
+This pays off when one decoded image feeds SEVERAL filters.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. What actually travels between processes in a ProcessPoolExecutor
+2. Why pickling large buffers is expensive
+3. How SharedMemory segments are created, attached, closed and unlinked
+4. How to wrap shared memory as a PIL Image without copying
+5. How to compare memory and throughput of three transport strategies
+
+================================================================================
+"""
+
+import time
+import os
+import resource
+import tempfile
+import multiprocessing
+import concurrent.futures
+from multiprocessing import shared_memory
+from PIL import Image, ImageFilter
+
+
+# ------------------------------------------------------------------------------
+# RESOLVE SCRIPT & IMAGE DIRECTORIES
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+img_dir = os.path.join(script_dir, 'images')
+
+
+# ------------------------------------------------------------------------------
+# FILTERS APPLIED TO EVERY IMAGE
+# ------------------------------------------------------------------------------
+# Filters are looked up BY NAME inside the worker, so only a short string
+# has to cross the process boundary.
+# ------------------------------------------------------------------------------
+THUMBNAIL_SIZE = (1200, 1200)
+
+FILTERS = {
+    'blur': ImageFilter.GaussianBlur(15),
+    'sharpen': ImageFilter.SHARPEN,
+    'edges': ImageFilter.FIND_EDGES,
+}
+
+
+# ------------------------------------------------------------------------------
+# COLLECT IMAGE FILES
+# ------------------------------------------------------------------------------
+try:
+    img_files = [f for f in os.listdir(img_dir) if f.endswith('.jpg')]
+    img_paths = [os.path.join(img_dir, f) for f in img_files]
+except FileNotFoundError:
+    print(f"ERROR: Could not find folder: {img_dir}")
+    print("Make sure your 'images' folder is in the same directory as this script.")
+    exit()
+
+
+# ------------------------------------------------------------------------------
+# SHARED FILTER STEP
+# ------------------------------------------------------------------------------
+def apply_filter(img: Image.Image, filter_name: str, filename: str, out_dir: str) -> str:
+    """
+    Filters, thumbnails and saves one rendition of an image.
+
+    Output file name:
+    -----------------
+    <original name>_<filter name>.jpg
+    """
+    img = img.filter(FILTERS[filter_name])
+    img.thumbnail(THUMBNAIL_SIZE)
+
+    stem, ext = os.path.splitext(filename)
+    img.save(os.path.join(out_dir, f"{stem}_{filter_name}{ext}"))
+
+    return f"{filename} [{filter_name}] processed..."
+
+
+# ------------------------------------------------------------------------------
+# TRANSPORT 1: FILE PATH (WHAT 05_... DOES)
+# ------------------------------------------------------------------------------
+def process_from_path(img_path: str, filter_name: str, out_dir: str) -> str:
+    """
+    Worker re-opens and re-decodes the JPEG for EVERY filter.
+    """
+    img = Image.open(img_path)
+    return apply_filter(img, filter_name, os.path.basename(img_path), out_dir)
+
+
+# ------------------------------------------------------------------------------
+# TRANSPORT 2: PICKLED PIXELS
+# ------------------------------------------------------------------------------
+def process_from_bytes(pixels: bytes, size: tuple, mode: str,
+                       filename: str, filter_name: str, out_dir: str) -> str:
+    """
+    Worker receives the decoded pixels as a pickled bytes object.
+
+    The parent decoded only once, but every task still copies
+    the WHOLE buffer through a pipe.
+    """
+    img = Image.frombytes(mode, size, pixels)
+    return apply_filter(img, filter_name, filename, out_dir)
+
+
+# ------------------------------------------------------------------------------
+# TRANSPORT 3: SHARED MEMORY HANDLE
+# ------------------------------------------------------------------------------
+def share_image(img_path: str) -> tuple:
+    """
+    Decodes an image ONCE (in the parent) and copies its pixels into
+    a new shared-memory segment.
+
+    Returns:
+    --------
+    (SharedMemory, handle) where handle = (name, size, mode)
+
+    IMPORTANT:
+    ----------
+    The CREATOR owns the segment and must close() AND unlink() it.
+    """
+    with Image.open(img_path) as img:
+        # RGBX, not RGB: frombuffer() can only map 4-byte-per-pixel modes
+        # in place; an RGB buffer is unpacked into a private copy.
+        img = img.convert('RGBX')
+        pixels = img.tobytes()
+
+    shm = shared_memory.SharedMemory(create=True, size=len(pixels))
+    shm.buf[:len(pixels)] = pixels
+
+    return shm, (shm.name, img.size, img.mode)
+
+
+def process_shared_image(handle: tuple, filename: str,
+                         filter_name: str, out_dir: str) -> str:
+    """
+    Worker attaches to an existing segment by NAME.
+
+    Image.frombuffer() wraps the shared bytes WITHOUT copying them —
+    but only for modes Pillow can map directly (RGBX, RGBA, L, ...),
+    which is why share_image() stores RGBX. The filter writes its result into a new (private) image.
+
+    IMPORTANT:
+    ----------
+    - Workers only close() — they never unlink()
+    - Every view into shm.buf must be released before close()
+    """
+    name, size, mode = handle
+    shm = shared_memory.SharedMemory(name=name)
+
+    try:
+        img = Image.frombuffer(mode, size, shm.buf, 'raw', mode, 0, 1)
+        result = apply_filter(img, filter_name, filename, out_dir)
+        del img
+        return result
+    finally:
+        shm.close()
+
+
+# ------------------------------------------------------------------------------
+# RUNNERS (ONE PER TRANSPORT)
+# ------------------------------------------------------------------------------
+def run_paths(executor, out_dir: str) -> list:
+    futures = [
+        executor.submit(process_from_path, img_path, filter_name, out_dir)
+        for img_path in img_paths
+        for filter_name in FILTERS
+    ]
+    return [f.result() for f in futures]
+
+
+def run_pickled(executor, out_dir: str) -> list:
+    results = []
+
+    for img_path in img_paths:
+        with Image.open(img_path) as img:
+            img = img.convert('RGB')
+            pixels = img.tobytes()
+
+        futures = [
+            executor.submit(process_from_bytes, pixels, img.size, img.mode,
+                            os.path.basename(img_path), filter_name, out_dir)
+            for filter_name in FILTERS
+        ]
+        results.extend(f.result() for f in futures)
+
+    return results
+
+
+def run_shared(executor, out_dir: str) -> list:
+    results = []
+
+    for img_path in img_paths:
+        shm, handle = share_image(img_path)
+
+        try:
+            futures = [
+                executor.submit(process_shared_image, handle,
+                                os.path.basename(img_path), filter_name, out_dir)
+                for filter_name in FILTERS
+            ]
+            results.extend(f.result() for f in futures)
+        finally:
+            # Owner cleans up only after ALL workers are done with it
+            shm.close()
+            shm.unlink()
+
+    return results
+
+
+RUNNERS = {
+    'paths': run_paths,
+    'pickled': run_pickled,
+    'shared': run_shared,
+}
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK (EACH TRANSPORT IN ITS OWN FRESH PROCESS)
+# ------------------------------------------------------------------------------
+def run_benchmark(transport: str, queue: multiprocessing.Queue) -> None:
+    """
+    Runs one transport with its own pool and reports:
+    - wall time
+    - images × filters per second
+    - peak RSS of the parent and of the largest worker
+
+    NOTE:
+    -----
+    ru_maxrss is reported in KILOBYTES on Linux and BYTES on macOS.
+    Shared pages a worker touched ARE counted in its RSS, but they are
+    not private copies — the OS keeps one physical copy.
+    """
+    with tempfile.TemporaryDirectory() as out_dir:
+        begin = time.perf_counter()
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            results = RUNNERS[transport](executor, out_dir)
+        elapsed = time.perf_counter() - begin
+
+    parent_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    queue.put((transport, len(results), elapsed, parent_rss, worker_rss))
+
+
+def main():
+    """
+    Compares the three transports on the bundled images/ set.
+    """
+    print(f"Found {len(img_paths)} images × {len(FILTERS)} filters...")
+
+    queue = multiprocessing.Queue()
+
+    print(f"\n{'transport':<10} {'wall time':>10} {'tasks/s':>8} "
+          f"{'parent RSS':>11} {'worker RSS':>11}")
+
+    for transport in RUNNERS:
+        p = multiprocessing.Process(target=run_benchmark, args=(transport, queue))
+        p.start()
+        transport, tasks, elapsed, parent_rss, worker_rss = queue.get()
+        p.join()
+
+        print(f"{transport:<10} {elapsed:>9.2f}s {tasks / elapsed:>8.2f} "
+              f"{parent_rss / 1024:>8.1f} MB {worker_rss / 1024:>8.1f} MB")
+
+
+# ------------------------------------------------------------------------------
+# REQUIRED ENTRY POINT FOR MULTIPROCESSING
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (8 BUNDLED IMAGES, 1 CPU CORE, LINUX)
+# ==============================================================================
+
+"""
+Found 8 images × 3 filters...
+
+transport   wall time  tasks/s  parent RSS  worker RSS
+paths          29.93s     0.80     15.8 MB    291.9 MB
+pickled        29.76s     0.81    474.7 MB    479.6 MB
+shared         25.37s     0.95    383.9 MB    291.3 MB
+
+With a single core the full-size GaussianBlur dominates every row;
+the gap between the transports grows with cheaper filters and more cores.
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. PATHS
+   - Cheapest message, most CPU: one full JPEG decode PER FILTER
+
+2. PICKLED PIXELS
+   - One decode per image, but ~72 MB pickled + piped + copied per task
+   - Parent memory spikes while the pickle is being built
+
+3. SHARED MEMORY
+   - One decode per image, a ~50 byte message per task
+   - Workers read the same physical pages — no per-task copy
+   - Only because the pixels are stored as RGBX: frombuffer() on an RGB
+     buffer silently unpacks a private copy (RGB is not a mappable mode),
+     so the segment trades 33% more bytes for zero copies in the workers
+
+4. LIFECYCLE RULES
+   - create=True        → owner (parent)
+   - close()            → every process, when done with it
+   - unlink()           → owner only, after all workers finished
+   - Forgetting unlink() leaks the segment until reboot (/dev/shm)
+"""
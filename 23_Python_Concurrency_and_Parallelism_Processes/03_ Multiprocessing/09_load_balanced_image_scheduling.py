@@ -0,0 +1,333 @@
+"""
+================================================================================
+LOAD-BALANCED IMAGE SCHEDULING — sorting, chunking & as_completed()
+================================================================================
+
+This example is a follow-up to `05_processpoolexecutor_image_processing.py`.
+
+There, `executor.map(process_image, img_paths)` is used with:
+✘ The default chunksize of 1 → one IPC round trip PER FILE
+✘ Input order            → a huge image submitted last runs ALONE at the end
+✘ Ordered results        → output waits for the slowest earlier image
+
+For a MIXED batch (a few huge photos, many tiny thumbnails) this means:
+- Tiny files are dominated by IPC overhead
+- The batch ends with one busy core and several idle ones (the "tail")
+
+The scheduler in this file:
+✔ Sorts work by file size, LARGEST FIRST (longest-processing-time rule)
+✔ Builds chunks adaptively ("guided" scheduling):
+    - big files travel alone
+    - small files are grouped, so IPC is paid once per chunk
+    - chunks shrink as the remaining work shrinks
+✔ Streams results with as_completed() as soon as each chunk finishes
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Why submission ORDER affects total runtime in a pool
+2. How chunking trades IPC overhead against load balance
+3. How to measure "cores busy %" and the idle tail of a batch
+4. Why as_completed() gives earlier output than map()
+
+================================================================================
+"""
+
+import time
+import os
+import tempfile
+import concurrent.futures
+from PIL import Image, ImageFilter
+
+
+# ------------------------------------------------------------------------------
+# RESOLVE SCRIPT & IMAGE DIRECTORIES
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+img_dir = os.path.join(script_dir, 'images')
+
+
+# ------------------------------------------------------------------------------
+# SETTINGS
+# ------------------------------------------------------------------------------
+BLUR_RADIUS = 15
+THUMBNAIL_SIZE = (1200, 1200)
+
+WORKERS = os.cpu_count() or 1
+
+# How many tiny copies of each bundled image to add to the mixed batch
+SMALL_COPIES_PER_IMAGE = 6
+SMALL_SIZE = (320, 320)
+
+
+# ------------------------------------------------------------------------------
+# COLLECT IMAGE FILES
+# ------------------------------------------------------------------------------
+try:
+    img_files = [f for f in os.listdir(img_dir) if f.endswith('.jpg')]
+    img_paths = [os.path.join(img_dir, f) for f in img_files]
+except FileNotFoundError:
+    print(f"ERROR: Could not find folder: {img_dir}")
+    print("Make sure your 'images' folder is in the same directory as this script.")
+    exit()
+
+
+# ------------------------------------------------------------------------------
+# WORKER: PROCESS A CHUNK OF IMAGES
+# ------------------------------------------------------------------------------
+def process_chunk(chunk: list, out_dir: str) -> list:
+    """
+    Processes several images in ONE task (one IPC round trip).
+
+    Each image goes through the pipeline from 05_...:
+    blur → thumbnail → save
+
+    Returns:
+    --------
+    list of (message, worker pid, start time, end time)
+
+    time.time() is used (not perf_counter) so timestamps from
+    different processes can be compared in the parent.
+    """
+    results = []
+
+    for img_path in chunk:
+        filename = os.path.basename(img_path)
+        began = time.time()
+
+        try:
+            img = Image.open(img_path)
+            img = img.filter(ImageFilter.GaussianBlur(BLUR_RADIUS))
+            img.thumbnail(THUMBNAIL_SIZE)
+            img.save(os.path.join(out_dir, filename))
+            message = f"{filename} processed..."
+        except Exception as e:
+            message = f"Failed {filename}: {e}"
+
+        results.append((message, os.getpid(), began, time.time()))
+
+    return results
+
+
+# ------------------------------------------------------------------------------
+# SCHEDULER: LARGEST FIRST + GUIDED CHUNK SIZES
+# ------------------------------------------------------------------------------
+def make_chunks(paths: list, workers: int) -> list:
+    """
+    Splits `paths` into chunks, largest files first.
+
+    File size is used as a cheap, stat()-only estimate of processing cost.
+
+    Guided chunking:
+    ----------------
+    The byte budget of each chunk is:
+
+        remaining bytes / (2 × workers)
+
+    - Early on the budget is large, but the files are large too,
+      so each big file ends up in a chunk of its own.
+    - Later the budget shrinks, but files are small, so many of
+      them share a chunk (one IPC round trip for all of them).
+    - The last chunks are tiny, which keeps the idle tail short.
+    """
+    sized = sorted(((os.path.getsize(p), p) for p in paths), reverse=True)
+    remaining = sum(size for size, _ in sized)
+
+    chunks = []
+    chunk, chunk_bytes = [], 0
+    budget = remaining / (2 * workers)
+
+    for size, path in sized:
+        chunk.append(path)
+        chunk_bytes += size
+
+        if chunk_bytes >= budget:
+            chunks.append(chunk)
+            remaining -= chunk_bytes
+            chunk, chunk_bytes = [], 0
+            budget = remaining / (2 * workers)
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def run_scheduled(executor, paths: list, out_dir: str) -> list:
+    """
+    Submits sorted, chunked work and streams results as they complete.
+    """
+    futures = [
+        executor.submit(process_chunk, chunk, out_dir)
+        for chunk in make_chunks(paths, WORKERS)
+    ]
+
+    timings = []
+    for future in concurrent.futures.as_completed(futures):
+        for message, pid, began, ended in future.result():
+            print(message)
+            timings.append((pid, began, ended))
+
+    return timings
+
+
+def run_baseline(executor, paths: list, out_dir: str) -> list:
+    """
+    Same as 05_...: input order, chunksize=1, ordered results.
+    """
+    timings = []
+    for results in executor.map(process_chunk, [[p] for p in paths],
+                                [out_dir] * len(paths)):
+        for message, pid, began, ended in results:
+            print(message)
+            timings.append((pid, began, ended))
+
+    return timings
+
+
+# ------------------------------------------------------------------------------
+# METRICS
+# ------------------------------------------------------------------------------
+def report(name: str, timings: list, batch_start: float, batch_end: float) -> None:
+    """
+    Prints:
+    - makespan     : wall time of the whole batch
+    - tail         : time between the FIRST worker running out of work
+                     and the end of the batch (cores sitting idle)
+    - cores busy % : total task time / (workers × makespan)
+    """
+    makespan = batch_end - batch_start
+    busy = sum(ended - began for _, began, ended in timings)
+
+    last_end_per_worker = {}
+    for pid, _, ended in timings:
+        last_end_per_worker[pid] = max(ended, last_end_per_worker.get(pid, 0))
+    # A worker that never got a task was idle from the very start
+    idle_workers = WORKERS - len(last_end_per_worker)
+    ends = list(last_end_per_worker.values()) + [batch_start] * idle_workers
+    tail = batch_end - min(ends)
+
+    print(f"{name:<10} makespan {makespan:>6.2f}s   tail {tail:>6.2f}s   "
+          f"cores busy {100 * busy / (WORKERS * makespan):>5.1f}%")
+
+
+# ------------------------------------------------------------------------------
+# MIXED-SIZE BATCH
+# ------------------------------------------------------------------------------
+def make_mixed_batch(work_dir: str) -> list:
+    """
+    Builds a realistic mixed batch:
+    - the bundled multi-megapixel photos
+    - many small thumbnails derived from them
+
+    Input order is interleaved so the big photos are spread out,
+    including one near the very end (worst case for the tail).
+    """
+    if not img_paths:
+        return []
+
+    small_paths = []
+
+    for img_path in img_paths:
+        stem = os.path.splitext(os.path.basename(img_path))[0]
+        with Image.open(img_path) as img:
+            img.thumbnail(SMALL_SIZE)
+            for i in range(SMALL_COPIES_PER_IMAGE):
+                small_path = os.path.join(work_dir, f"{stem}_small{i}.jpg")
+                img.save(small_path)
+                small_paths.append(small_path)
+
+    batch = []
+    per_big = len(small_paths) // len(img_paths)
+    for i, img_path in enumerate(img_paths):
+        batch.extend(small_paths[i * per_big:(i + 1) * per_big])
+        batch.append(img_path)
+
+    return batch
+
+
+# ------------------------------------------------------------------------------
+# MAIN FUNCTION (PARENT PROCESS)
+# ------------------------------------------------------------------------------
+def main():
+    with tempfile.TemporaryDirectory() as work_dir:
+        batch = make_mixed_batch(work_dir)
+        if not batch:
+            print(f"ERROR: No .jpg images found in: {img_dir}")
+            return
+
+        out_dir = os.path.join(work_dir, 'processed')
+        os.makedirs(out_dir)
+
+        print(f"Mixed batch: {len(img_paths)} large + "
+              f"{len(batch) - len(img_paths)} small images, {WORKERS} workers\n")
+
+        reports = []
+        for name, runner in (('baseline', run_baseline), ('scheduled', run_scheduled)):
+            with concurrent.futures.ProcessPoolExecutor(WORKERS) as executor:
+                # Warm the pool so process start-up is not measured
+                list(executor.map(time.sleep, [0.1] * WORKERS))
+
+                batch_start = time.time()
+                timings = runner(executor, batch, out_dir)
+                batch_end = time.time()
+
+            reports.append((name, timings, batch_start, batch_end))
+
+        print()
+        for args in reports:
+            report(*args)
+
+
+# ------------------------------------------------------------------------------
+# REQUIRED ENTRY POINT FOR MULTIPROCESSING
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (8 BUNDLED IMAGES + 48 SMALL COPIES, 1 CPU CORE, LINUX)
+# ==============================================================================
+
+"""
+WORKERS = os.cpu_count() = 1:
+
+baseline   makespan  10.27s   tail   0.00s   cores busy  99.8%
+scheduled  makespan  10.73s   tail   0.00s   cores busy  99.9%
+
+WORKERS = 4 on the same machine (the 4 workers time-share one core, so
+the makespan cannot drop, but the schedule still shows in the tail):
+
+baseline   makespan  11.23s   tail   2.35s   cores busy  89.7%
+scheduled  makespan  11.72s   tail   1.13s   cores busy  95.4%
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. LARGEST FIRST
+   - Big jobs start while every core is still free
+   - Only small jobs are left at the end, so cores finish together
+   - Classic LPT rule: makespan is within 4/3 of optimal
+
+2. ADAPTIVE CHUNKS
+   - chunksize=1 pays pickling + pipe + wakeup for every tiny file
+   - One fixed large chunksize would lump big files together → long tail
+   - Guided chunks get the best of both
+
+3. as_completed() VS map()
+   - map() yields in SUBMISSION order: one slow image blocks all output
+   - as_completed() yields each chunk the moment it is done
+
+4. MEASURING
+   - Tail is the idle window at the end of the batch
+   - "Cores busy" close to 100% means the pool was never starved
+   - With ONE worker both are trivially perfect: there is nobody to
+     sit idle. Largest-first halves the tail once there are 4 workers
+"""
@@ -0,0 +1,361 @@
+"""
+================================================================================
+INCREMENTAL IMAGE PROCESSING — SKIP WHAT IS ALREADY UP TO DATE
+================================================================================
+
+This example is a follow-up to `05_processpoolexecutor_image_processing.py`.
+
+There, EVERY run re-blurs and re-saves EVERY image — even when processed/
+already holds the exact same output from last night.
+
+The fastest work is the work you do not do.
+
+This script keeps a small MANIFEST next to the outputs:
+
+    processed/.manifest.json
+
+    {
+      "photo-1516117172878-fd2c41f4a759.jpg": {
+        "size": 630244,
+        "mtime_ns": 1718000000000000000,
+        "sha256": "9f2c...",          # hash of the INPUT file contents
+        "params": "4be1...",          # hash of the filter parameters
+        "output": "photo-1516117172878-fd2c41f4a759.jpg"
+      },
+      ...
+    }
+
+An image is re-processed ONLY when:
+✔ It is new
+✔ Its CONTENT changed (different sha256)
+✔ The filter PARAMETERS changed (different params hash)
+✔ Its output file is missing
+✔ --force is given
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Content-addressed caching (hash of inputs + parameters → output)
+2. The stat() shortcut: skip hashing files whose size & mtime are unchanged
+3. Writing a manifest atomically (temp file + os.replace)
+4. Providing a --force escape hatch
+5. Measuring a cold run vs a warm run vs a "1 file changed" run
+
+================================================================================
+USAGE
+================================================================================
+
+python 10_incremental_image_processing.py             # incremental run
+python 10_incremental_image_processing.py --force     # rebuild everything
+python 10_incremental_image_processing.py --benchmark # cold vs warm timings
+
+================================================================================
+"""
+
+import time
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import concurrent.futures
+from PIL import Image, ImageFilter
+
+
+# ------------------------------------------------------------------------------
+# RESOLVE SCRIPT & IMAGE DIRECTORIES
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+img_dir = os.path.join(script_dir, 'images')
+processed_dir = os.path.join(script_dir, 'processed')
+
+MANIFEST_NAME = '.manifest.json'
+
+
+# ------------------------------------------------------------------------------
+# FILTER PARAMETERS
+# ------------------------------------------------------------------------------
+# Everything that influences the output MUST be listed here.
+# Changing any value changes PARAMS_HASH, which invalidates every output.
+#
+# Bump "version" when process_image() itself changes behaviour.
+# ------------------------------------------------------------------------------
+PARAMS = {
+    'version': 1,
+    'blur_radius': 15,
+    'thumbnail_size': [1200, 1200],
+}
+
+PARAMS_HASH = hashlib.sha256(
+    json.dumps(PARAMS, sort_keys=True).encode()
+).hexdigest()
+
+
+# ------------------------------------------------------------------------------
+# IMAGE PROCESSING FUNCTION (RUNS IN CHILD PROCESSES)
+# ------------------------------------------------------------------------------
+def process_image(img_path: str, out_dir: str) -> str:
+    """
+    Same pipeline as 05_...: blur → thumbnail → save.
+
+    Parameters are read from PARAMS so the manifest
+    and the actual work can never disagree.
+    """
+    filename = os.path.basename(img_path)
+
+    img = Image.open(img_path)
+    img = img.filter(ImageFilter.GaussianBlur(PARAMS['blur_radius']))
+    img.thumbnail(tuple(PARAMS['thumbnail_size']))
+    img.save(os.path.join(out_dir, filename))
+
+    return filename
+
+
+# ------------------------------------------------------------------------------
+# MANIFEST HELPERS
+# ------------------------------------------------------------------------------
+def load_manifest(out_dir: str) -> dict:
+    """
+    Returns the previous manifest, or an empty one on first run
+    (or if the file is unreadable — worst case we rebuild).
+    """
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(out_dir: str, manifest: dict) -> None:
+    """
+    Writes the manifest ATOMICALLY.
+
+    If the process is killed half-way, the old manifest survives
+    intact instead of a truncated JSON file.
+    """
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    os.replace(tmp_path, path)
+
+
+def file_sha256(path: str) -> str:
+    """
+    Hashes a file in fixed-size blocks (constant memory).
+    """
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def describe_input(img_path: str, previous: dict | None) -> dict:
+    """
+    Builds the manifest entry for an input file.
+
+    STAT SHORTCUT:
+    --------------
+    Hashing thousands of multi-MB files is not free. If size and
+    mtime are identical to the previous run, the previous hash is
+    reused and the file is never read.
+    """
+    st = os.stat(img_path)
+
+    if previous and previous['size'] == st.st_size and previous['mtime_ns'] == st.st_mtime_ns:
+        digest = previous['sha256']
+    else:
+        digest = file_sha256(img_path)
+
+    return {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha256': digest,
+        'params': PARAMS_HASH,
+        'output': os.path.basename(img_path),
+    }
+
+
+def is_up_to_date(entry: dict, previous: dict | None, out_dir: str) -> bool:
+    """
+    An output is reusable only if input content, parameters
+    and the output file itself are all unchanged / present.
+    """
+    return (
+        previous is not None
+        and previous['sha256'] == entry['sha256']
+        and previous['params'] == entry['params']
+        and os.path.exists(os.path.join(out_dir, previous['output']))
+    )
+
+
+# ------------------------------------------------------------------------------
+# INCREMENTAL RUN
+# ------------------------------------------------------------------------------
+def run(in_dir: str, out_dir: str, force: bool = False) -> tuple:
+    """
+    Processes only new / changed images.
+
+    Returns:
+    --------
+    (processed count, skipped count, failed count)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    old_manifest = {} if force else load_manifest(out_dir)
+    new_manifest = {}
+    todo = []
+    skipped = processed = failed = 0
+
+    for filename in sorted(os.listdir(in_dir)):
+        if not filename.endswith('.jpg'):
+            continue
+
+        img_path = os.path.join(in_dir, filename)
+        previous = old_manifest.get(filename)
+        entry = describe_input(img_path, previous)
+
+        if is_up_to_date(entry, previous, out_dir):
+            new_manifest[filename] = entry
+            skipped += 1
+        else:
+            todo.append((img_path, entry))
+
+    if todo:
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            futures = {
+                executor.submit(process_image, img_path, out_dir): entry
+                for img_path, entry in todo
+            }
+
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    filename = future.result()
+                except Exception as e:
+                    # Not recorded → retried on the next run
+                    print(f"Failed {futures[future]['output']}: {e}")
+                    failed += 1
+                    continue
+
+                new_manifest[filename] = futures[future]
+                processed += 1
+                print(f"{filename} processed...")
+
+    # Entries for deleted inputs are simply not carried over
+    save_manifest(out_dir, new_manifest)
+
+    return processed, skipped, failed
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK: COLD → WARM → ONE FILE CHANGED
+# ------------------------------------------------------------------------------
+def benchmark() -> None:
+    """
+    Works on a temporary COPY of images/ so the real files are untouched.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        in_dir = os.path.join(work_dir, 'images')
+        out_dir = os.path.join(work_dir, 'processed')
+        shutil.copytree(img_dir, in_dir)
+
+        def timed(label: str, **kwargs) -> None:
+            begin = time.perf_counter()
+            done, skipped, failed = run(in_dir, out_dir, **kwargs)
+            elapsed = time.perf_counter() - begin
+            print(f"--> {label:<22} processed {done:>3}  skipped {skipped:>3}  "
+                  f"failed {failed:>3}  in {elapsed:.2f} seconds\n")
+
+        timed('cold run')
+        timed('warm run (no changes)')
+
+        # Change the CONTENT of one input
+        changed = os.path.join(in_dir, sorted(os.listdir(in_dir))[0])
+        with Image.open(changed) as img:
+            img.rotate(180).save(changed)
+        timed('one input changed')
+
+        # Touch without changing content: stat differs, hash does not
+        os.utime(changed)
+        timed('one input touched')
+
+        timed('forced rebuild', force=True)
+
+
+# ------------------------------------------------------------------------------
+# MAIN FUNCTION (PARENT PROCESS)
+# ------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the manifest and reprocess every image')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='time cold, warm and partially changed runs')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+
+    if not os.path.isdir(img_dir):
+        print(f"ERROR: Could not find folder: {img_dir}")
+        print("Make sure your 'images' folder is in the same directory as this script.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+
+    done, skipped, failed = run(img_dir, processed_dir, force=args.force)
+    print(f"{done} processed, {skipped} already up to date, {failed} failed")
+
+    finished = time.perf_counter()
+    print(f"Finished in: {round(finished - start, 2)} seconds")
+
+
+# ------------------------------------------------------------------------------
+# REQUIRED ENTRY POINT FOR MULTIPROCESSING
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (--benchmark, 8 BUNDLED IMAGES, 1 CPU CORE)
+# ==============================================================================
+
+"""
+--> cold run               processed   8  skipped   0  failed   0  in 10.34 seconds
+--> warm run (no changes)  processed   0  skipped   8  failed   0  in 0.00 seconds
+--> one input changed      processed   1  skipped   7  failed   0  in 0.32 seconds
+--> one input touched      processed   0  skipped   8  failed   0  in 0.00 seconds
+--> forced rebuild         processed   8  skipped   0  failed   0  in 10.32 seconds
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WHY HASH CONTENT, NOT JUST MTIME?
+   - mtime changes on copy / checkout / touch without the pixels changing
+   - Content hash decides; mtime is only a shortcut to avoid re-hashing
+
+2. WHY HASH THE PARAMETERS?
+   - Changing blur_radius must invalidate every output
+   - Forgetting this is the #1 bug in hand-written build caches
+
+3. WHY WRITE THE MANIFEST ATOMICALLY?
+   - A crash mid-write would otherwise leave corrupt JSON
+   - os.replace() is atomic on POSIX and Windows
+
+4. WHY --force?
+   - Escape hatch when outputs were edited by hand or the cache is suspect
+
+5. REAL-WORLD IMPACT:
+   - Warm runs cost one stat() per file instead of a full decode + blur
+   - < 1% changed inputs → runtime proportional to the changes only
+"""
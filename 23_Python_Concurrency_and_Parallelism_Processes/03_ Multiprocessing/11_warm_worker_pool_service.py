@@ -0,0 +1,415 @@
+"""
+================================================================================
+WARM WORKER POOL SERVICE — ProcessPoolExecutor behind a Unix socket
+================================================================================
+
+This example is a follow-up to `05_processpoolexecutor_image_processing.py`.
+
+Every run of 05_... pays the same start-up bill before ANY image is touched:
+✘ Start a Python interpreter
+✘ Create a ProcessPoolExecutor and start N worker processes
+✘ Import PIL in every worker
+✘ Tear everything down again at the end
+
+For a batch of thousands of images this is noise.
+For an ad-hoc job of ONE image it can be most of the runtime.
+
+The fix is a long-lived SERVICE (daemon):
+✔ The pool is created ONCE and stays alive
+✔ Workers import Pillow once, in a pool initializer ("preloading")
+✔ Clients send jobs over a local Unix domain socket
+✔ Each job only pays for the actual image work
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Where the fixed cost of a process pool comes from
+2. How to preload heavy modules with ProcessPoolExecutor(initializer=...)
+3. How to expose a pool through a tiny JSON-over-Unix-socket protocol
+4. How to measure cold vs warm latency fairly
+
+================================================================================
+USAGE
+================================================================================
+
+python 11_warm_worker_pool_service.py serve                 # start the daemon
+python 11_warm_worker_pool_service.py submit a.jpg b.jpg    # send a job
+python 11_warm_worker_pool_service.py once a.jpg b.jpg      # cold, no daemon
+python 11_warm_worker_pool_service.py stop                  # stop the daemon
+python 11_warm_worker_pool_service.py benchmark             # cold vs warm
+
+================================================================================
+PROTOCOL (ONE JSON OBJECT PER LINE)
+================================================================================
+
+client → {"paths": ["/abs/a.jpg", ...], "out_dir": "/abs/processed"}
+server → {"results": ["a.jpg processed...", ...]}
+
+client → {"cmd": "shutdown"}
+server → {"results": []}
+
+On a malformed request or a broken pool:
+server → {"error": "..."}
+
+================================================================================
+"""
+
+import time
+import os
+import sys
+import json
+import socket
+import argparse
+import tempfile
+import subprocess
+import socketserver
+import threading
+import concurrent.futures
+
+
+# ------------------------------------------------------------------------------
+# RESOLVE SCRIPT & IMAGE DIRECTORIES
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+processed_dir = os.path.join(script_dir, 'processed')
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'image_pool.sock')
+
+
+# ------------------------------------------------------------------------------
+# WORKER INITIALIZER (RUNS ONCE PER WORKER PROCESS)
+# ------------------------------------------------------------------------------
+# NOTE:
+# -----
+# PIL is deliberately NOT imported at module level.
+#
+# - The client side of this script never needs it
+# - In the service, every worker imports it exactly once, here,
+#   when the pool starts — not when the first job arrives
+# ------------------------------------------------------------------------------
+def preload() -> None:
+    """
+    Imports Pillow and its JPEG codec so the first job is already warm.
+    """
+    from PIL import Image, ImageFilter, JpegImagePlugin  # noqa: F401
+
+
+def warm_up(_: int) -> int:
+    """
+    No-op task used to force every worker to start (and preload).
+    """
+    return os.getpid()
+
+
+# ------------------------------------------------------------------------------
+# IMAGE PROCESSING FUNCTION (RUNS IN CHILD PROCESSES)
+# ------------------------------------------------------------------------------
+def process_image(img_path: str, out_dir: str) -> str:
+    """
+    Same pipeline as 05_...: blur → thumbnail → save.
+    """
+    from PIL import Image, ImageFilter
+
+    size = (1200, 1200)
+    filename = os.path.basename(img_path)
+
+    if not os.path.exists(img_path):
+        return f"{filename} -> Skipped (Not Found)"
+
+    try:
+        img = Image.open(img_path)
+        img = img.filter(ImageFilter.GaussianBlur(15))
+        img.thumbnail(size)
+
+        os.makedirs(out_dir, exist_ok=True)
+        img.save(os.path.join(out_dir, filename))
+
+        return f"{filename} processed..."
+
+    except Exception as e:
+        return f"Failed {filename}: {e}"
+
+
+def run_job(executor, paths: list, out_dir: str) -> list:
+    return list(executor.map(process_image, paths, [out_dir] * len(paths)))
+
+
+# ------------------------------------------------------------------------------
+# SERVER SIDE
+# ------------------------------------------------------------------------------
+class JobHandler(socketserver.StreamRequestHandler):
+    """
+    Handles ONE client connection = ONE job.
+
+    ThreadingUnixStreamServer runs each handler in its own thread,
+    so several clients can share the same warm pool concurrently.
+    """
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+
+        # Connection opened and closed without a request (health check)
+        if not line:
+            return
+
+        try:
+            request = json.loads(line)
+
+            if request.get('cmd') == 'shutdown':
+                self.reply([])
+                # shutdown() blocks until serve_forever() returns,
+                # so it must be called from a different thread
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+            out_dir = request.get('out_dir', processed_dir)
+            results = run_job(self.server.executor, request['paths'], out_dir)
+
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # Not JSON, not an object, or no list of paths
+            self.reply_error(f"bad request: {e!r}")
+        except concurrent.futures.process.BrokenProcessPool as e:
+            # A worker died: this pool is unusable until the service restarts
+            self.reply_error(f"worker pool is broken: {e}")
+        else:
+            self.reply(results)
+
+    def reply(self, results: list) -> None:
+        self.wfile.write(json.dumps({'results': results}).encode() + b'\n')
+
+    def reply_error(self, message: str) -> None:
+        self.wfile.write(json.dumps({'error': message}).encode() + b'\n')
+
+
+def serve(socket_path: str, max_workers: int | None = None) -> None:
+    """
+    Starts the pool, warms every worker and serves jobs until stopped.
+    """
+    if os.path.exists(socket_path):
+        # A leftover file from a crashed service is safe to remove;
+        # a socket somebody still listens on is NOT
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+        else:
+            print(f"ERROR: a service is already running on {socket_path}")
+            sys.exit(1)
+
+    workers = max_workers or os.cpu_count() or 1
+
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=preload) as executor:
+        list(executor.map(warm_up, range(workers)))
+
+        with socketserver.ThreadingUnixStreamServer(socket_path, JobHandler) as server:
+            server.executor = executor
+            print(f"Serving {workers} warm workers on {socket_path}", flush=True)
+
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(socket_path)
+
+    print("Service stopped")
+
+
+# ------------------------------------------------------------------------------
+# CLIENT SIDE
+# ------------------------------------------------------------------------------
+def send(socket_path: str, request: dict) -> list:
+    """
+    Sends one request and waits for the reply.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode() + b'\n')
+
+        with sock.makefile('rb') as reply:
+            response = json.loads(reply.readline())
+
+    if 'error' in response:
+        raise RuntimeError(f"service error: {response['error']}")
+    return response['results']
+
+
+def submit(socket_path: str, paths: list, out_dir: str) -> list:
+    return send(socket_path, {
+        'paths': [os.path.abspath(p) for p in paths],
+        'out_dir': os.path.abspath(out_dir),
+    })
+
+
+def wait_for_socket(socket_path: str, timeout: float = 30) -> None:
+    """
+    Polls until the service accepts connections.
+    """
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+                return
+        except (FileNotFoundError, ConnectionRefusedError):
+            time.sleep(0.05)
+
+    raise TimeoutError(f"Service did not start on {socket_path}")
+
+
+# ------------------------------------------------------------------------------
+# COLD RUN (WHAT 05_... DOES)
+# ------------------------------------------------------------------------------
+def once(paths: list, out_dir: str) -> list:
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        return run_job(executor, paths, out_dir)
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK: COLD VS WARM, 1-IMAGE AND 10-IMAGE JOBS
+# ------------------------------------------------------------------------------
+def benchmark() -> None:
+    """
+    Uses the already-thumbnailed files in processed/ as inputs so
+    each job is SMALL — exactly the case where start-up cost matters.
+
+    Three ways to run the same job:
+    - cold        : `python this.py once ...`   (new interpreter + new pool)
+    - warm CLI    : `python this.py submit ...` (new interpreter, warm pool)
+    - warm socket : in-process client           (warm pool only)
+    """
+    inputs = sorted(
+        os.path.join(processed_dir, f)
+        for f in os.listdir(processed_dir) if f.endswith('.jpg')
+    )
+    jobs = {1: inputs[:1], 10: (inputs * 10)[:10]}
+
+    script = os.path.abspath(__file__)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        socket_path = os.path.join(work_dir, 'pool.sock')
+        out_dir = os.path.join(work_dir, 'out')
+
+        server = subprocess.Popen(
+            [sys.executable, script, 'serve', '--socket', socket_path],
+            stdout=subprocess.DEVNULL,
+        )
+
+        try:
+            wait_for_socket(socket_path)
+
+            print(f"{'job':<10} {'cold':>8} {'warm CLI':>10} {'warm socket':>12}")
+
+            for n, paths in jobs.items():
+                begin = time.perf_counter()
+                subprocess.run([sys.executable, script, 'once', *paths,
+                                '--out-dir', out_dir],
+                               check=True, stdout=subprocess.DEVNULL)
+                cold = time.perf_counter() - begin
+
+                begin = time.perf_counter()
+                subprocess.run([sys.executable, script, 'submit', *paths,
+                                '--out-dir', out_dir, '--socket', socket_path],
+                               check=True, stdout=subprocess.DEVNULL)
+                warm_cli = time.perf_counter() - begin
+
+                begin = time.perf_counter()
+                submit(socket_path, paths, out_dir)
+                warm_socket = time.perf_counter() - begin
+
+                print(f"{n:>2} images  {cold * 1000:>6.0f}ms {warm_cli * 1000:>8.0f}ms "
+                      f"{warm_socket * 1000:>10.0f}ms")
+
+        finally:
+            try:
+                send(socket_path, {'cmd': 'shutdown'})
+            except OSError:
+                server.terminate()
+            server.wait()
+
+
+# ------------------------------------------------------------------------------
+# MAIN FUNCTION (COMMAND LINE)
+# ------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('command', choices=['serve', 'submit', 'once', 'stop', 'benchmark'])
+    parser.add_argument('paths', nargs='*', help='images to process')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    parser.add_argument('--out-dir', default=processed_dir)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes for serve (default: CPU count)')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.socket, args.workers)
+    elif args.command == 'stop':
+        send(args.socket, {'cmd': 'shutdown'})
+    elif args.command == 'benchmark':
+        benchmark()
+    else:
+        start = time.perf_counter()
+
+        if args.command == 'submit':
+            results = submit(args.socket, args.paths, args.out_dir)
+        else:
+            results = once(args.paths, args.out_dir)
+
+        for result in results:
+            print(result)
+
+        finished = time.perf_counter()
+        print(f"Finished in: {round(finished - start, 2)} seconds")
+
+
+# ------------------------------------------------------------------------------
+# REQUIRED ENTRY POINT FOR MULTIPROCESSING
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (benchmark, 1 CPU CORE, LINUX / fork)
+# ==============================================================================
+
+"""
+job            cold   warm CLI  warm socket
+ 1 images     153ms      124ms         48ms
+10 images     629ms      603ms        460ms
+
+With spawn (macOS / Windows default) the cold column grows further,
+because every worker re-imports PIL before doing any work.
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WHERE DOES COLD START-UP TIME GO?
+   - Interpreter start + imports in the parent
+   - Starting N worker processes (fork or spawn)
+   - Importing PIL in each worker (spawn / forkserver)
+   - Shutting the pool down again
+
+2. WHY AN initializer?
+   - Runs once per worker when it starts, not once per task
+   - The first job no longer pays for `import PIL`
+
+3. WHY A UNIX SOCKET?
+   - Local only: no ports, protected by filesystem permissions
+   - Lower overhead than TCP loopback
+
+4. TRADE-OFFS
+   - The daemon holds memory even when idle
+   - Workers must be stateless: a leak in one job affects the next
+   - Somebody must start, monitor and stop the service
+   - A crashed worker breaks the whole pool: clients get an {"error"}
+     reply until the service is restarted
+"""
@@ -0,0 +1,280 @@
+"""
+================================================================================
+FUSED DOWNLOAD → PROCESS PIPELINE — threads feed a process pool
+================================================================================
+
+This example joins `02_Threading/08_pooled_http_image_downloader.py` and
+`05_processpoolexecutor_image_processing.py` into ONE program.
+
+Run as two separate scripts, the work happens in two phases:
+
+    time ──────────────────────────────────────────────────────────▶
+    network : ██████████████████████                                 (CPU idle)
+    CPU     :                       ██████████████████████████████   (network idle)
+
+And every original is written to disk only to be read back again.
+
+As a pipeline, the phases OVERLAP:
+
+    network : ██████████████████████
+    CPU     :    ██████████████████████████████
+
+✔ Stage 1 (threads)   : download image bytes into memory
+✔ Bounded queue       : at most N downloaded images wait for the CPU
+✔ Stage 2 (processes) : decode → blur → thumbnail → save the RESULT only
+✔ Backpressure        : if the CPU falls behind, downloads pause
+                         instead of filling memory
+
+The unprocessed original never touches the disk.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Pipelining: overlapping I/O-bound and CPU-bound stages
+2. Why threads for I/O and processes for CPU in the SAME program
+3. How queue.Queue(maxsize) creates backpressure
+4. Why a ProcessPoolExecutor needs its OWN limit (its queue is unbounded)
+5. Passing bytes to a worker and decoding with io.BytesIO
+
+================================================================================
+"""
+
+import io
+import os
+import sys
+import time
+import queue
+import tempfile
+import threading
+import importlib
+import concurrent.futures
+from PIL import Image, ImageFilter
+
+
+# ------------------------------------------------------------------------------
+# REUSE THE DOWNLOADER & LOCAL SERVER FROM 02_Threading
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(os.path.dirname(script_dir), '02_Threading'))
+
+from local_image_server import LocalImageServer  # noqa: E402
+
+pooled = importlib.import_module('08_pooled_http_image_downloader')
+
+
+# ------------------------------------------------------------------------------
+# SETTINGS
+# ------------------------------------------------------------------------------
+DOWNLOAD_WORKERS = 4              # concurrent downloads (threads)
+CPU_WORKERS = os.cpu_count() or 1 # image processing processes
+QUEUE_SIZE = 4                    # downloaded images allowed to wait
+
+
+# ------------------------------------------------------------------------------
+# STAGE 2: IMAGE PROCESSING FROM BYTES (RUNS IN CHILD PROCESSES)
+# ------------------------------------------------------------------------------
+def process_image_bytes(filename: str, img_bytes: bytes, out_dir: str) -> str:
+    """
+    Same pipeline as 05_...: blur → thumbnail → save,
+    but the input comes from memory instead of a file.
+
+    io.BytesIO makes the bytes look like an open file to PIL.
+    """
+    try:
+        img = Image.open(io.BytesIO(img_bytes))
+        img = img.filter(ImageFilter.GaussianBlur(15))
+        img.thumbnail((1200, 1200))
+        img.save(os.path.join(out_dir, filename))
+
+        return f"{filename} processed..."
+
+    except Exception as e:
+        return f"Failed {filename}: {e}"
+
+
+def process_image(img_path: str, out_dir: str) -> str:
+    """
+    The file-based version used by the two-script baseline.
+    """
+    with open(img_path, 'rb') as f:
+        return process_image_bytes(os.path.basename(img_path), f.read(), out_dir)
+
+
+# ------------------------------------------------------------------------------
+# THE FUSED PIPELINE
+# ------------------------------------------------------------------------------
+def run_pipeline(img_urls: list, out_dir: str,
+                 download_workers: int = DOWNLOAD_WORKERS,
+                 cpu_workers: int = CPU_WORKERS,
+                 queue_size: int = QUEUE_SIZE) -> None:
+    """
+    Stage 1 → bounded queue → Stage 2.
+
+    TWO LIMITS, ONE PURPOSE (bounded memory):
+    -----------------------------------------
+    - downloads       : Queue(maxsize=queue_size)
+                        put() BLOCKS a download thread when the queue is full
+    - cpu_slots       : BoundedSemaphore(2 × cpu_workers)
+                        ProcessPoolExecutor.submit() never blocks, so without
+                        this the main thread would drain the queue into the
+                        pool's internal (unbounded) queue and backpressure
+                        would never reach the downloaders
+
+    Peak images in memory ≈ download_workers + queue_size + 2 × cpu_workers
+    """
+    downloads = queue.Queue(maxsize=queue_size)
+    cpu_slots = threading.BoundedSemaphore(2 * cpu_workers)
+    stop = threading.Event()
+    downloader = pooled.PooledDownloader(pool_size=download_workers,
+                                         max_in_flight=download_workers)
+
+    def fetch(img_url: str) -> None:
+        if stop.is_set():           # the dispatcher failed: nobody will consume it
+            return
+        response = downloader.session.get(img_url, timeout=30)
+        response.raise_for_status()
+        downloads.put((pooled.image_name(img_url), response.content))
+
+    def close_queue(futures: list) -> None:
+        # Sentinel: tells the dispatcher no more images are coming
+        concurrent.futures.wait(futures)
+        downloads.put(None)
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(cpu_workers) as cpu_pool, \
+                concurrent.futures.ThreadPoolExecutor(download_workers) as io_pool:
+
+            io_futures = [io_pool.submit(fetch, url) for url in img_urls]
+            threading.Thread(target=close_queue, args=(io_futures,), daemon=True).start()
+
+            # ------------------------------------------------------------------
+            # DISPATCHER (MAIN THREAD): queue → process pool
+            # ------------------------------------------------------------------
+            cpu_futures = []
+            try:
+                while (item := downloads.get()) is not None:
+                    cpu_slots.acquire()
+
+                    future = cpu_pool.submit(process_image_bytes, *item, out_dir)
+                    future.add_done_callback(lambda _: cpu_slots.release())
+                    cpu_futures.append(future)
+
+            except BaseException:
+                # e.g. BrokenProcessPool from submit(). Nobody reads the queue
+                # any more: fetch threads blocked in put() would hang the
+                # io_pool shutdown below. Stop new fetches, then drain until
+                # the sentinel says every fetch has finished.
+                stop.set()
+                for future in io_futures:
+                    future.cancel()
+                while downloads.get() is not None:
+                    pass
+                raise
+
+            # Surface download errors (they do not stop the other images)
+            for future in io_futures:
+                if future.exception():
+                    print(f"Download failed: {future.exception()}")
+
+            for future in concurrent.futures.as_completed(cpu_futures):
+                print(future.result())
+
+    finally:
+        downloader.close()
+
+
+# ------------------------------------------------------------------------------
+# BASELINE: TWO SCRIPTS BACK TO BACK
+# ------------------------------------------------------------------------------
+def run_two_phases(img_urls: list, out_dir: str) -> None:
+    """
+    Phase 1: download every original to disk (08_...)
+    Phase 2: process every file on disk      (05_...)
+
+    The SAME pooled downloader is used, so the only difference
+    measured is the overlap.
+    """
+    originals_dir = os.path.join(out_dir, 'originals')
+
+    downloader = pooled.PooledDownloader(pool_size=DOWNLOAD_WORKERS,
+                                         max_in_flight=DOWNLOAD_WORKERS)
+    downloader.download_all(img_urls, originals_dir)
+    downloader.close()
+
+    img_paths = [os.path.join(originals_dir, pooled.image_name(url)) for url in img_urls]
+
+    with concurrent.futures.ProcessPoolExecutor(CPU_WORKERS) as executor:
+        for result in executor.map(process_image, img_paths, [out_dir] * len(img_paths)):
+            print(result)
+
+
+# ------------------------------------------------------------------------------
+# MAIN FUNCTION (PARENT PROCESS)
+# ------------------------------------------------------------------------------
+def main():
+    """
+    The local server adds 1 s per request to stand in for
+    real-world transfer time of a multi-megapixel photo.
+    """
+    with LocalImageServer(latency=1.0, handshake_delay=0.03) as server:
+        img_urls = server.urls(16)
+
+        timings = {}
+        for name, strategy in (('two scripts', run_two_phases), ('pipeline', run_pipeline)):
+            with tempfile.TemporaryDirectory() as out_dir:
+                start = time.perf_counter()
+                strategy(img_urls, out_dir)
+                timings[name] = time.perf_counter() - start
+
+    print()
+    for name, elapsed in timings.items():
+        print(f"{name:<12} finished in: {round(elapsed, 2)} seconds")
+
+
+# ------------------------------------------------------------------------------
+# REQUIRED ENTRY POINT FOR MULTIPROCESSING
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (16 IMAGES, 1 CPU CORE, 1 s SIMULATED TRANSFER TIME)
+# ==============================================================================
+
+"""
+...
+two scripts  finished in: 19.67 seconds
+pipeline     finished in: 16.55 seconds
+
+Downloads alone take ~4 s (16 images / 4 threads × 1 s); the pipeline
+hides almost all of it behind the CPU work.
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WHERE DOES THE SPEEDUP COME FROM?
+   - Processing of image 1 starts as soon as image 1 arrives
+   - Best case: total ≈ max(download time, CPU time), not their sum
+
+2. BACKPRESSURE
+   - Fast network + slow CPU: downloads pause at queue_size waiting images
+   - Slow network + fast CPU: workers idle briefly, nothing piles up
+   - Memory stays bounded either way
+   - The flip side: if the dispatcher dies (BrokenProcessPool), blocked
+     downloaders would wait forever — it must stop them and drain the queue
+
+3. WHY THREADS AND PROCESSES TOGETHER?
+   - Downloading is waiting → threads are cheap and enough
+   - Blurring is computing  → processes sidestep the GIL
+
+4. NO TEMPORARY ORIGINALS
+   - Bytes go network → memory → worker (pickled once) → processed file
+   - Saves a disk write AND a disk read per image
+"""
@@ -0,0 +1,234 @@
+"""
+================================================================================
+FORKSERVER + PRELOAD — start processes without re-importing the world
+================================================================================
+
+`00_basic_multiprocessing_process.py` to `02_multiprocessing_loop_speedup.py`
+create a fresh multiprocessing.Process per task. What that costs depends on
+the START METHOD:
+
+    fork        : copy the parent (fast) — but unsafe once the parent has
+                  threads (locks held by other threads are copied LOCKED),
+                  and unavailable on Windows / the macOS default
+    spawn       : start a brand-new interpreter, re-import __main__ and
+                  every module it needs — safe, but SLOW with heavy imports
+    forkserver  : a small, single-threaded SERVER process is started once;
+                  every child is forked from IT, not from your big parent
+
+And forkserver can PRELOAD modules:
+
+    ctx.set_forkserver_preload(['__main__', 'PIL.Image', ...])
+
+The server imports them ONCE, and every child forked from it inherits them
+already imported. Safe like spawn, close to fork in speed.
+
+This file wraps that in a reusable launcher:
+
+    launcher = ProcessLauncher('forkserver', preload=['PIL.Image'])
+    launcher.run(process_image, path)
+
+and measures per-process start-up latency for every method.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. The three start methods and their trade-offs
+2. What a child process must do before running your function
+3. How forkserver preloading works (and why '__main__' matters)
+4. multiprocessing.get_context() — start methods without global state
+5. Measuring start-up latency across processes (a shared Value)
+
+================================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import multiprocessing
+
+
+# ------------------------------------------------------------------------------
+# THE LAUNCHER
+# ------------------------------------------------------------------------------
+HEAVY_MODULES = ['PIL.Image', 'PIL.ImageFilter', 'asyncio', 'concurrent.futures']
+
+
+class ProcessLauncher:
+    """
+    Starts one process per task with a chosen start method.
+
+    Arguments:
+    ----------
+    method  : 'fork' | 'spawn' | 'forkserver'
+    preload : modules the fork server imports ONCE (forkserver only)
+
+    IMPORTANT:
+    ----------
+    The fork server is started on the first launch and lives until the
+    parent exits. Its preload list must be set BEFORE that first launch;
+    later changes have no effect.
+    """
+
+    def __init__(self, method: str = 'forkserver', preload: list | None = None):
+        self.ctx = multiprocessing.get_context(method)
+
+        if method == 'forkserver' and preload:
+            # '__main__' first: targets defined in this script are then
+            # already importable in the server (instead of per child)
+            self.ctx.set_forkserver_preload(['__main__', *preload])
+
+    def start(self, target, *args) -> multiprocessing.Process:
+        process = self.ctx.Process(target=target, args=args)
+        process.start()
+        return process
+
+    def run(self, target, *args) -> int:
+        """
+        Start + join; returns the exit code.
+        """
+        process = self.start(target, *args)
+        process.join()
+        return process.exitcode
+
+
+# ------------------------------------------------------------------------------
+# TASK: NEEDS THE HEAVY MODULES
+# ------------------------------------------------------------------------------
+def task(started_at) -> None:
+    """
+    Records the moment the child starts running user code, then
+    imports what an image worker needs. Free if already imported
+    (fork, preloaded forkserver), expensive if not.
+    """
+    started_at.value = time.perf_counter()
+
+    from PIL import Image, ImageFilter  # noqa: F401
+    import asyncio  # noqa: F401
+    import concurrent.futures  # noqa: F401
+
+
+# ------------------------------------------------------------------------------
+# MEASUREMENT (RUNS IN A FRESH INTERPRETER PER CONFIGURATION)
+# ------------------------------------------------------------------------------
+def measure(method: str, preload: bool, count: int) -> None:
+    """
+    Prints: <first launch ms> <mean start ms> <mean total ms>
+
+    start : parent calls start() → child runs the first line of task()
+    total : parent calls start() → child has exited (join returns)
+    """
+    # A real application imports its heavy modules in the parent too
+    for module in HEAVY_MODULES:
+        __import__(module)
+
+    launcher = ProcessLauncher(method, HEAVY_MODULES if preload else None)
+    started_at = launcher.ctx.Value('d', 0.0, lock=False)
+
+    starts, totals = [], []
+    for _ in range(count + 1):
+        t0 = time.perf_counter()
+        if launcher.run(task, started_at) != 0:
+            raise RuntimeError("child failed")
+        totals.append(time.perf_counter() - t0)
+        starts.append(started_at.value - t0)
+
+    # The first launch also starts the fork server: report it separately
+    first = totals.pop(0)
+    starts.pop(0)
+
+    print(first * 1000, sum(starts) / count * 1000, sum(totals) / count * 1000)
+
+
+def benchmark(count: int) -> None:
+    print(f"{count} sequential launches per configuration "
+          f"(+1 warm-up), task imports: {', '.join(HEAVY_MODULES)}\n")
+    print(f"{'start method':<24} {'1st launch':>11} {'start-up':>10} {'start→exit':>11}")
+
+    for method, preload in (('fork', False), ('spawn', False),
+                            ('forkserver', False), ('forkserver', True)):
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--measure',
+             method, str(int(preload)), str(count)],
+            capture_output=True, text=True, check=True,
+        )
+        first, start, total = map(float, result.stdout.split())
+
+        label = f"{method} + preload" if preload else method
+        print(f"{label:<24} {first:>9.1f}ms {start:>8.1f}ms {total:>9.1f}ms")
+
+
+# ------------------------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('--count', type=int, default=20)
+    parser.add_argument('--measure', nargs=3, metavar=('METHOD', 'PRELOAD', 'COUNT'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        method, preload, count = args.measure
+        measure(method, preload == '1', int(count))
+    else:
+        benchmark(args.count)
+
+
+# ------------------------------------------------------------------------------
+# REQUIRED ENTRY POINT FOR MULTIPROCESSING
+# ------------------------------------------------------------------------------
+# Essential here: spawn and forkserver children IMPORT this file
+# (as __mp_main__); without the guard they would run main() again.
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (LINUX, PYTHON 3.11, 1 CPU CORE)
+# ==============================================================================
+
+"""
+20 sequential launches per configuration (+1 warm-up), task imports: PIL.Image, PIL.ImageFilter, asyncio, concurrent.futures
+
+start method              1st launch   start-up  start→exit
+fork                           4.2ms      1.9ms       2.7ms
+spawn                        236.5ms     77.2ms     158.5ms
+forkserver                   220.6ms     16.4ms      79.4ms
+forkserver + preload         226.2ms     17.0ms      18.3ms
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WHERE spawn SPENDS ITS TIME
+   - ~77 ms to boot an interpreter and import __main__
+   - ~80 ms more to import PIL, asyncio... — in EVERY child
+
+2. forkserver WITHOUT PRELOAD
+   - No interpreter boot per child (forked from the server): 16 ms
+   - But the server is bare, so each child still pays the imports
+
+3. forkserver WITH PRELOAD
+   - The imports happened once, in the server → 18 ms start to exit,
+     8.7× faster than spawn
+   - The one-time cost moves to the first launch (server start-up)
+
+4. WHY NOT JUST fork?
+   - fork is fastest, but copies a parent that may hold threads, locks,
+     open connections, a 10 GB heap...
+   - forkserver children come from a small, clean, single-threaded
+     process: fork-like speed without inheriting the parent's state
+   - Python 3.14 makes forkserver the default on Linux for these reasons
+
+5. WHEN DOES THIS MATTER?
+   - One process per task (00_... to 02_...): every task pays start-up
+   - A long-lived Pool pays it once per worker — there, preloading
+     mainly speeds up pool creation and worker replacement
+"""
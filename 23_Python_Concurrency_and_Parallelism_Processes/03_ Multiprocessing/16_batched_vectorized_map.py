@@ -0,0 +1,339 @@
+"""
+================================================================================
+BATCHED MAP — ship BUFFERS to workers, not millions of tiny tasks
+================================================================================
+
+`a.py` / `06_multiprocessing_pool_basics.py` do:
+
+    pool.map(cube, [1, 2, 3, 4, 5])
+
+For every single number, the Pool has to:
+    pickle it → send it through a pipe → unpickle it → call cube()
+    → pickle the result → send it back → unpickle it → put it in a list
+
+`n ** 3` takes ~50 ns. All of the above costs tens of MICROseconds.
+With tiny tasks, a Pool is mostly a very expensive way to move ints around.
+
+The fix is to change the UNIT OF WORK from "one item" to "one slice":
+
+    data ──► [ slice 0 ][ slice 1 ][ slice 2 ] ...      contiguous array('q')
+                 │          │          │
+                 ▼          ▼          ▼                 ONE message each,
+              worker     worker     worker               pickled as raw bytes
+              cube() over the whole slice                (vectorized w/ NumPy)
+                 │          │          │
+                 ▼          ▼          ▼
+             [ result 0 ][ result 1 ][ result 2 ]        ONE buffer per slice
+                           │
+                           ▼
+                 result.extend(...)  (memcpy, in order)
+
+An array.array pickles as ONE bytes object (not one object per element),
+so a slice of 100,000 ints is a single 800 KB message.
+
+NumPy is OPTIONAL and OPT-IN: with `vectorized=True` (and NumPy installed),
+workers run `cube(ndarray)` — a single vectorized `** 3` over the slice.
+Otherwise they loop over the slice in plain Python; the per-item IPC cost
+is gone either way.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Why per-item IPC dwarfs tiny tasks
+2. array.array as a compact, picklable buffer
+3. Contiguous slicing and in-order reassembly (imap)
+4. Optional NumPy vectorization with a pure-Python fallback
+5. Finding the crossover: when is a Pool worth it at all?
+
+================================================================================
+USAGE
+================================================================================
+
+python 16_batched_vectorized_map.py                 # up to 10^7 elements
+python 16_batched_vectorized_map.py --max-exp 6     # quicker run
+
+================================================================================
+"""
+
+import math
+import time
+import functools
+import argparse
+from array import array
+from multiprocessing import Pool, cpu_count
+
+try:
+    import numpy as np
+except ImportError:          # optional: workers fall back to a Python loop
+    np = None
+
+
+# ------------------------------------------------------------------------------
+# THE TASK (SAME AS a.py)
+# ------------------------------------------------------------------------------
+def cube(n):
+    """
+    Works on an int AND, unchanged, on a whole NumPy array.
+    """
+    return n ** 3
+
+
+# ------------------------------------------------------------------------------
+# BATCHED MAP
+# ------------------------------------------------------------------------------
+def _run_chunk(fn, vectorized: bool, chunk: array) -> array:
+    """
+    Runs in the worker: ONE call per slice, ONE buffer back.
+    """
+    if vectorized and np is not None:
+        # Zero-copy view of the received bytes → vectorized fn → raw bytes
+        values = np.frombuffer(chunk, dtype=chunk.typecode)
+        return array(chunk.typecode, fn(values).astype(chunk.typecode).tobytes())
+
+    return array(chunk.typecode, map(fn, chunk))
+
+
+def batched_map(pool, fn, data: array, chunk_size: int | None = None, *,
+                workers: int | None = None, vectorized: bool = False) -> array:
+    """
+    pool.map(fn, data) — but sends contiguous slices of `data`.
+
+    Arguments:
+    ----------
+    pool       : a multiprocessing.Pool
+    fn         : element-wise function
+    data       : array.array; results use the SAME typecode
+    chunk_size : elements per slice (default: ~4 slices per worker,
+                 like Pool.map's own default)
+    workers    : the pool's size, for the default chunk_size
+                 (default: cpu_count(), like Pool())
+    vectorized : call fn ONCE per slice, on an ndarray (needs NumPy;
+                 ignored without it). NumPy integers wrap on overflow
+                 where Python ints grow: only for results that fit
+                 the typecode
+
+    Returns one array with the results, in order.
+    """
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(data) / ((workers or cpu_count()) * 4)))
+
+    slices = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+
+    result = array(data.typecode)
+    # partial() pickles as (_run_chunk, fn, vectorized) — a lambda would not
+    for chunk in pool.imap(functools.partial(_run_chunk, fn, vectorized), slices):
+        result.extend(chunk)
+    return result
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK
+# ------------------------------------------------------------------------------
+MAX_VALUE = 2_000_000        # 2,000,000 ** 3 still fits in a signed 64-bit int
+PER_ITEM_LIMIT = 10 ** 5     # beyond this, chunksize=1 takes minutes
+
+
+def timed(fn, *args) -> tuple:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def strategies(pool, workers: int) -> dict:
+    # cube() works on ndarrays, and MAX_VALUE keeps every result in range
+    batched = functools.partial(batched_map, workers=workers, vectorized=True)
+    return {
+        'single process loop': lambda data: array('q', map(cube, data)),
+        'Pool.map, chunksize=1': lambda data: pool.map(cube, data, chunksize=1),
+        'Pool.map (default)': lambda data: pool.map(cube, data),
+        'batched_map': lambda data: batched(pool, cube, data),
+    }
+
+
+def benchmark(max_exp: int) -> None:
+    workers = cpu_count()
+    print(f"{workers} worker process(es), NumPy: "
+          f"{'yes (vectorized slices)' if np is not None else 'no (Python loop per slice)'}\n")
+
+    with Pool(workers) as pool:
+        pool.map(cube, range(workers))           # start the workers first
+        named = strategies(pool, workers)
+
+        # ----------------------------------------------------------------------
+        # 1. SIZE SWEEP
+        # ----------------------------------------------------------------------
+        print(f"{'elements':>12}  " + '  '.join(f"{name:>22}" for name in named))
+
+        for exp in range(3, max_exp + 1):
+            n = 10 ** exp
+            data = array('q', (i % MAX_VALUE for i in range(n)))
+            expected = None
+
+            cells = []
+            for name, run in named.items():
+                if name == 'Pool.map, chunksize=1' and n > PER_ITEM_LIMIT:
+                    cells.append(f"{'(skipped)':>22}")
+                    continue
+
+                elapsed, result = timed(run, data)
+                if expected is None:
+                    expected = result
+                assert array('q', result) == expected
+
+                if name == 'single process loop':
+                    serial = elapsed
+                    cells.append(f"{elapsed * 1000:>12.1f}ms        ")
+                else:
+                    cells.append(f"{elapsed * 1000:>12.1f}ms {serial / elapsed:>6.2f}×")
+
+            print(f"{n:>12,}  " + '  '.join(cells))
+
+        # ----------------------------------------------------------------------
+        # 2. CHUNK SIZE AT THE LARGEST SIZE
+        # ----------------------------------------------------------------------
+        print(f"\nbatched_map, {n:,} elements, by chunk size")
+        print(f"{'chunk':>12} {'messages':>10} {'time':>10}")
+        for chunk_size in (100, 1_000, 10_000, 100_000, 1_000_000):
+            elapsed, result = timed(functools.partial(batched_map, vectorized=True),
+                                    pool, cube, data, chunk_size)
+            assert result == expected
+            print(f"{chunk_size:>12,} {math.ceil(n / chunk_size):>10,} "
+                  f"{elapsed * 1000:>8.1f}ms")
+
+        # ----------------------------------------------------------------------
+        # 3. WHERE DOES A POOL START TO PAY OFF?
+        # ----------------------------------------------------------------------
+        crossover(pool, workers, data)
+
+
+def crossover(pool, workers: int, data: array) -> None:
+    """
+    Models both sides as  time = fixed + n × per_element, measured on
+    this machine, and solves for the n where batched_map beats the
+    single-process loop if the pool had P cores:
+
+        n × serial  >  fixed + n × (serial / P + transfer)
+    """
+    n = len(data)
+
+    # Not vectorized: the model assumes the worker runs the SAME loop
+    batched_map_ = functools.partial(batched_map, workers=workers)
+
+    serial, _ = timed(lambda: array('q', map(cube, data)))
+    fixed, _ = timed(batched_map_, pool, cube, data[:1])
+    batched, _ = timed(batched_map_, pool, cube, data)
+
+    per_serial = serial / n
+    per_compute = per_serial                       # same loop, in the worker
+    per_transfer = max(0.0, (batched - fixed) / n - per_compute / workers)
+
+    print(f"\nmodel: serial {per_serial * 1e9:.0f} ns/element; "
+          f"pool fixed cost {fixed * 1000:.2f} ms + "
+          f"transfer {per_transfer * 1e9:.0f} ns/element")
+    print(f"{'cores':>6} {'batched_map beats the loop above':>34}")
+
+    for cores in (1, 2, 4, 8, 16):
+        gain = per_serial - per_compute / cores - per_transfer
+        where = f"~{fixed / gain:,.0f} elements" if gain > 0 else "never"
+        print(f"{cores:>6} {where:>34}")
+
+
+# ------------------------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('--max-exp', type=int, default=7,
+                        help="largest input is 10**MAX_EXP elements")
+    args = parser.parse_args()
+
+    benchmark(args.max_exp)
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (PYTHON 3.11, NO NUMPY, 1 CPU CORE)
+# ==============================================================================
+
+"""
+1 worker process(es), NumPy: no (Python loop per slice)
+
+    elements     single process loop   Pool.map, chunksize=1      Pool.map (default)             batched_map
+       1,000           0.2ms                  34.6ms   0.01×           0.8ms   0.29×           4.0ms   0.06×
+      10,000           2.4ms                 326.8ms   0.01×           3.3ms   0.71×           7.1ms   0.33×
+     100,000          26.3ms                3241.6ms   0.01×          51.6ms   0.51×          48.1ms   0.55×
+   1,000,000         200.3ms                       (skipped)         335.5ms   0.60×         254.2ms   0.79×
+  10,000,000        1989.9ms                       (skipped)        4068.7ms   0.49×        2602.7ms   0.76×
+
+batched_map, 10,000,000 elements, by chunk size
+       chunk   messages       time
+         100    100,000  10532.6ms
+       1,000     10,000   3759.3ms
+      10,000      1,000   4048.1ms
+     100,000        100   3138.2ms
+   1,000,000         10   2708.2ms
+
+model: serial 288 ns/element; pool fixed cost 0.56 ms + transfer 108 ns/element
+ cores   batched_map beats the loop above
+     1                              never
+     2                   ~15,551 elements
+     4                    ~5,174 elements
+     8                    ~3,880 elements
+    16                    ~3,448 elements
+"""
+
+"""
+WITH NUMPY (--max-exp 6): batched_map(..., vectorized=True) runs ONE `** 3`
+per slice; the other columns are unchanged
+
+1 worker process(es), NumPy: yes (vectorized slices)
+
+    elements     single process loop   Pool.map, chunksize=1      Pool.map (default)             batched_map
+       1,000           0.3ms                  42.9ms   0.01×           0.8ms   0.35×           3.6ms   0.08×
+      10,000           3.4ms                 480.7ms   0.01×           4.7ms   0.73×           4.2ms   0.81×
+     100,000          40.0ms                4725.4ms   0.01×          50.3ms   0.80×           7.2ms   5.56×
+   1,000,000         384.7ms                       (skipped)         548.8ms   0.70×          57.6ms   6.68×
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. ONE MESSAGE PER ITEM IS HOPELESS
+   - chunksize=1 costs ~33 µs per element — 100-150× slower than just
+     computing cube() in the parent. No number of cores fixes that.
+
+2. Pool.map's DEFAULT CHUNKING HELPS, BUT STILL PICKLES EVERY INT
+   - The items travel as lists of Python ints, the results come back as
+     lists: ~200 ns per element both ways, and a 10^7-element result list
+   - batched_map sends raw 8-byte slots: ~100 ns per element, and the
+     result is ONE compact array (80 MB instead of ~400 MB of list + int objects)
+
+3. FEWER, BIGGER MESSAGES — UP TO A POINT
+   - 100,000 slices of 100 elements: 10.5 s; 10 slices: 2.7 s
+   - Too few slices would leave cores idle at the end (load balance);
+     the default (~4 per worker) is a good middle ground
+
+4. THE CROSSOVER
+   - On this 1-core machine the pool NEVER wins: the worker does the same
+     work as the parent, plus the transfer
+   - With more cores the model puts the break-even at a few thousand to
+     ~15,000 elements; below that, stay in one process
+   - With NumPy (vectorized=True) batched_map is ~6× faster than the
+     Python loop even on ONE core — that is vectorization, not the pool:
+     the compute per element drops to ~1 ns, the transfer then dominates,
+     and vectorizing in ONE process is often the bigger win
+   - vectorized=True is opt-in: fn then receives an ndarray, and int64
+     arithmetic wraps silently where Python ints would grow
+
+5. THE GENERAL RULE
+   - Make each task's WORK large compared to its IPC: batch tiny tasks,
+     and send buffers (array, bytes, shared memory — see
+     08_shared_memory_image_processing.py) instead of object graphs
+"""
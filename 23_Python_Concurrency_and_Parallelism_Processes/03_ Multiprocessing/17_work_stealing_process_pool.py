@@ -0,0 +1,628 @@
+"""
+================================================================================
+WORK-STEALING PROCESS POOL — per-worker deques, recursive submit()
+================================================================================
+
+`03_processpoolexecutor_example.py` and `06_multiprocessing_pool_basics.py`
+use the stdlib pools. Both hand out work from ONE CENTRAL QUEUE, filled by
+the parent:
+
+    parent ──► [ t1 t2 t3 t4 ... ] ──► any idle worker
+
+That is fine when the parent can cut the work into many similar pieces up
+front. It breaks down when:
+✘ task durations are heavily SKEWED (a few chunks hold most of the work)
+✘ the work is only discovered WHILE RUNNING — divide and conquer, tree
+  search: a task wants to split itself and hand half to an idle worker.
+  A ProcessPoolExecutor worker cannot submit to its own pool at all.
+
+Work stealing (Cilk, Java's ForkJoinPool, Rayon, Go's scheduler):
+
+    worker 0 deque: [ big  half  quarter  eighth ]  ◀─ push / pop (newest)
+                      ▲
+                      └── an IDLE worker steals the OLDEST (= biggest) task
+
+✔ Every worker has its OWN deque; it pushes and pops subtasks at one end
+  (LIFO: cache-warm, depth-first, no contention with anybody)
+✔ Idle workers STEAL from the other end of a random victim's deque —
+  they take the oldest task, which in divide and conquer is the largest
+✔ future.result() inside a worker does not block: it RUNS other tasks
+  (its own or stolen ones) until the result is there
+
+The parent side is a regular concurrent.futures.Executor:
+
+    with WorkStealingExecutor(4) as executor:
+        total = executor.submit(solve, 0, 1_000_000).result()
+
+and inside a task:
+
+    def solve(lo, hi):
+        executor = current_executor()
+        left = executor.submit(solve, lo, mid)      # may be stolen
+        right = solve(mid, hi)
+        return left.result() + right
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Central queue vs per-worker deques
+2. The steal protocol: request → victim hands over its oldest task
+3. "Help while waiting": joining a subtask without deadlocking
+4. Routing results back to whoever submitted the task (parent or worker)
+5. Skewed divide and conquer: makespan and efficiency vs ProcessPoolExecutor
+
+================================================================================
+USAGE
+================================================================================
+
+python 17_work_stealing_process_pool.py                  # sleep-simulated work
+python 17_work_stealing_process_pool.py --cpu            # real CPU (needs cores)
+
+================================================================================
+PROTOCOL (ONE INBOX PER WORKER, READ BY A SERVICE THREAD)
+================================================================================
+
+('task', task)              parent → worker        a top-level task
+('steal', thief)            thief  → victim        "give me your oldest task"
+('stolen', task | None)     victim → thief         the answer
+('result', id, ok, value)   worker → submitter     a finished subtask
+('cancel',)                 parent → worker        drop queued tasks, fail joins
+None                                               stop
+
+task = (task_id, owner, fn, args, kwargs); owner is the worker index of
+the submitter, or PARENT. Top-level results go to the parent's queue.
+
+The service thread answers steal requests even while the worker's main
+thread is busy running a long task.
+
+================================================================================
+"""
+
+import time
+import random
+import argparse
+import itertools
+import threading
+import collections
+import multiprocessing
+import concurrent.futures
+
+
+PARENT = -1
+STEAL_BACKOFF = (0.0001, 0.005)     # after a failed steal: 0.1 ms, doubling up to 5 ms
+
+
+# ------------------------------------------------------------------------------
+# WORKER SIDE
+# ------------------------------------------------------------------------------
+_worker = None          # the _Worker of this process (None in the parent)
+
+
+def current_executor() -> concurrent.futures.Executor:
+    """
+    The executor to submit subtasks to, from inside a task.
+    """
+    if _worker is None:
+        raise RuntimeError("current_executor() only works inside a WorkStealingExecutor task")
+    return _worker
+
+
+class _HelpingFuture(concurrent.futures.Future):
+    """
+    A subtask's Future. result() keeps the worker busy with other tasks
+    until the value arrives, instead of blocking a whole process (which
+    with nested joins would quickly block EVERY process: deadlock).
+
+    A timeout is checked BETWEEN the tasks it helps with: one that is
+    already running is not interrupted, so the wait may overshoot.
+    """
+
+    def __init__(self, worker):
+        super().__init__()
+        self._worker = worker
+
+    def result(self, timeout=None):
+        self._worker.help_until(self, timeout)
+        return super().result(None if timeout is None else 0)
+
+    def exception(self, timeout=None):
+        self._worker.help_until(self, timeout)
+        return super().exception(None if timeout is None else 0)
+
+
+class _Worker(concurrent.futures.Executor):
+    """
+    One per worker process.
+
+    main thread    : runs tasks — own deque first (newest), then steals
+    service thread : reads the inbox; hands out tasks to thieves, stores
+                     stolen tasks, resolves subtask Futures
+    """
+
+    def __init__(self, index: int, inboxes: list, results):
+        self.index = index
+        self.inboxes = inboxes
+        self.results = results
+        self.victims = [i for i in range(len(inboxes)) if i != index]
+
+        self.deque = collections.deque()
+        self.cond = threading.Condition()
+        self.waiting = {}               # task_id → _HelpingFuture
+        self.ids = itertools.count()
+
+        self.stopping = False
+        self.cancelled = False          # shutdown(cancel_futures=True)
+        self.stealing = False           # a steal request is in flight
+        self.next_steal = 0.0
+        self.backoff = STEAL_BACKOFF[0]
+        self.stats = collections.Counter()
+
+    # --------------------------------------------------------------------------
+    # SUBMIT (FROM INSIDE A TASK)
+    # --------------------------------------------------------------------------
+    def submit(self, fn, /, *args, **kwargs) -> concurrent.futures.Future:
+        future = _HelpingFuture(self)
+        future.set_running_or_notify_cancel()
+        task_id = (self.index, next(self.ids))
+
+        with self.cond:
+            if self.cancelled:
+                future.set_exception(concurrent.futures.CancelledError("executor shut down"))
+                return future
+            self.waiting[task_id] = future
+            self.deque.append((task_id, self.index, fn, args, kwargs))
+        return future
+
+    # --------------------------------------------------------------------------
+    # MAIN THREAD
+    # --------------------------------------------------------------------------
+    def run(self) -> None:
+        while (task := self._next_task()) is not None:
+            self._execute(task)
+
+    def help_until(self, future, timeout: float | None = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not future.done():
+            task = self._next_task(until=future, deadline=deadline)
+            if task is None:
+                return
+            self._execute(task)
+
+    def _next_task(self, until=None, deadline: float | None = None):
+        """
+        Own newest task, else a stolen one. Returns None when `until` is
+        done or `deadline` passed (or, without `until`, when the pool stops).
+        """
+        while True:
+            with self.cond:
+                while True:
+                    if until is not None and until.done():
+                        return None
+                    if self.deque:
+                        return self.deque.pop()
+                    if self.stopping and until is None:
+                        return None
+
+                    now = time.monotonic()
+                    if deadline is not None and now >= deadline:
+                        return None
+                    if self.victims and not self.stealing and now >= self.next_steal:
+                        self.stealing = True
+                        victim = random.choice(self.victims)
+                        break
+
+                    # Woken by: a new task, a steal answer, a result, stop
+                    timeouts = [] if self.stealing or not self.victims else [self.next_steal - now]
+                    if deadline is not None:
+                        timeouts.append(deadline - now)
+                    self.cond.wait(min(timeouts, default=None))
+
+            # Never send while holding the lock (the answer needs it)
+            self.stats['steal attempts'] += 1
+            self.inboxes[victim].put(('steal', self.index))
+
+    def _execute(self, task) -> None:
+        task_id, owner, fn, args, kwargs = task
+        self.stats['executed'] += 1
+
+        try:
+            message = ('result', task_id, True, fn(*args, **kwargs))
+        except BaseException as exc:
+            message = ('result', task_id, False, exc)
+
+        if owner == self.index:
+            self._resolve(message)
+            return
+        if self.cancelled and owner != PARENT:
+            return      # the owner got 'cancel' too: nobody waits for this any more
+
+        queue = self.results if owner == PARENT else self.inboxes[owner]
+        try:
+            queue.put(message)
+        except Exception as exc:        # result or exception not picklable
+            queue.put(('result', task_id, False, RuntimeError(f"cannot send result: {exc!r}")))
+
+    # --------------------------------------------------------------------------
+    # SERVICE THREAD
+    # --------------------------------------------------------------------------
+    def serve(self, inbox) -> None:
+        while (message := inbox.get()) is not None:
+            kind = message[0]
+
+            if kind == 'task':
+                with self.cond:
+                    self.deque.append(message[1])
+                    self.cond.notify_all()
+
+            elif kind == 'steal':
+                # Oldest task = the end of the deque the owner is NOT using
+                with self.cond:
+                    task = self.deque.popleft() if self.deque else None
+                try:
+                    self.inboxes[message[1]].put(('stolen', task))
+                except Exception:       # a subtask with unpicklable args: keep it
+                    with self.cond:
+                        self.deque.appendleft(task)
+                    self.inboxes[message[1]].put(('stolen', None))
+                else:
+                    if task is not None:
+                        self.stats['given away'] += 1
+
+            elif kind == 'stolen':
+                with self.cond:
+                    self.stealing = False
+                    if message[1] is not None:
+                        self.stats['stolen'] += 1
+                        self.deque.append(message[1])
+                        self.backoff = STEAL_BACKOFF[0]
+                        self.next_steal = 0.0
+                    else:
+                        self.next_steal = time.monotonic() + self.backoff
+                        self.backoff = min(self.backoff * 2, STEAL_BACKOFF[1])
+                    self.cond.notify_all()
+
+            elif kind == 'result':
+                self._resolve(message)
+
+            elif kind == 'cancel':
+                # Drop every queued task AND fail every join in progress:
+                # a subtask stolen by another worker may never report back
+                # once the service threads stop, and its joiner would wait
+                # forever. Running tasks end at their next result() call.
+                with self.cond:
+                    self.cancelled = True
+                    self.stats['cancelled'] += len(self.deque)
+                    self.deque.clear()
+                    waiting, self.waiting = self.waiting, {}
+                for future in waiting.values():
+                    future.set_exception(concurrent.futures.CancelledError("executor shut down"))
+                with self.cond:
+                    self.cond.notify_all()
+
+        with self.cond:
+            self.stopping = True
+            self.cond.notify_all()
+
+    def _resolve(self, message) -> None:
+        _, task_id, ok, value = message
+        with self.cond:
+            future = self.waiting.pop(task_id, None)
+        if future is None:              # failed by 'cancel' already
+            return
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+        with self.cond:
+            self.cond.notify_all()          # wake a help_until() waiting for it
+
+
+def _worker_main(index: int, inboxes: list, results) -> None:
+    global _worker
+    _worker = _Worker(index, inboxes, results)
+
+    threading.Thread(target=_worker.serve, args=(inboxes[index],), daemon=True).start()
+    _worker.run()
+
+    results.put(('stats', index, dict(_worker.stats)))
+
+
+# ------------------------------------------------------------------------------
+# PARENT SIDE: THE EXECUTOR
+# ------------------------------------------------------------------------------
+class WorkStealingExecutor(concurrent.futures.Executor):
+    """
+    concurrent.futures.Executor backed by work-stealing worker processes.
+
+    Top-level tasks are dealt round-robin to the workers' deques; from
+    there, stealing balances the load.
+
+    LIMITATIONS:
+    ------------
+    - Futures start out RUNNING, so Future.cancel() does nothing;
+      shutdown(cancel_futures=True) drops every queued task, fails every
+      unfinished Future with CancelledError, and makes running tasks'
+      subtask joins raise CancelledError too
+    - Subtasks must be joined (result()) before their parent task returns
+    - No recovery from a crashed worker (see 18_... for that)
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self._max_workers = max_workers or multiprocessing.cpu_count()
+        ctx = multiprocessing.get_context()
+
+        self._inboxes = [ctx.SimpleQueue() for _ in range(self._max_workers)]
+        self._results = ctx.SimpleQueue()
+        self._workers = [
+            ctx.Process(target=_worker_main, args=(i, self._inboxes, self._results), daemon=True)
+            for i in range(self._max_workers)
+        ]
+        for process in self._workers:
+            process.start()
+
+        self._futures = {}
+        self._ids = itertools.count()
+        self._next_worker = itertools.cycle(range(self._max_workers))
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+        self.stats = {}         # worker index → counters, filled at shutdown
+
+        self._reader = threading.Thread(target=self._read_results, daemon=True)
+        self._reader.start()
+
+    def submit(self, fn, /, *args, **kwargs) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            task_id = (PARENT, next(self._ids))
+            self._futures[task_id] = future
+            worker = next(self._next_worker)
+
+        try:
+            self._inboxes[worker].put(('task', (task_id, PARENT, fn, args, kwargs)))
+        except Exception:               # not picklable: nothing was sent
+            with self._lock:
+                del self._futures[task_id]
+            raise
+        return future
+
+    def _read_results(self) -> None:
+        while len(self.stats) < self._max_workers:
+            message = self._results.get()
+
+            if message[0] == 'stats':
+                self.stats[message[1]] = message[2]
+                continue
+
+            _, task_id, ok, value = message
+            with self._lock:
+                future = self._futures.pop(task_id, None)
+            if future is None:          # cancelled by shutdown()
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._shutdown = True
+            pending = list(self._futures.values())
+            if cancel_futures:
+                self._futures.clear()
+
+        if cancel_futures:
+            for inbox in self._inboxes:
+                inbox.put(('cancel',))
+            for future in pending:
+                future.set_exception(concurrent.futures.CancelledError(
+                    "executor shut down before the task finished"))
+
+        if wait:
+            concurrent.futures.wait(pending)
+
+        for inbox in self._inboxes:
+            inbox.put(None)
+
+        if wait:
+            for process in self._workers:
+                process.join()
+            self._reader.join()
+
+
+# ------------------------------------------------------------------------------
+# WORKLOAD: SKEWED DIVIDE AND CONQUER
+# ------------------------------------------------------------------------------
+# Sum over range(ITEMS); each item costs ITEM_COST, except a "hot" 5% of
+# the range that costs HOT_FACTOR× more — ~2/3 of all work sits there,
+# and only running the tasks reveals where.
+# ------------------------------------------------------------------------------
+ITEMS = 200_000
+GRAIN = 1_000                       # leaf size: below this, no more splitting
+ITEM_COST = 0.00001                 # 10 µs
+HOT = (60_000, 70_000)
+HOT_FACTOR = 40
+
+
+def leaf_cost(lo: int, hi: int) -> float:
+    hot = max(0, min(hi, HOT[1]) - max(lo, HOT[0]))
+    return ITEM_COST * ((hi - lo - hot) + hot * HOT_FACTOR)
+
+
+def work(seconds: float, cpu: bool) -> None:
+    """
+    cpu=False: sleep-simulated CPU work (like 02_multiprocessing_loop_
+    speedup.py), so the parallel schedule shows even on 1 CPU core.
+    """
+    if not cpu:
+        time.sleep(seconds)
+        return
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def solve_serial(lo: int, hi: int, cpu: bool) -> int:
+    """
+    One plain task over [lo, hi): what a ProcessPoolExecutor chunk runs.
+    """
+    total = 0
+    for start in range(lo, hi, GRAIN):
+        end = min(start + GRAIN, hi)
+        work(leaf_cost(start, end), cpu)
+        total += sum(range(start, end))
+    return total
+
+
+def solve(lo: int, hi: int, cpu: bool) -> int:
+    """
+    Recursive divide and conquer on the work-stealing pool.
+    """
+    if hi - lo <= GRAIN:
+        return solve_serial(lo, hi, cpu)
+
+    mid = (lo + hi) // 2
+    left = current_executor().submit(solve, lo, mid, cpu)     # stealable
+    right = solve(mid, hi, cpu)                               # keep going
+    return left.result() + right
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK
+# ------------------------------------------------------------------------------
+def chunks(n: int) -> list:
+    bounds = [ITEMS * i // n for i in range(n + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def run_process_pool(workers: int, n_chunks: int, cpu: bool) -> tuple:
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        executor.submit(int).result()            # workers up before timing
+        start = time.perf_counter()
+        futures = [executor.submit(solve_serial, lo, hi, cpu) for lo, hi in chunks(n_chunks)]
+        total = sum(f.result() for f in futures)
+        return time.perf_counter() - start, total, None
+
+
+def run_work_stealing(workers: int, cpu: bool) -> tuple:
+    with WorkStealingExecutor(workers) as executor:
+        executor.submit(int).result()
+        start = time.perf_counter()
+        total = executor.submit(solve, 0, ITEMS, cpu).result()
+        elapsed = time.perf_counter() - start
+    return elapsed, total, executor.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--cpu', action='store_true',
+                        help="burn real CPU instead of sleeping (needs ≥ --workers cores)")
+    args = parser.parse_args()
+
+    total_work = sum(leaf_cost(lo, hi) for lo, hi in chunks(ITEMS // GRAIN))
+    expected = sum(range(ITEMS))
+    print(f"{ITEMS:,} items, leaves of {GRAIN:,}, 5% of the range {HOT_FACTOR}× more "
+          f"expensive: {total_work:.1f}s of {'CPU' if args.cpu else 'sleep-simulated'} "
+          f"work, {args.workers} workers (ideal: {total_work / args.workers:.2f}s)\n")
+    print(f"{'strategy':<44} {'time':>7} {'efficiency':>11}")
+
+    runs = [(f"ProcessPoolExecutor, {n} chunks",
+             lambda n=n: run_process_pool(args.workers, n, args.cpu))
+            for n in (args.workers, args.workers * 4, ITEMS // GRAIN)]
+    runs.append(("WorkStealingExecutor, recursive solve()",
+                 lambda: run_work_stealing(args.workers, args.cpu)))
+
+    for name, run in runs:
+        elapsed, total, stats = run()
+        assert total == expected
+        efficiency = total_work / (args.workers * elapsed)
+        print(f"{name:<44} {elapsed:>6.2f}s {efficiency:>10.0%}")
+
+    print(f"\n{'worker':>6} {'executed':>9} {'stolen':>7} {'given away':>11} {'steal attempts':>15}")
+    for index, counters in sorted(stats.items()):
+        print(f"{index:>6} {counters.get('executed', 0):>9} {counters.get('stolen', 0):>7} "
+              f"{counters.get('given away', 0):>11} {counters.get('steal attempts', 0):>15}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (1 CPU CORE)
+# ==============================================================================
+
+"""
+$ python 17_work_stealing_process_pool.py
+200,000 items, leaves of 1,000, 5% of the range 40× more expensive: 5.9s of sleep-simulated work, 4 workers (ideal: 1.47s)
+
+strategy                                        time  efficiency
+ProcessPoolExecutor, 4 chunks                  4.41s        33%
+ProcessPoolExecutor, 16 chunks                 3.18s        46%
+ProcessPoolExecutor, 200 chunks                1.49s        99%
+WorkStealingExecutor, recursive solve()        1.52s        97%
+
+worker  executed  stolen  given away  steal attempts
+     0        68       3           4              23
+     1        71       3           4              17
+     2        43       4           5              15
+     3        75       5           2              11
+
+$ python 17_work_stealing_process_pool.py --cpu --workers 1
+200,000 items, leaves of 1,000, 5% of the range 40× more expensive: 5.9s of CPU work, 1 workers (ideal: 5.90s)
+
+strategy                                        time  efficiency
+ProcessPoolExecutor, 1 chunks                  5.97s        99%
+ProcessPoolExecutor, 4 chunks                  5.99s        98%
+ProcessPoolExecutor, 200 chunks                6.04s        98%
+WorkStealingExecutor, recursive solve()        5.98s        99%
+
+worker  executed  stolen  given away  steal attempts
+     0       257       0           0               0
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. COARSE CHUNKS + SKEW = A LONG TAIL
+   - 4 equal chunks: the one containing the hot region runs for 4.4 s
+     while the other workers finished after ~0.5 s (33% efficiency)
+   - 16 chunks is better, but one chunk still holds 3 s of work
+
+2. THE CENTRAL QUEUE IS FINE — IF THE PARENT CAN PRE-SPLIT FINELY
+   - 200 leaf-sized chunks balance just as well as work stealing (99%)
+   - That needs the parent to know the right grain up front and to
+     create every task itself. Recursive algorithms (quicksort, tree
+     search, adaptive integration) only find their split points while
+     running — there a ProcessPoolExecutor cannot help
+
+3. WORK STEALING BALANCES WITHOUT KNOWING ANYTHING
+   - ONE top-level task; it splits itself, and idle workers take the
+     oldest (= biggest) halves: ~15 steals in total are enough
+   - 97% efficiency; the hot region was never known in advance
+
+4. HELP-WHILE-WAITING PREVENTS DEADLOCK
+   - Every solve() waits for its left half. With blocking joins, as
+     soon as every worker waits on a subtask, nobody is left to run them
+   - _HelpingFuture.result() runs other tasks in the meantime
+
+5. THE OVERHEAD IS SMALL
+   - One worker, real CPU: 257 tasks, the same 6.0 s as a single chunk.
+     Push/pop are local deque operations; only steals and cross-worker
+     results cross a pipe
+   - Failed steals back off (0.1 → 5 ms), so idle workers don't spin
+
+6. WHAT THIS VERSION DOES NOT DO
+   - No per-task cancellation (only at shutdown), no crash recovery
+     (see 18_...), and a worker that joins a stolen subtask may be busy
+     elsewhere when it finishes ("leapfrogging" in real schedulers avoids that)
+"""
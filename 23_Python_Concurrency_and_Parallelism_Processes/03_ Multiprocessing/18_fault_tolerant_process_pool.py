@@ -0,0 +1,535 @@
+"""
+================================================================================
+FAULT-TOLERANT PROCESS POOL — deadlines, retries, worker recycling
+================================================================================
+
+`04_processpoolexecutor_map_example.py` runs a batch with executor.map().
+That is fine until ONE task misbehaves:
+
+✘ it HANGS      → map() waits forever; the executor cannot kill a worker
+✘ it SEGFAULTS  → the pool is "broken": EVERY pending task fails with
+                  BrokenProcessPool, finished or not, and the pool is useless
+✘ it LEAKS      → the worker grows until the machine swaps or OOM-kills it
+
+For a long batch job, one bad input should cost ONE task, not the batch.
+
+FaultTolerantPool runs ONE task at a time per worker and watches each one:
+
+    ┌──────── scheduler thread ────────┐
+    │ deadline passed?  → kill worker, │      worker 0  [task 17]  1.2 s ✘
+    │                     retry task   │      worker 1  [task 18]  0.1 s
+    │ worker died?      → replace it,  │      worker 2  (recycled: 50 tasks)
+    │                     retry task   │      worker 3  [task 20]  0.3 s
+    │ N tasks / M MB?   → recycle it   │
+    └──────────────────────────────────┘
+
+✔ Per-task DEADLINES: a stuck worker is killed and replaced
+✔ RETRIES with exponential backoff — the schedule from
+  `12_Python_Problem_Solving/Q20.py` (1 s, doubling, 5 retries)
+✔ A crash only affects the task that was running in that worker
+✔ RECYCLING after N tasks or M MB of RSS contains slow leaks
+  (like Pool(maxtasksperchild=N), plus a memory limit)
+
+Retries are only safe for IDEMPOTENT tasks (running one twice does no
+harm). Pass retries=0 for everything else. Exceptions RAISED by a task are
+never retried: they are returned to the caller, as with any executor.
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Why a shared ProcessPoolExecutor cannot survive a hung or crashed task
+2. One task per worker: knowing WHAT each process is doing, and since when
+3. Waiting on pipes AND process sentinels with multiprocessing.connection.wait
+4. Retries with exponential backoff (and which tasks may be retried)
+5. Measuring GOODPUT: successful results per second under injected faults
+
+================================================================================
+"""
+
+import os
+import time
+import heapq
+import random
+import signal
+import itertools
+import threading
+import collections
+import multiprocessing
+import concurrent.futures
+import multiprocessing.connection
+from dataclasses import dataclass
+
+
+# ------------------------------------------------------------------------------
+# ERRORS & BACKOFF
+# ------------------------------------------------------------------------------
+class TaskTimeoutError(TimeoutError):
+    """The task ran past its deadline; its worker was killed."""
+
+
+class WorkerDiedError(RuntimeError):
+    """The worker process died (segfault, os._exit, OOM kill...) mid-task."""
+
+
+def backoff_schedule(initial: float = 1.0, max_retries: int = 5) -> list:
+    """
+    The schedule of 12_Python_Problem_Solving/Q20.py:
+
+        wait_time = 1; ... wait_time *= 2    →    1, 2, 4, 8, 16 seconds
+    """
+    return [initial * 2 ** attempt for attempt in range(max_retries)]
+
+
+# ------------------------------------------------------------------------------
+# WORKER PROCESS
+# ------------------------------------------------------------------------------
+def _rss_mb() -> float:
+    """
+    CURRENT resident memory of this process (Linux; 0 elsewhere,
+    which disables RSS-based recycling).
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def _worker_main(conn) -> None:
+    """
+    recv (fn, args, kwargs) → send (ok, value, rss_mb); None → exit.
+    """
+    while (task := conn.recv()) is not None:
+        fn, args, kwargs = task
+        try:
+            message = (True, fn(*args, **kwargs))
+        except BaseException as exc:
+            message = (False, exc)
+
+        try:
+            conn.send((*message, _rss_mb()))
+        except Exception as exc:        # result or exception not picklable
+            conn.send((False, RuntimeError(f"cannot send result: {exc!r}"), _rss_mb()))
+
+
+# ------------------------------------------------------------------------------
+# BOOKKEEPING
+# ------------------------------------------------------------------------------
+@dataclass
+class _Task:
+    fn: object
+    args: tuple
+    kwargs: dict
+    future: concurrent.futures.Future
+    timeout: float | None
+    delays: list                        # remaining backoff delays (= retries left)
+    attempts: int = 0
+
+
+@dataclass
+class _WorkerHandle:
+    process: multiprocessing.Process
+    conn: multiprocessing.connection.Connection
+    task: _Task | None = None
+    deadline: float | None = None
+    tasks_done: int = 0
+
+
+# ------------------------------------------------------------------------------
+# THE POOL
+# ------------------------------------------------------------------------------
+class FaultTolerantPool(concurrent.futures.Executor):
+    """
+    Arguments:
+    ----------
+    max_workers   : worker processes (default: CPU count)
+    timeout       : default per-task deadline in seconds (None: no limit)
+    max_retries   : default retries after a timeout or worker death
+    backoff       : first retry delay; doubles per retry (Q20.py)
+    max_tasks     : recycle a worker after this many tasks (None: never)
+    max_rss_mb    : recycle a worker once its RSS exceeds this (None: never)
+    mp_context    : default forkserver — workers are (re)started from the
+                    scheduler THREAD, and forking a threaded process is unsafe
+                    (see 15_forkserver_preload_launcher.py)
+
+    stats : collections.Counter of retries, timeouts, crashes, recycles...
+    """
+
+    def __init__(self, max_workers: int | None = None, timeout: float | None = None,
+                 max_retries: int = 5, backoff: float = 1.0,
+                 max_tasks: int | None = None, max_rss_mb: float | None = None,
+                 mp_context=None):
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_tasks = max_tasks
+        self.max_rss_mb = max_rss_mb
+        self.stats = collections.Counter()
+
+        if mp_context is None:
+            methods = multiprocessing.get_all_start_methods()
+            mp_context = multiprocessing.get_context(
+                'forkserver' if 'forkserver' in methods else 'spawn')
+        self._ctx = mp_context
+
+        self._workers = []
+        self._pending = collections.deque()     # ready to run
+        self._delayed = []                      # heap: (ready at, seq, task)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._cancel_futures = False
+
+        # Self-pipe: submit() / shutdown() wake the scheduler out of wait()
+        self._wakeup_r, self._wakeup_w = multiprocessing.Pipe(duplex=False)
+
+        self._scheduler = threading.Thread(target=self._run, daemon=True)
+        self._scheduler.start()
+
+    # --------------------------------------------------------------------------
+    # PUBLIC API
+    # --------------------------------------------------------------------------
+    def submit(self, fn, /, *args, **kwargs) -> concurrent.futures.Future:
+        return self.submit_with(fn, args, kwargs)
+
+    def submit_with(self, fn, args: tuple = (), kwargs: dict | None = None, *,
+                    timeout: float | None = ..., retries: int | None = None
+                    ) -> concurrent.futures.Future:
+        """
+        submit() with per-task overrides:
+            timeout : seconds, or None for no deadline (default: the pool's)
+            retries : 0 for tasks that must not run twice (default: the pool's)
+        """
+        task = _Task(
+            fn, args, kwargs or {}, concurrent.futures.Future(),
+            timeout=self.timeout if timeout is ... else timeout,
+            delays=backoff_schedule(self.backoff,
+                                    self.max_retries if retries is None else retries),
+        )
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._pending.append(task)
+        self._wakeup_w.send(None)
+        return task.future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._shutdown = True
+            self._cancel_futures = cancel_futures
+            if cancel_futures:
+                for task in self._pending:
+                    task.future.cancel()
+        self._wakeup_w.send(None)
+
+        if wait:
+            self._scheduler.join()
+
+    # --------------------------------------------------------------------------
+    # SCHEDULER THREAD
+    # --------------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                if self._cancel_futures:
+                    # Waiting for a retry: already RUNNING, so cancel() would
+                    # be refused — fail them with CancelledError instead
+                    while self._delayed:
+                        task = heapq.heappop(self._delayed)[2]
+                        task.future.set_exception(
+                            concurrent.futures.CancelledError("pool shut down before the retry"))
+
+                while self._delayed and self._delayed[0][0] <= now:
+                    self._pending.append(heapq.heappop(self._delayed)[2])
+
+                busy = any(handle.task for handle in self._workers)
+                if self._shutdown and not (self._pending or self._delayed or busy):
+                    break
+
+                self._assign()
+
+            self._wait_and_handle()
+
+        for handle in list(self._workers):
+            self._retire(handle)
+
+    def _assign(self) -> None:
+        """
+        Hands pending tasks to idle workers, starting workers as needed.
+        """
+        while self._pending:
+            idle = next((h for h in self._workers if h.task is None), None)
+            if idle is None:
+                if len(self._workers) >= self.max_workers:
+                    return
+                idle = self._start_worker()
+
+            task = self._pending.popleft()
+            if task.attempts == 0 and not task.future.set_running_or_notify_cancel():
+                continue                        # cancelled while pending
+
+            task.attempts += 1
+            idle.task = task
+            idle.deadline = time.monotonic() + task.timeout if task.timeout else None
+            try:
+                idle.conn.send((task.fn, task.args, task.kwargs))
+            except OSError:
+                pass        # the worker just died: its sentinel fires, task is retried
+            except Exception as exc:
+                # Not picklable: send() pickles BEFORE writing, so nothing
+                # reached the worker — fail this task, keep the worker
+                idle.task = idle.deadline = None
+                self.stats['not picklable'] += 1
+                task.future.set_exception(exc)
+
+    def _wait_and_handle(self) -> None:
+        busy = [handle for handle in self._workers if handle.task]
+        wake_times = [handle.deadline for handle in busy if handle.deadline]
+        if self._delayed:
+            wake_times.append(self._delayed[0][0])
+
+        timeout = max(0.0, min(wake_times) - time.monotonic()) if wake_times else None
+        ready = multiprocessing.connection.wait(
+            [self._wakeup_r]
+            + [handle.conn for handle in busy]
+            + [handle.process.sentinel for handle in self._workers],
+            timeout,
+        )
+
+        while self._wakeup_r.poll():
+            self._wakeup_r.recv()
+
+        now = time.monotonic()
+        for handle in busy:
+            if handle.conn in ready:
+                try:
+                    ok, value, rss_mb = handle.conn.recv()
+                except (EOFError, OSError):     # died while sending
+                    self.stats['crashed'] += 1
+                    self._replace(handle, WorkerDiedError("worker died while sending its result"))
+                    continue
+                self._finish(handle, ok, value, rss_mb)
+
+            elif handle.process.sentinel in ready:
+                handle.process.join()
+                self.stats['crashed'] += 1
+                self._replace(handle, WorkerDiedError(
+                    f"worker died (exit code {handle.process.exitcode})"))
+
+            elif handle.deadline is not None and now >= handle.deadline:
+                handle.process.kill()
+                self.stats['killed (timeout)'] += 1
+                self._replace(handle, TaskTimeoutError(
+                    f"task exceeded its {handle.task.timeout}s deadline"))
+
+        # An IDLE worker that died (e.g. killed from outside): just drop it
+        for handle in [h for h in self._workers if h.task is None]:
+            if handle.process.sentinel in ready:
+                handle.process.join()
+                handle.conn.close()
+                self._workers.remove(handle)
+
+    # --------------------------------------------------------------------------
+    # OUTCOMES
+    # --------------------------------------------------------------------------
+    def _finish(self, handle: _WorkerHandle, ok: bool, value, rss_mb: float) -> None:
+        task, handle.task = handle.task, None
+        handle.tasks_done += 1
+
+        # The task's own exception is a RESULT, not a fault: no retry
+        if ok:
+            task.future.set_result(value)
+        else:
+            task.future.set_exception(value)
+
+        if self.max_tasks and handle.tasks_done >= self.max_tasks:
+            self.stats['recycled (tasks)'] += 1
+            self._retire(handle)
+        elif self.max_rss_mb and rss_mb >= self.max_rss_mb:
+            self.stats['recycled (memory)'] += 1
+            self._retire(handle)
+
+    def _replace(self, handle: _WorkerHandle, error: Exception) -> None:
+        """
+        Drops a dead / killed worker (a new one is started on demand)
+        and retries its task after the next backoff delay.
+        """
+        handle.process.join()
+        handle.conn.close()
+        self._workers.remove(handle)
+
+        task = handle.task
+        if task.delays:
+            self.stats['retries'] += 1
+            ready_at = time.monotonic() + task.delays.pop(0)
+            heapq.heappush(self._delayed, (ready_at, next(self._seq), task))
+        else:
+            self.stats['failed'] += 1
+            task.future.set_exception(error)
+
+    # --------------------------------------------------------------------------
+    # WORKER LIFECYCLE
+    # --------------------------------------------------------------------------
+    def _start_worker(self) -> _WorkerHandle:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+
+        handle = _WorkerHandle(process, parent_conn)
+        self._workers.append(handle)
+        self.stats['workers started'] += 1
+        return handle
+
+    def _retire(self, handle: _WorkerHandle) -> None:
+        try:
+            handle.conn.send(None)
+        except OSError:
+            pass
+        handle.process.join(timeout=5)
+        if handle.process.is_alive():
+            handle.process.kill()
+            handle.process.join()
+        handle.conn.close()
+        self._workers.remove(handle)
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK: A BATCH WITH INJECTED FAULTS
+# ------------------------------------------------------------------------------
+TASKS = 200
+WORK = 0.05                         # seconds of (sleep-simulated) work per task
+LEAK_MB = 20
+FAULTS = {'hang': 0.02, 'crash': 0.02, 'leak': 0.05}     # per ATTEMPT
+NO_FAULTS = {'hang': 0.0, 'crash': 0.0, 'leak': 0.0}
+
+_leaked = []
+
+
+def flaky_task(i: int, faults: dict) -> int:
+    """
+    An idempotent task that, on any attempt, may hang, segfault,
+    or leak LEAK_MB that is never freed.
+    """
+    roll = random.random()
+
+    if roll < faults['hang']:
+        time.sleep(3600)
+    elif roll < faults['hang'] + faults['crash']:
+        os.kill(os.getpid(), signal.SIGSEGV)
+    elif roll < faults['hang'] + faults['crash'] + faults['leak']:
+        _leaked.append(b'x' * (LEAK_MB * 2**20))       # really touches the pages
+
+    time.sleep(WORK)
+    return i * i
+
+
+def run_process_pool(workers: int, faults: dict, budget: float) -> tuple:
+    """
+    04_processpoolexecutor_map_example.py style. We give up after
+    `budget` seconds: a hung task would otherwise block forever.
+    """
+    start = time.perf_counter()
+    executor = concurrent.futures.ProcessPoolExecutor(workers)
+    futures = [executor.submit(flaky_task, i, faults) for i in range(TASKS)]
+    concurrent.futures.wait(futures, timeout=budget)
+    elapsed = time.perf_counter() - start
+
+    ok = sum(1 for f in futures if f.done() and not f.cancelled() and f.exception() is None)
+    broken = sum(1 for f in futures if f.done() and isinstance(
+        f.exception(), concurrent.futures.process.BrokenProcessPool))
+
+    # Hung workers never exit by themselves
+    for process in list((executor._processes or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+    return ok, elapsed, f"{broken} BrokenProcessPool"
+
+
+def run_fault_tolerant(workers: int, faults: dict) -> tuple:
+    start = time.perf_counter()
+    with FaultTolerantPool(workers, timeout=1.0, backoff=0.05,
+                           max_tasks=50, max_rss_mb=100) as pool:
+        futures = [pool.submit(flaky_task, i, faults) for i in range(TASKS)]
+        results = [f.exception() is None and f.result() == i * i
+                   for i, f in enumerate(futures)]
+    elapsed = time.perf_counter() - start
+
+    stats = ', '.join(f"{k} {v}" for k, v in sorted(pool.stats.items()))
+    return sum(results), elapsed, stats
+
+
+def main():
+    workers = 4
+    ideal = TASKS * WORK / workers
+    print(f"{TASKS} tasks × {WORK * 1000:.0f} ms, {workers} workers (ideal {ideal:.1f}s); "
+          f"faults per attempt: {FAULTS['hang']:.0%} hang, {FAULTS['crash']:.0%} segfault, "
+          f"{FAULTS['leak']:.0%} leak {LEAK_MB} MB\n")
+    print(f"{'pool':<22} {'faults':<7} {'ok':>8} {'time':>7} {'goodput':>12}   notes")
+
+    for label, faults in (('none', NO_FAULTS), ('on', FAULTS)):
+        for name, run in (
+            ('ProcessPoolExecutor', lambda: run_process_pool(workers, faults, budget=10)),
+            ('FaultTolerantPool', lambda: run_fault_tolerant(workers, faults)),
+        ):
+            ok, elapsed, notes = run()
+            print(f"{name:<22} {label:<7} {ok:>4}/{TASKS} {elapsed:>6.2f}s "
+                  f"{ok / elapsed:>7.1f} ok/s   {notes}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (1 CPU CORE; BACKOFF SCALED DOWN TO 0.05 s FOR THE DEMO)
+# ==============================================================================
+
+"""
+200 tasks × 50 ms, 4 workers (ideal 2.5s); faults per attempt: 2% hang, 2% segfault, 5% leak 20 MB
+
+pool                   faults        ok    time      goodput   notes
+ProcessPoolExecutor    none     200/200   2.54s    78.9 ok/s   0 BrokenProcessPool
+FaultTolerantPool      none     200/200   2.84s    70.5 ok/s   recycled (tasks) 4, workers started 4
+ProcessPoolExecutor    on        24/200   0.34s    70.2 ok/s   176 BrokenProcessPool
+FaultTolerantPool      on       200/200   4.49s    44.6 ok/s   crashed 3, killed (timeout) 4, recycled (memory) 1, retries 7, workers started 11
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. ONE SEGFAULT LOSES THE WHOLE BATCH
+   - ProcessPoolExecutor: the first crash broke the pool after 24 tasks;
+     the other 176 all failed with BrokenProcessPool. Its goodput LOOKS
+     fine only because it stopped early — the batch has to be re-run
+   - Had a hang come first, map() would have waited forever
+
+2. FAULT-TOLERANT: EVERY TASK FINISHED
+   - 4 hung attempts were killed at their 1 s deadline, 3 segfaults
+     cost one task attempt each; all 7 succeeded on retry
+   - Goodput fell from 70 to 45 ok/s: that is the price of the faults
+     (4 × 1 s deadlines + restarts), not of the mechanism
+
+3. THE OVERHEAD WITHOUT FAULTS IS SMALL
+   - ~10%: one round trip per task instead of batched queues, plus
+     4 recycled workers (max_tasks=50)
+   - Workers come from a fork server, so a replacement costs
+     milliseconds, not an interpreter start
+
+4. RECYCLING CONTAINS LEAKS
+   - Leaking tasks push a worker past max_rss_mb → it is retired after
+     its current task and a fresh one takes over; RSS is read from
+     /proc/self/statm after every task
+
+5. CHOOSING THE KNOBS
+   - timeout     : well above the slowest healthy task (p99.9 × 2–3)
+   - backoff     : Q20.py's 1, 2, 4, 8, 16 s suits flaky dependencies;
+                   for pure CPU tasks a short delay is enough
+   - retries=0   : for anything that is not idempotent
+"""
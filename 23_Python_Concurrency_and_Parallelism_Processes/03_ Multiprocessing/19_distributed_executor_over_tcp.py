@@ -0,0 +1,672 @@
+"""
+================================================================================
+DISTRIBUTED EXECUTOR — ProcessPoolExecutor, but the workers are other machines
+================================================================================
+
+Everything in `03_ Multiprocessing` runs on ONE host: at most cpu_count()
+processes work on `process_image`. To use several machines you do not need a
+big framework — a coordinator, an agent per machine and a tiny protocol:
+
+                         ┌──────────────── coordinator ────────────────┐
+    executor.submit() ──►│ queue → scheduler (locality) → dispatch     │
+                         │ heartbeat monitor: silent agent = dead,     │
+                         │                    its tasks are re-queued  │
+                         └───────┬──────────────┬───────────────┬──────┘
+                             TCP │          TCP │           TCP │
+                         ┌───────▼──┐    ┌──────▼───┐    ┌──────▼───┐
+                         │ agent A  │    │ agent B  │    │ agent C  │
+                         │ N slots  │    │ N slots  │    │ N slots  │
+                         │ (a local │    │          │    │          │
+                         │  process │    │          │    │          │
+                         │  pool)   │    │          │    │          │
+                         └──────────┘    └──────────┘    └──────────┘
+
+✔ DistributedExecutor is a concurrent.futures.Executor: submit / map /
+  with-block, Futures as usual
+✔ LOCALITY-AWARE scheduling: submit_with(..., locality=key) prefers the
+  agent that already has `key` (e.g. the source image, fetched once);
+  if that agent stays busy for `locality_wait` seconds, any agent may run
+  it ("delay scheduling")
+✔ HEARTBEATS: an agent that is silent for `heartbeat_timeout` seconds —
+  crashed, frozen, or cut off by the network — is declared dead and its
+  running tasks go back to the queue
+
+================================================================================
+WHAT THIS EXAMPLE TEACHES
+================================================================================
+
+1. Length-prefixed framing: turning a TCP byte stream into messages
+2. A coordinator / agent protocol in ~100 lines
+3. Locality-aware scheduling with a bounded wait
+4. Failure detection with heartbeats (and why EOF alone is not enough)
+5. Testing a "cluster" with agents as local processes
+
+================================================================================
+USAGE
+================================================================================
+
+python 19_distributed_executor_over_tcp.py                  # local demo
+python 19_distributed_executor_over_tcp.py agent --host COORDINATOR --port 5000
+
+    # in your program, on the coordinator machine:
+    with DistributedExecutor(('0.0.0.0', 5000)) as executor:
+        executor.wait_for_agents(3)
+        results = list(executor.map(process_image, paths))
+
+Task functions are pickled BY NAME: every agent must run the same code.
+Pickle executes code when loading — only connect machines you trust.
+
+================================================================================
+PROTOCOL (EVERY FRAME: 4-BYTE BIG-ENDIAN LENGTH + PICKLE)
+================================================================================
+
+agent → ('hello', name, slots)
+coord → ('task', task_id, pickled (fn, args, kwargs))
+agent → ('result', task_id, ok, value)
+agent → ('heartbeat',)                       every HEARTBEAT_INTERVAL seconds
+
+The coordinator closing the connection tells the agent to stop.
+
+================================================================================
+"""
+
+import os
+import sys
+import fcntl
+import time
+import shutil
+import queue
+import pickle
+import signal
+import socket
+import struct
+import argparse
+import tempfile
+import threading
+import itertools
+import subprocess
+import collections
+import concurrent.futures
+from dataclasses import dataclass, field
+
+from PIL import Image, ImageFilter
+
+
+HEARTBEAT_INTERVAL = 0.5
+MAX_FRAME = 256 * 2**20
+
+
+# ------------------------------------------------------------------------------
+# FRAMING
+# ------------------------------------------------------------------------------
+# TCP delivers a byte STREAM: one send() may arrive as several recv()s, or
+# glued to the next one. A length prefix restores message boundaries.
+# ------------------------------------------------------------------------------
+HEADER = struct.Struct('!I')
+
+
+def send_frame(sock: socket.socket, obj) -> None:
+    payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket):
+    (size,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    if size > MAX_FRAME:
+        raise ConnectionError(f"frame of {size} bytes exceeds MAX_FRAME")
+    return pickle.loads(_recv_exactly(sock, size))
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < n:
+        chunk = sock.recv(n - len(buffer))
+        if not chunk:
+            raise ConnectionError("connection closed by peer")
+        buffer += chunk
+    return bytes(buffer)
+
+
+# ------------------------------------------------------------------------------
+# AGENT (ONE PER MACHINE)
+# ------------------------------------------------------------------------------
+def run_agent(host: str, port: int, slots: int, name: str) -> None:
+    """
+    Connects to the coordinator and runs its tasks in a local process pool
+    until the coordinator closes the connection.
+    """
+    sock = socket.create_connection((host, port))
+    send_lock = threading.Lock()
+
+    def send(message) -> None:
+        try:
+            with send_lock:
+                send_frame(sock, message)
+        except OSError:
+            pass                    # coordinator gone: the main loop will notice
+
+    def heartbeats(stop: threading.Event) -> None:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            send(('heartbeat',))
+
+    def reply(task_id, future) -> None:
+        exc = future.exception()
+        send(('result', task_id, exc is None, future.result() if exc is None else exc))
+
+    # Per-agent data directory, inherited by the pool's worker processes
+    os.environ['AGENT_DATA_DIR'] = tempfile.mkdtemp(prefix=f'{name}-')
+
+    send(('hello', name, slots))
+    stop = threading.Event()
+    threading.Thread(target=heartbeats, args=(stop,), daemon=True).start()
+
+    with concurrent.futures.ProcessPoolExecutor(slots) as pool:
+        try:
+            while True:
+                _, task_id, payload = recv_frame(sock)
+                try:
+                    fn, args, kwargs = pickle.loads(payload)
+                    future = pool.submit(fn, *args, **kwargs)
+                except Exception as exc:            # e.g. fn not importable here
+                    send(('result', task_id, False, exc))
+                    continue
+                future.add_done_callback(lambda f, task_id=task_id: reply(task_id, f))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            stop.set()
+            pool.shutdown(cancel_futures=True)
+            shutil.rmtree(os.environ['AGENT_DATA_DIR'], ignore_errors=True)
+
+
+# ------------------------------------------------------------------------------
+# COORDINATOR: BOOKKEEPING
+# ------------------------------------------------------------------------------
+class AgentLostError(RuntimeError):
+    """The task's agent died `max_attempts` times in a row."""
+
+
+@dataclass
+class _Task:
+    id: int
+    payload: bytes
+    future: concurrent.futures.Future
+    locality: object
+    waiting_since: float | None = None      # first passed over for locality
+    attempts: int = 0
+
+
+@dataclass
+class _Agent:
+    name: str
+    sock: socket.socket
+    slots: int
+    last_seen: float
+    running: dict = field(default_factory=dict)     # task id → _Task
+    holds: set = field(default_factory=set)         # locality keys it has
+    alive: bool = True
+    outbox: queue.SimpleQueue = field(default_factory=queue.SimpleQueue)     # frames to send
+
+
+# ------------------------------------------------------------------------------
+# COORDINATOR: THE EXECUTOR
+# ------------------------------------------------------------------------------
+class DistributedExecutor(concurrent.futures.Executor):
+    """
+    Arguments:
+    ----------
+    address           : (host, port) to listen on; port 0 = pick a free one
+    heartbeat_timeout : silence after which an agent is declared dead
+    locality_wait     : how long a task waits for an agent holding its
+                        locality key before running anywhere
+    max_attempts      : agent failures a task survives before failing
+
+    stats : collections.Counter (dispatched, local, requeued, agents lost...)
+    """
+
+    def __init__(self, address: tuple = ('127.0.0.1', 0), heartbeat_timeout: float = 1.5,
+                 locality_wait: float = 0.5, max_attempts: int = 3):
+        self.heartbeat_timeout = heartbeat_timeout
+        self.locality_wait = locality_wait
+        self.max_attempts = max_attempts
+        self.stats = collections.Counter()
+
+        self._agents = {}
+        self._queue = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._closed = False                    # shutdown() called: no more submits
+        self._shutdown = threading.Event()      # torn down: agents disconnected
+
+        self._listener = socket.create_server(address)
+        self.address = self._listener.getsockname()
+
+        threading.Thread(target=self._accept, daemon=True).start()
+        threading.Thread(target=self._monitor, daemon=True).start()
+
+    # --------------------------------------------------------------------------
+    # PUBLIC API
+    # --------------------------------------------------------------------------
+    def submit(self, fn, /, *args, **kwargs) -> concurrent.futures.Future:
+        return self.submit_with(fn, args, kwargs)
+
+    def submit_with(self, fn, args: tuple = (), kwargs: dict | None = None, *,
+                    locality=None) -> concurrent.futures.Future:
+        """
+        locality : any hashable key naming the data the task needs
+                   (a file, a shard, a model); tasks with the same key
+                   are kept on the same agent when possible
+        """
+        task = _Task(next(self._ids), pickle.dumps((fn, args, kwargs or {})),
+                     concurrent.futures.Future(), locality)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._queue.append(task)
+            self._schedule()
+        return task.future
+
+    def wait_for_agents(self, count: int, timeout: float | None = None) -> None:
+        with self._changed:
+            if not self._changed.wait_for(lambda: len(self._agents) >= count, timeout):
+                raise TimeoutError(f"only {len(self._agents)} of {count} agents connected")
+
+    @property
+    def agents(self) -> list:
+        with self._lock:
+            return sorted(self._agents)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Like the stdlib pools, wait=False only returns early: agents stay
+        connected (in a background thread) until every outstanding Future
+        is done, so none of them is left unresolved.
+        """
+        with self._lock:
+            self._closed = True
+            queued = list(self._queue)
+            outstanding = [task.future for task in queued] + [
+                task.future for agent in self._agents.values()
+                for task in agent.running.values()]
+
+            if cancel_futures:
+                self._queue.clear()
+
+        if cancel_futures:
+            for task in queued:
+                if task.future.cancel():
+                    # Without this, wait() never counts it as done
+                    task.future.set_running_or_notify_cancel()
+                elif not task.future.done():
+                    # Re-queued after an agent loss = already RUNNING
+                    task.future.set_exception(concurrent.futures.CancelledError(
+                        "executor shut down before the task was re-run"))
+
+        if wait:
+            self._disconnect(outstanding)
+        else:
+            threading.Thread(target=self._disconnect, args=(outstanding,), daemon=True).start()
+
+    def _disconnect(self, outstanding: list) -> None:
+        concurrent.futures.wait(outstanding)
+
+        self._shutdown.set()
+        self._listener.close()
+        with self._lock:
+            agents = list(self._agents.values())
+        for agent in agents:
+            self._lose(agent, reason=None)          # closing = "please stop"
+
+    # --------------------------------------------------------------------------
+    # SCHEDULING (CALLED WITH self._lock HELD)
+    # --------------------------------------------------------------------------
+    def _schedule(self) -> None:
+        now = time.monotonic()
+
+        for task in list(self._queue):
+            free = [a for a in self._agents.values() if len(a.running) < a.slots]
+            if not free:
+                return
+
+            candidates = free
+            if task.locality is not None:
+                holders = [a for a in self._agents.values() if task.locality in a.holds]
+                local = [a for a in free if a in holders]
+                if local:
+                    candidates = local
+                elif holders:
+                    # A holder may free up soon: wait — but only so long.
+                    # The clock starts when a slot is FIRST declined, not
+                    # at submit(): in a long queue it would expire unused.
+                    if task.waiting_since is None:
+                        task.waiting_since = now
+                    if now - task.waiting_since < self.locality_wait:
+                        continue
+
+            agent = min(candidates, key=lambda a: len(a.running) / a.slots)
+            self._queue.remove(task)
+            self._dispatch(agent, task)
+
+    def _dispatch(self, agent: _Agent, task: _Task) -> None:
+        if task.attempts == 0 and not task.future.set_running_or_notify_cancel():
+            return                                  # cancelled while queued
+
+        task.attempts += 1
+        agent.running[task.id] = task
+        self.stats['dispatched'] += 1
+        if task.locality is not None:
+            self.stats['local' if task.locality in agent.holds else 'remote'] += 1
+            agent.holds.add(task.locality)          # it will have the data now
+
+        # Never send here: we hold self._lock, and sendall() to a frozen
+        # agent blocks as soon as its socket buffer is full — the
+        # heartbeat monitor would then wait for the lock forever
+        agent.outbox.put(('task', task.id, task.payload))
+
+    def _send_to_agent(self, agent: _Agent) -> None:
+        """
+        One sender thread per agent: the only place that writes to its
+        socket. _lose() unblocks it by shutting the socket down.
+        """
+        while (message := agent.outbox.get()) is not None:
+            try:
+                send_frame(agent.sock, message)
+            except OSError:
+                return      # the reader thread / heartbeat monitor handles it
+
+    # --------------------------------------------------------------------------
+    # CONNECTIONS
+    # --------------------------------------------------------------------------
+    def _accept(self) -> None:
+        while not self._shutdown.is_set():
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_agent, args=(sock,), daemon=True).start()
+
+    def _serve_agent(self, sock: socket.socket) -> None:
+        try:
+            _, name, slots = recv_frame(sock)
+        except (ConnectionError, OSError, ValueError):
+            sock.close()
+            return
+
+        agent = _Agent(name, sock, slots, last_seen=time.monotonic())
+        threading.Thread(target=self._send_to_agent, args=(agent,), daemon=True).start()
+
+        with self._lock:
+            self._agents[name] = agent
+            self._changed.notify_all()
+            self._schedule()
+
+        try:
+            while True:
+                message = recv_frame(sock)
+                agent.last_seen = time.monotonic()
+                if message[0] == 'result':
+                    self._complete(agent, *message[1:])
+        except (ConnectionError, OSError, EOFError, pickle.UnpicklingError):
+            pass
+        self._lose(agent, reason='connection closed')
+
+    def _complete(self, agent: _Agent, task_id: int, ok: bool, value) -> None:
+        with self._lock:
+            task = agent.running.pop(task_id, None)
+            if task is None or not agent.alive:
+                return              # a late answer from an agent we gave up on
+            self._schedule()
+
+        if ok:
+            task.future.set_result(value)
+        else:
+            task.future.set_exception(value)
+
+    # --------------------------------------------------------------------------
+    # FAILURE DETECTION
+    # --------------------------------------------------------------------------
+    def _monitor(self) -> None:
+        """
+        EOF catches agents that crash (the OS closes their socket). It
+        does NOT catch a frozen process, a hung machine or a network
+        partition: the connection stays "open" — only silence tells.
+        Also re-runs the scheduler so locality waits expire on time.
+        """
+        while not self._shutdown.wait(HEARTBEAT_INTERVAL / 5):
+            now = time.monotonic()
+            with self._lock:
+                silent = [a for a in self._agents.values()
+                          if now - a.last_seen > self.heartbeat_timeout]
+            for agent in silent:
+                self._lose(agent, reason='missed heartbeats')
+
+            with self._lock:
+                self._schedule()
+
+    def _lose(self, agent: _Agent, reason: str | None) -> None:
+        failed = []
+        with self._lock:
+            if not agent.alive:
+                return
+            agent.alive = False
+            self._agents.pop(agent.name, None)
+            self._changed.notify_all()
+
+            if reason is not None:
+                self.stats[f'agents lost ({reason})'] += 1
+                for task in agent.running.values():
+                    if task.attempts >= self.max_attempts:
+                        failed.append(task)
+                    else:
+                        self.stats['requeued'] += 1
+                        self._queue.insert(0, task)
+                agent.running.clear()
+                self._schedule()
+
+        agent.outbox.put(None)
+        try:
+            agent.sock.shutdown(socket.SHUT_RDWR)       # also wakes a blocked sendall()
+        except OSError:
+            pass
+        agent.sock.close()
+
+        for task in failed:
+            task.future.set_exception(AgentLostError(
+                f"lost {task.attempts} agents while running this task"))
+
+
+# ------------------------------------------------------------------------------
+# TASK: process_image, ON A MACHINE THAT MAY NOT HAVE THE IMAGE YET
+# ------------------------------------------------------------------------------
+script_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.join(script_dir, 'images')
+
+FETCH_BANDWIDTH = 10 * 2**20        # bytes/s: simulated transfer to the agent
+
+
+def local_copy(name: str) -> tuple:
+    """
+    Returns (path on this agent, bytes fetched). The first task that
+    needs an image on an agent "downloads" it; later ones reuse it.
+    """
+    data_dir = os.environ.get('AGENT_DATA_DIR', tempfile.gettempdir())
+    path = os.path.join(data_dir, name)
+
+    # Two slots of one agent may need the same image at the same time:
+    # one downloads, the other waits for it instead of downloading too
+    with open(f"{path}.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(path):
+            return path, 0
+
+        source = os.path.join(images_dir, name)
+        size = os.path.getsize(source)
+        time.sleep(size / FETCH_BANDWIDTH)
+        shutil.copyfile(source, path)
+        return path, size
+
+
+def render(name: str, size: int) -> tuple:
+    """
+    process_image-style: blur + thumbnail (draft-mode decode, see 07_...).
+    Returns (name, output size, bytes fetched).
+    """
+    path, fetched = local_copy(name)
+
+    with Image.open(path) as img:
+        img.draft('RGB', (size, size))
+        img = img.convert('RGB')
+        img.thumbnail((size, size))
+        img = img.filter(ImageFilter.GaussianBlur(2))
+
+    return name, img.size, fetched
+
+
+# ------------------------------------------------------------------------------
+# DEMO: AGENTS AS LOCAL PROCESSES
+# ------------------------------------------------------------------------------
+AGENTS = 3
+SLOTS = 2
+SIZES = (150, 300, 600)
+
+
+def start_agents(port: int, count: int) -> list:
+    return [
+        # Own session: the agent AND its pool workers can be killed as a group
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), 'agent',
+                          '--port', str(port), '--slots', str(SLOTS), '--name', f'agent-{i}'],
+                         start_new_session=True)
+        for i in range(count)
+    ]
+
+
+def run_batch(locality_wait: float | None, freeze_after: float | None = None) -> tuple:
+    """
+    Renders every image at every size; locality_wait=None submits
+    without locality keys. Optionally FREEZES one agent (SIGSTOP:
+    alive, connected, silent) part-way through.
+    """
+    names = sorted(os.listdir(images_dir))
+
+    with DistributedExecutor(locality_wait=locality_wait or 0) as executor:
+        agents = start_agents(executor.address[1], AGENTS)
+        executor.wait_for_agents(AGENTS, timeout=30)
+
+        start = time.perf_counter()
+        futures = [
+            executor.submit_with(render, (name, size),
+                                 locality=None if locality_wait is None else name)
+            for name in names for size in SIZES
+        ]
+
+        if freeze_after is not None:
+            time.sleep(freeze_after)
+            os.kill(agents[0].pid, signal.SIGSTOP)
+
+        results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - start
+
+    for agent in agents:
+        os.killpg(agent.pid, signal.SIGKILL)
+        agent.wait()
+
+    assert all(result[1] != (0, 0) for result in results)
+    fetched = [result[2] for result in results if result[2]]
+    return elapsed, len(results), len(fetched), sum(fetched), executor.stats
+
+
+def demo() -> None:
+    print(f"{AGENTS} agents × {SLOTS} slots (local processes); "
+          f"{len(os.listdir(images_dir))} images × {len(SIZES)} sizes; "
+          f"first use of an image on an agent = fetch at {FETCH_BANDWIDTH / 2**20:.0f} MB/s\n")
+    print(f"{'scenario':<38} {'time':>7} {'tasks':>6} {'fetches':>8} {'fetched':>9}  stats")
+
+    for label, locality_wait, freeze_after in (
+        ('any free agent', None, None),
+        ('locality, wait ≤ 0.5 s', 0.5, None),
+        ('locality, wait ≤ 2 s', 2.0, None),
+        ('locality, wait ≤ 2 s, 1 agent frozen', 2.0, 1.0),
+    ):
+        elapsed, tasks, fetches, fetched_bytes, stats = run_batch(locality_wait, freeze_after)
+        notes = ', '.join(f"{k} {v}" for k, v in sorted(stats.items()))
+        print(f"{label:<38} {elapsed:>6.2f}s {tasks:>6} {fetches:>8} "
+              f"{fetched_bytes / 2**20:>7.1f}MB  {notes}")
+
+
+# ------------------------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    sub = parser.add_subparsers(dest='command')
+
+    agent = sub.add_parser('agent', help="run a worker agent")
+    agent.add_argument('--host', default='127.0.0.1')
+    agent.add_argument('--port', type=int, required=True)
+    agent.add_argument('--slots', type=int, default=os.cpu_count())
+    agent.add_argument('--name', default=socket.gethostname())
+
+    args = parser.parse_args()
+    if args.command == 'agent':
+        run_agent(args.host, args.port, args.slots, f"{args.name}:{os.getpid()}")
+    else:
+        demo()
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ==============================================================================
+# OBSERVED OUTPUT (3 AGENTS ON ONE 1-CORE MACHINE)
+# ==============================================================================
+
+"""
+3 agents × 2 slots (local processes); 8 images × 3 sizes; first use of an image on an agent = fetch at 10 MB/s
+
+scenario                                  time  tasks  fetches   fetched  stats
+any free agent                           6.55s     24       24    62.1MB  dispatched 24
+locality, wait ≤ 0.5 s                   7.06s     24       14    37.5MB  dispatched 24, local 10, remote 14
+locality, wait ≤ 2 s                     7.45s     24        8    20.7MB  dispatched 24, local 16, remote 8
+locality, wait ≤ 2 s, 1 agent frozen     7.85s     24        8    20.7MB  agents lost (missed heartbeats) 1, dispatched 26, local 17, remote 9, requeued 2
+"""
+
+
+# ==============================================================================
+# KEY OBSERVATIONS
+# ==============================================================================
+
+"""
+1. WITHOUT LOCALITY, EVERY AGENT FETCHES EVERYTHING
+   - 24 tasks → 24 downloads: each image travelled to ~3 agents
+
+2. LOCALITY-AWARE: EACH IMAGE IS FETCHED ONCE
+   - With a 2 s bound: 8 fetches for 8 images, 3× less data moved
+   - With 0.5 s the wait often expires before the holder frees a slot,
+     so some tasks run elsewhere and fetch again (14)
+   - The wait clock starts when a task is first passed over, NOT at
+     submit(): with 24 tasks queued at once, a submit-time clock had
+     already expired by the time most holders existed
+
+3. THE TIMES HARDLY MOVE — ON THIS MACHINE
+   - All "machines" share ONE core, and the downloads are simulated
+     sleeps that overlap with other slots' CPU work
+   - On real hosts the 41 MB not transferred is network time and
+     bandwidth saved; waiting for a busy holder is the price
+
+4. A FROZEN AGENT IS DETECTED BY SILENCE
+   - SIGSTOP keeps the TCP connection open: no EOF, no error.
+     After 1.5 s without heartbeats the coordinator declared it dead,
+     re-queued its 2 tasks, and the batch still completed (24/24)
+   - Had it woken up, its late results would have been ignored and its
+     connection is already closed — it exits
+   - Sends go through a per-agent outbox and sender thread, never under
+     the scheduler lock: a large task blocked on a frozen agent's full
+     socket buffer cannot stall the monitor, submit() or other agents
+
+5. WHAT IS DELIBERATELY MISSING
+   - Authentication / TLS (pickle from an untrusted peer = remote code
+     execution), result streaming for large outputs, a coordinator
+     failover, and task cancellation on agents
+"""